@@ -26,8 +26,22 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from src.resources.database import Base
+# The models must be imported so their tables are registered on Base.metadata;
+# otherwise autogenerate sees an empty schema and emits drop_table for them
+import src.models.refresh_token  # noqa: F401
+import src.models.ocupacao  # noqa: F401
+import src.models.alerta  # noqa: F401
+import src.models.solicitacao  # noqa: F401
+import src.models.historico  # noqa: F401
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The FTS5 index of historico (and its shadow tables) is managed by raw DDL
+    if type_ == "table" and name.startswith("historico_busca"):
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -63,6 +77,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -73,7 +88,7 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection):
     context.configure(
-        connection=connection, target_metadata=target_metadata
+        connection=connection, target_metadata=target_metadata, include_object=include_object
     )
 
     with context.begin_transaction():
@@ -0,0 +1,46 @@
+"""create occupancy time-series tables
+
+Revision ID: 5e8b2d4f7a19
+Revises: 3c1f9a7d2b64
+Create Date: 2026-10-18 14:37:21.584903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b2d4f7a19'
+down_revision: Union[str, Sequence[str], None] = '3c1f9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ocupacao_amostras',
+    sa.Column('ts', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('ocupados', sa.SmallInteger(), nullable=False),
+    sa.Column('operacionais', sa.SmallInteger(), nullable=False),
+    sa.Column('total', sa.SmallInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('ts')
+    )
+    op.create_table('ocupacao_agregados',
+    sa.Column('passo', sa.Integer(), nullable=False),
+    sa.Column('inicio', sa.Integer(), nullable=False),
+    sa.Column('amostras', sa.Integer(), nullable=False),
+    sa.Column('soma_ocupados', sa.Integer(), nullable=False),
+    sa.Column('soma_operacionais', sa.Integer(), nullable=False),
+    sa.Column('min_ocupados', sa.SmallInteger(), nullable=False),
+    sa.Column('max_ocupados', sa.SmallInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('passo', 'inicio'),
+    sqlite_with_rowid=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ocupacao_agregados')
+    op.drop_table('ocupacao_amostras')
@@ -0,0 +1,34 @@
+"""create alertas_lidos table
+
+Revision ID: 9d4a6c1e3b57
+Revises: 5e8b2d4f7a19
+Create Date: 2026-10-18 16:05:48.216730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4a6c1e3b57'
+down_revision: Union[str, Sequence[str], None] = '5e8b2d4f7a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('alertas_lidos',
+    sa.Column('usuario', sa.String(), nullable=False),
+    sa.Column('alerta_id', sa.String(), nullable=False),
+    sa.Column('lido_em', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('usuario', 'alerta_id'),
+    sqlite_with_rowid=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('alertas_lidos')
@@ -0,0 +1,43 @@
+"""create solicitacoes table
+
+Revision ID: b7e1f0a9c2d4
+Revises: 9d4a6c1e3b57
+Create Date: 2026-10-18 17:22:09.430518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1f0a9c2d4'
+down_revision: Union[str, Sequence[str], None] = '9d4a6c1e3b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('solicitacoes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('prontuario', sa.Integer(), nullable=False),
+    sa.Column('idade', sa.Integer(), nullable=True),
+    sa.Column('especialidade', sa.String(), nullable=False),
+    sa.Column('tipo', sa.String(), nullable=False),
+    sa.Column('urgencia', sa.String(), nullable=False),
+    sa.Column('solicitante', sa.String(), nullable=True),
+    sa.Column('status', sa.String(), server_default='pendente', nullable=False),
+    sa.Column('leito_numero', sa.String(), nullable=True),
+    sa.Column('criada_em', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('encerrada_em', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_solicitacoes_status'), 'solicitacoes', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_solicitacoes_status'), table_name='solicitacoes')
+    op.drop_table('solicitacoes')
@@ -0,0 +1,52 @@
+"""create historico audit table
+
+Revision ID: e3c5a8d1f6b2
+Revises: b7e1f0a9c2d4
+Create Date: 2026-10-18 18:41:33.907216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.models.historico import BUSCA_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3c5a8d1f6b2'
+down_revision: Union[str, Sequence[str], None] = 'b7e1f0a9c2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('historico',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('criado_em', sa.DateTime(), nullable=False),
+    sa.Column('usuario', sa.String(), nullable=False),
+    sa.Column('tipo', sa.String(), nullable=False),
+    sa.Column('acao', sa.String(), nullable=False),
+    sa.Column('entidade', sa.String(), nullable=False),
+    sa.Column('detalhes', sa.String(), nullable=True),
+    sa.Column('busca', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_historico_criado_em', 'historico', ['criado_em'], unique=False)
+    op.create_index('ix_historico_entidade_criado_em', 'historico', ['entidade', 'criado_em'], unique=False)
+    op.create_index('ix_historico_usuario_criado_em', 'historico', ['usuario', 'criado_em'], unique=False)
+    # FTS5 trigram index for substring search, kept in sync by triggers
+    for ddl in BUSCA_DDL:
+        op.execute(ddl)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DROP TRIGGER IF EXISTS historico_busca_ad')
+    op.execute('DROP TRIGGER IF EXISTS historico_busca_ai')
+    op.execute('DROP TABLE IF EXISTS historico_busca')
+    op.drop_index('ix_historico_usuario_criado_em', table_name='historico')
+    op.drop_index('ix_historico_entidade_criado_em', table_name='historico')
+    op.drop_index('ix_historico_criado_em', table_name='historico')
+    op.drop_table('historico')
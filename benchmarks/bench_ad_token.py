@@ -0,0 +1,142 @@
+"""
+Benchmark das claims do AD no access token: tamanho do token e tempo de
+decodificação para um usuário em muitos grupos.
+
+Compara o comportamento antigo (busca com ALL_ATTRIBUTES, todos os atributos
+convertidos para string e copiados para o token, CN extraído com duas
+chamadas a re.match por grupo) com a lista de atributos permitidos e a
+extração de grupos numa única passada.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_ad_token --groups 300
+"""
+import argparse
+import re
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+
+from src.auth.auth import AD_ATTRIBUTES, build_user_claims, parse_group_names
+
+SEGREDO = "benchmark-secret"
+
+
+def gerar_atributos(grupos: int) -> dict:
+    """Entrada de usuário como o AD devolve com ALL_ATTRIBUTES (valores sintéticos)."""
+    agora = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    member_of = [
+        f"CN=GLO-SEC-HCPE-GRUPO-{i:03d},OU=Grupos,OU=HC-UFPE,OU=Filiais,DC=ebserhnet,DC=gov,DC=br"
+        for i in range(grupos)
+    ]
+    member_of.append("CN=GLO-SEC-HCPE-SETISD,OU=Grupos,OU=HC-UFPE,OU=Filiais,DC=ebserhnet,DC=gov,DC=br")
+    return {
+        "objectClass": ["top", "person", "organizationalPerson", "user"],
+        "cn": ["Maria da Silva"],
+        "sn": ["Silva"],
+        "givenName": ["Maria"],
+        "displayName": ["Maria da Silva"],
+        "distinguishedName": ["CN=Maria da Silva,OU=Usuarios,OU=HC-UFPE,OU=Filiais,DC=ebserhnet,DC=gov,DC=br"],
+        "userPrincipalName": ["maria.silva@ebserh.gov.br"],
+        "mail": ["maria.silva@ebserh.gov.br"],
+        "sAMAccountName": ["maria.silva"],
+        "title": ["Enfermeira"],
+        "department": ["UTI Adulto"],
+        "company": ["EBSERH"],
+        "employeeNumber": ["1234567"],
+        "telephoneNumber": ["+55 81 0000-0000"],
+        "physicalDeliveryOfficeName": ["HC-UFPE"],
+        "memberOf": member_of,
+        "proxyAddresses": [f"smtp:maria.silva{i}@ebserh.gov.br" for i in range(5)],
+        "objectGUID": [str(uuid.uuid4())],
+        "objectSid": ["S-1-5-21-1004336348-1177238915-682003330-512345"],
+        "objectCategory": ["CN=Person,CN=Schema,CN=Configuration,DC=ebserhnet,DC=gov,DC=br"],
+        "whenCreated": [agora - timedelta(days=900)],
+        "whenChanged": [agora],
+        "pwdLastSet": [agora - timedelta(days=30)],
+        "lastLogon": [agora],
+        "lastLogonTimestamp": [agora],
+        "badPasswordTime": [agora - timedelta(days=3)],
+        "accountExpires": [datetime(9999, 12, 31, tzinfo=timezone.utc)],
+        "userAccountControl": [512],
+        "logonCount": [4821],
+        "badPwdCount": [0],
+        "primaryGroupID": [513],
+        "sAMAccountType": [805306368],
+        "uSNCreated": [123456],
+        "uSNChanged": [987654],
+        "codePage": [0],
+        "countryCode": [0],
+        "instanceType": [4],
+        "dSCorePropagationData": [agora - timedelta(days=d) for d in range(5)],
+        "msExchMailboxGuid": [str(uuid.uuid4())],
+        "homeMDB": ["CN=DB01,CN=Databases,CN=Exchange,CN=Services,CN=Configuration,DC=ebserhnet,DC=gov,DC=br"],
+        "showInAddressBook": [f"CN=Lista {i},CN=All Address Lists,DC=ebserhnet,DC=gov,DC=br" for i in range(4)],
+    }
+
+
+def claims_legado(username: str, attrs: dict) -> dict:
+    """Reprodução da implementação anterior, usada como linha de base."""
+    user_info = {"username": username}
+    groups_attr = attrs.get("memberOf") or []
+    user_info["groups"] = [
+        re.match(r"CN=([^,]+)", group).group(1)
+        for group in groups_attr
+        if re.match(r"CN=([^,]+)", group)
+    ]
+    for key, value in attrs.items():
+        if key == "memberOf":
+            continue
+        if isinstance(value, list):
+            user_info[key] = [str(v) for v in value]
+        else:
+            user_info[key] = str(value)
+    return user_info
+
+
+def criar_token(claims: dict) -> str:
+    payload = dict(claims, sub=claims["username"], exp=datetime.utcnow() + timedelta(hours=1))
+    return jwt.encode(payload, SEGREDO, algorithm="HS256")
+
+
+def medir(nome: str, funcao, repeticoes: int) -> float:
+    funcao()
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    duracao = (time.perf_counter() - inicio) / repeticoes * 1_000_000
+    print(f"  {nome:<34} {duracao:10.1f} µs")
+    return duracao
+
+
+def main(grupos: int, repeticoes: int) -> None:
+    attrs = gerar_atributos(grupos)
+    # A busca nova só recebe memberOf e os atributos permitidos
+    attrs_novos = {key: attrs[key] for key in ["memberOf", *AD_ATTRIBUTES] if key in attrs}
+    filtro_admin = re.compile(r"^GLO-SEC-HCPE-SETISD$")
+
+    cenarios = [
+        ("antes (ALL_ATTRIBUTES)", lambda: claims_legado("maria.silva", attrs)),
+        ("depois (lista de atributos)", lambda: build_user_claims("maria.silva", attrs_novos, AD_ATTRIBUTES)),
+        ("depois + AD_GROUP_FILTER", lambda: build_user_claims("maria.silva", attrs_novos, AD_ATTRIBUTES, filtro_admin)),
+    ]
+
+    print(f"Usuário em {grupos + 1} grupos, {len(attrs)} atributos no AD\n")
+    print("Extração de grupos (memberOf -> CN):")
+    medir("antes (re.match 2x por grupo)", lambda: claims_legado("u", {"memberOf": attrs["memberOf"]}), repeticoes)
+    medir("depois (padrão compilado, 1x)", lambda: parse_group_names(attrs["memberOf"]), repeticoes)
+
+    for nome, montar in cenarios:
+        token = criar_token(montar())
+        print(f"\n{nome}: token com {len(token):,} bytes")
+        medir("montar claims", montar, repeticoes)
+        medir("jwt.decode (por requisição)", lambda: jwt.decode(token, SEGREDO, algorithms=["HS256"]), repeticoes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=300)
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.groups, args.repeticoes)
@@ -0,0 +1,143 @@
+"""
+Benchmark do motor de alertas (/api/alertas) sobre um quadro de leitos e um
+conjunto de regras sintéticos.
+
+Compara a reavaliação completa (todas as regras sobre todos os leitos a cada
+sincronização, como faria um endpoint ingênuo a cada consulta) com o
+MotorAlertas, que só reavalia as regras que leem os campos alterados de cada
+leito. Confere que os alertas abertos dos dois caminhos coincidem, também
+depois de avançar o relógio (previsões que vencem e alertas que expiram).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_alertas --leitos 2000 --regras 300 --alteracoes 20
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from src.resources.alertas import REGRAS_PADRAO, TIPOS_ALERTA, Condicao, MotorAlertas, RegraAlerta
+from src.resources.quadro_leitos import QuadroLeitos
+
+DOMINIOS = {
+    "status": ["disponivel", "ocupado", "ocupado", "ocupado", "higienizacao", "desativado", "alta"],
+    "tipo": ["cirurgico", "hem", "obstetrico", "outro", "nao_definido"],
+    "paciente_especialidade": ["Cardiologia", "Clinica Medica", "Neurologia", "Trauma", "Oncologia", None],
+    "proximo_especialidade": ["Cardiologia", "Nefrologia", "Ortopedia", None, None, None],
+    "tipo_reserva": ["Emergencia", "Clinica", "Cirurgico", None, None, None],
+    "sinalizacao_transferencia": [False] * 9 + [True],
+}
+HOJE = date(2026, 10, 18)
+AGORA = time.mktime(HOJE.timetuple()) + 12 * 3600
+
+
+def gerar_leito(rng: random.Random, numero: int) -> dict:
+    leito = {"leito_numero": f"UTI-{numero:05d}"}
+    leito.update({campo: rng.choice(valores) for campo, valores in DOMINIOS.items()})
+    leito["paciente_prontuario"] = rng.randrange(1, 10**6)
+    leito["proximo_prontuario"] = rng.randrange(1, 10**6) if leito["tipo_reserva"] else None
+    leito["previsao_liberacao"] = HOJE + timedelta(days=rng.randint(-5, 5))
+    return leito
+
+
+def alterar(rng: random.Random, leito: dict) -> dict:
+    """Uma alteração típica: um campo muda, o resto do leito fica igual."""
+    campo = rng.choice(list(DOMINIOS) + ["previsao_liberacao", "proximo_prontuario"])
+    novo = dict(leito)
+    if campo == "previsao_liberacao":
+        novo[campo] = HOJE + timedelta(days=rng.randint(-5, 5))
+    elif campo == "proximo_prontuario":
+        novo[campo] = rng.choice([None, rng.randrange(1, 10**6)])
+    else:
+        novo[campo] = rng.choice(DOMINIOS[campo])
+    return novo
+
+
+def gerar_regras(rng: random.Random, quantidade: int) -> list:
+    regras = list(REGRAS_PADRAO)
+    for i in range(quantidade - len(regras)):
+        campos = rng.sample(list(DOMINIOS), rng.choice([2, 3]))
+        condicoes = [Condicao(campo, "igual", rng.choice(DOMINIOS[campo])) for campo in campos]
+        if rng.random() < 0.2:
+            condicoes.append(Condicao("previsao_liberacao", "vencido", rng.choice([0, 12, 48])))
+        regras.append(RegraAlerta(
+            codigo=f"regra_{i}",
+            tipo=rng.choice(TIPOS_ALERTA),
+            titulo=f"Regra {i}",
+            mensagem="Leito {leito_numero}: " + ", ".join(f"{{{campo}}}" for campo in campos),
+            condicoes=tuple(condicoes),
+        ))
+    return regras
+
+
+def avaliar_tudo(regras: list, quadro: QuadroLeitos, agora: float) -> set:
+    """Linha de base: todas as regras sobre todos os leitos."""
+    abertos = set()
+    for leito in quadro.listar():
+        for regra in regras:
+            if regra.avaliar(leito, agora)[0]:
+                abertos.add(regra.ocorrencia(leito["leito_numero"], leito))
+    return abertos
+
+
+def main(leitos: int, quantidade_regras: int, alteracoes: int, rodadas: int) -> None:
+    rng = random.Random(42)
+    regras = gerar_regras(rng, quantidade_regras)
+    estado = {n: gerar_leito(rng, n) for n in range(leitos)}
+    quadro = QuadroLeitos()
+    quadro.aplicar(list(estado.values()))
+    relogio = [AGORA]
+    inicio = time.perf_counter()
+    motor = MotorAlertas(quadro, regras, relogio=lambda: relogio[0])
+    print(f"{leitos} leitos x {len(regras)} regras; carga inicial do motor em {time.perf_counter() - inicio:.2f} s")
+
+    lotes = []
+    for _ in range(rodadas):
+        for numero in rng.sample(range(leitos), alteracoes):
+            estado[numero] = alterar(rng, estado[numero])
+        lotes.append(list(estado.values()))
+
+    # Custo da sincronização sem motor, para separar o que é do quadro
+    referencia = QuadroLeitos()
+    referencia.aplicar(lotes[0])
+    inicio = time.perf_counter()
+    for lote in lotes:
+        referencia.aplicar(lote)
+    sem_motor = (time.perf_counter() - inicio) / rodadas
+
+    avaliacoes = motor.avaliacoes
+    inicio = time.perf_counter()
+    for lote in lotes:
+        quadro.aplicar(lote)
+        motor.listar()
+    depois = (time.perf_counter() - inicio) / rodadas - sem_motor
+    avaliacoes = (motor.avaliacoes - avaliacoes) / rodadas
+
+    assert {alerta.id for alerta in motor.listar()} == avaliar_tudo(regras, quadro, relogio[0])
+    # Dez dias depois: previsões vencem sem o leito mudar e as reservas (validade de 24 h) expiram
+    relogio[0] += 10 * 86400
+    com_validade = {regra.codigo for regra in regras if regra.validade_horas}
+    esperado = {i for i in avaliar_tudo(regras, quadro, relogio[0]) if i.split(":")[0] not in com_validade}
+    assert {alerta.id for alerta in motor.listar()} == esperado
+    print(f"{rodadas} sincronizações com {alteracoes} alterações cada: alertas conferidos ({len(esperado)} abertos)\n")
+
+    inicio = time.perf_counter()
+    for _ in range(min(rodadas, 10)):
+        avaliar_tudo(regras, quadro, relogio[0])
+    antes = (time.perf_counter() - inicio) / min(rodadas, 10)
+    print(f"{'sincronização do quadro (sem regras)':<36} {sem_motor * 1000:9.3f} ms")
+    print(f"{'antes (reavaliação completa)':<36} {antes * 1000:9.3f} ms / sincronização  "
+          f"({leitos * len(regras):,} avaliações)")
+    print(f"{'depois (reavaliação incremental)':<36} {depois * 1000:9.3f} ms / sincronização  "
+          f"({avaliacoes:,.0f} avaliações)")
+    print(f"Ganho: {antes / depois:,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leitos", type=int, default=2000)
+    parser.add_argument("--regras", type=int, default=300)
+    parser.add_argument("--alteracoes", type=int, default=20, help="Leitos alterados por sincronização")
+    parser.add_argument("--rodadas", type=int, default=200)
+    args = parser.parse_args()
+    main(args.leitos, args.regras, args.alteracoes, args.rodadas)
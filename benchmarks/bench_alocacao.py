@@ -0,0 +1,151 @@
+"""
+Benchmark do alocador de leitos (/api/solicitacoes) com milhares de
+solicitações e centenas de leitos sintéticos.
+
+Compara o recálculo completo das sugestões a cada evento (ordenar todas as
+solicitações pendentes e distribuir os leitos livres, como faria um endpoint
+ingênuo) com o AlocadorLeitos, que mantém as filas de prioridade e os índices
+de leitos e só ajusta o que o evento afeta. Durante a simulação, as
+sugestões do alocador são conferidas contra as regras da alocação: nenhum
+leito livre compatível fica sem uso enquanto há solicitação esperando, e
+nenhuma solicitação esperando tem prioridade maior que uma atendida num
+leito que lhe serviria.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_alocacao --solicitacoes 5000 --leitos 300 --eventos 20000
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from src.resources.alocacao import TIPO_GENERICO, TIPOS_LEITO, AlocadorLeitos, SolicitacaoLeito
+from src.resources.quadro_leitos import QuadroLeitos
+
+URGENCIAS = ["emergencia", "urgencia", "eletiva", "eletiva"]
+ESPECIALIDADES = ["Cardiologia", "Trauma", "Oncologia", "Obstetricia", "Clinica Medica"]
+HOJE = date(2026, 10, 18)
+
+
+def gerar_leito(rng: random.Random, numero: int) -> dict:
+    status = rng.choice(["disponivel", "ocupado", "ocupado", "ocupado", "ocupado", "alta", "higienizacao"])
+    return {
+        "leito_numero": f"UTI-{numero:04d}",
+        "status": status,
+        "tipo": rng.choice(list(TIPOS_LEITO) + [TIPO_GENERICO]),
+        "proximo_prontuario": rng.randrange(1, 10**6) if rng.random() < 0.1 else None,
+        "previsao_liberacao": HOJE + timedelta(days=rng.randint(0, 10)) if status != "disponivel" else None,
+    }
+
+
+def gerar_solicitacao(rng: random.Random, id: int, agora: float) -> SolicitacaoLeito:
+    return SolicitacaoLeito(
+        id=id,
+        prontuario=rng.randrange(1, 10**6),
+        especialidade=rng.choice(ESPECIALIDADES),
+        tipo=rng.choice(TIPOS_LEITO),
+        urgencia=rng.choice(URGENCIAS),
+        criada_em=agora - rng.uniform(0, 3 * 86400),
+    )
+
+
+def recalcular(alocador: AlocadorLeitos, quadro: QuadroLeitos, pendentes: list) -> dict:
+    """Linha de base: ordena todas as pendentes e distribui os leitos livres do quadro."""
+    livres = {}
+    for leito in quadro.listar(status="disponivel"):
+        if leito["proximo_prontuario"] is None and leito["leito_numero"] not in alocador._retidos:
+            livres.setdefault(leito["tipo"] or TIPO_GENERICO, []).append(leito["leito_numero"])
+    atribuicoes = {}
+    for solicitacao in sorted(pendentes, key=lambda s: s.prioridade):
+        for tipo in (solicitacao.tipo, TIPO_GENERICO):
+            if livres.get(tipo):
+                atribuicoes[solicitacao.id] = livres[tipo].pop(0)
+                break
+    return atribuicoes
+
+
+def conferir(alocador: AlocadorLeitos, quadro: QuadroLeitos) -> None:
+    tipo_livre = {
+        leito["leito_numero"]: leito["tipo"] or TIPO_GENERICO
+        for leito in quadro.listar(status="disponivel")
+        if leito["proximo_prontuario"] is None and leito["leito_numero"] not in alocador._retidos
+    }
+    atribuicoes = alocador._atribuicoes
+    assert len(set(atribuicoes.values())) == len(atribuicoes)
+    assert set(atribuicoes.values()) | set(alocador.leitos_livres()) == set(tipo_livre)
+    pior_por_tipo = {}
+    for id, numero in atribuicoes.items():
+        solicitacao = alocador.pendente(id)
+        assert tipo_livre[numero] in (solicitacao.tipo, TIPO_GENERICO)
+        pior_por_tipo[tipo_livre[numero]] = max(pior_por_tipo.get(tipo_livre[numero], (float("-inf"), 0)), solicitacao.prioridade)
+    sem_leito_livre = set(tipo_livre[numero] for numero in alocador.leitos_livres())
+    for item in alocador.listar():
+        solicitacao = item["solicitacao"]
+        if solicitacao.id in atribuicoes:
+            continue
+        for tipo in (solicitacao.tipo, TIPO_GENERICO):
+            assert tipo not in sem_leito_livre, "leito livre compatível sem uso"
+            assert pior_por_tipo.get(tipo, (float("-inf"), 0)) < solicitacao.prioridade, "prioridade invertida"
+
+
+def main(quantidade: int, leitos: int, eventos: int) -> None:
+    rng = random.Random(42)
+    agora = time.time()
+    estado = {n: gerar_leito(rng, n) for n in range(leitos)}
+    quadro = QuadroLeitos()
+    quadro.aplicar(list(estado.values()))
+    alocador = AlocadorLeitos(quadro)
+    for id in range(1, quantidade + 1):
+        alocador.adicionar(gerar_solicitacao(rng, id, agora))
+    conferir(alocador, quadro)
+    print(f"{quantidade} solicitações, {leitos} leitos ({len(alocador._atribuicoes)} com leito livre sugerido)")
+
+    proximo_id = quantidade + 1
+    inicio = time.perf_counter()
+    for evento in range(eventos):
+        sorteio = rng.random()
+        if sorteio < 0.35:
+            alocador.adicionar(gerar_solicitacao(rng, proximo_id, agora))
+            proximo_id += 1
+        elif sorteio < 0.55:
+            alocador.remover(rng.randrange(1, proximo_id))
+        elif sorteio < 0.65 and alocador._atribuicoes:
+            id = next(iter(alocador._atribuicoes))
+            alocador.atender(id, alocador._atribuicoes[id])
+        else:
+            numero = rng.randrange(leitos)
+            estado[numero] = gerar_leito(rng, numero)
+            quadro.aplicar(list(estado.values()))
+        if evento % 1000 == 0:
+            # Fora da medição: a conferência percorre tudo
+            pausa = time.perf_counter()
+            conferir(alocador, quadro)
+            inicio += time.perf_counter() - pausa
+    depois = (time.perf_counter() - inicio) / eventos
+    conferir(alocador, quadro)
+    pendentes = list(alocador._pendentes.values())
+    print(f"{eventos} eventos (chegadas, cancelamentos, atendimentos e mudanças de leito): sugestões conferidas\n")
+
+    inicio = time.perf_counter()
+    for _ in range(20):
+        recalcular(alocador, quadro, pendentes)
+    antes = (time.perf_counter() - inicio) / 20
+    inicio = time.perf_counter()
+    for _ in range(20):
+        alocador._versao_listagem = -1
+        alocador.listar()
+    listagem = (time.perf_counter() - inicio) / 20
+
+    print(f"{'antes (recálculo completo)':<36} {antes * 1000:9.3f} ms / evento")
+    print(f"{'depois (alocação incremental)':<36} {depois * 1000:9.3f} ms / evento")
+    print(f"Ganho: {antes / depois:,.0f}x")
+    print(f"\nListagem completa com previsões ({len(pendentes)} pendentes), refeita após mudanças: {listagem * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--solicitacoes", type=int, default=5000)
+    parser.add_argument("--leitos", type=int, default=300)
+    parser.add_argument("--eventos", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.solicitacoes, args.leitos, args.eventos)
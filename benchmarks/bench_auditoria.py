@@ -0,0 +1,193 @@
+"""
+Benchmark do histórico de ações (/api/historico) num SQLite temporário.
+
+Gravação: compara o custo por requisição de gravar cada ação na hora (um
+INSERT pela fila de escrita, esperando o commit, como faria um endpoint
+ingênuo) com o da Auditoria, que só acumula o registro em memória e grava
+em lote fora da requisição. Confere que todas as linhas chegam ao banco.
+
+Consulta: sobre uma tabela grande, compara a paginação por OFFSET com busca
+por LIKE (linha de base) com a paginação por chave (keyset) e o índice FTS5
+de trigramas do historico_controller, e confere que as páginas coincidem.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_auditoria --acoes 2000 --registros 300000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import timezone
+
+from sqlalchemy import insert, select, text
+
+from src.controllers.historico_controller import decodificar_cursor, listar_historico
+from src.models.historico import RegistroHistorico
+from src.resources.auditoria import Auditoria
+from src.resources.database import Base, DatabaseManager
+
+COLUNAS = (
+    RegistroHistorico.id, RegistroHistorico.criado_em, RegistroHistorico.usuario, RegistroHistorico.tipo,
+    RegistroHistorico.acao, RegistroHistorico.entidade, RegistroHistorico.detalhes,
+)
+USUARIOS = [f"usuario{n:03d}" for n in range(200)]
+ACOES = [
+    ("solicitacao", "Nova solicitação"),
+    ("reserva", "Reservou leito"),
+    ("cancelamento", "Cancelou solicitação"),
+    ("status", "Atualizou status"),
+]
+
+
+def gerar_acao(rng: random.Random) -> tuple:
+    tipo, acao = rng.choice(ACOES)
+    leito = f"UTI-{rng.randrange(1, 300):03d}"
+    prontuario = rng.randrange(10**5, 10**7)
+    return rng.choice(USUARIOS), tipo, acao, f"leito:{leito}", f"Leito {leito} - Prontuário {prontuario}"
+
+
+async def criar_banco(caminho: str) -> DatabaseManager:
+    db = DatabaseManager(f"sqlite+aiosqlite:///{caminho}", env_prefix="BENCH")
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[RegistroHistorico.__table__])
+    return db
+
+
+async def contar(db: DatabaseManager) -> int:
+    async with db.async_session_maker() as session:
+        return (await session.execute(text("SELECT count(*) FROM historico"))).scalar_one()
+
+
+async def medir_gravacao(tmp: str, acoes: list) -> None:
+    # Antes: cada requisição espera o INSERT e o commit da sua ação
+    db = await criar_banco(os.path.join(tmp, "sincrono.db"))
+    auditoria = Auditoria()
+    t0 = time.perf_counter()
+    for acao in acoes:
+        auditoria.registrar(*acao)
+        linha = auditoria._pendentes.popleft()
+
+        async def gravar(session, linha=linha):
+            await session.execute(insert(RegistroHistorico).values(**linha))
+
+        await db.writer.run(gravar)
+    antes = (time.perf_counter() - t0) / len(acoes)
+    assert await contar(db) == len(acoes)
+    await db.close_connection()
+
+    # Depois: a requisição só acumula; a descarga em lote fica com a tarefa de fundo
+    db = await criar_banco(os.path.join(tmp, "lote.db"))
+    auditoria = Auditoria()
+    t0 = time.perf_counter()
+    for acao in acoes:
+        auditoria.registrar(*acao)
+    depois = (time.perf_counter() - t0) / len(acoes)
+    t0 = time.perf_counter()
+    await auditoria.descarregar(db.writer)
+    descarga = time.perf_counter() - t0
+    assert await contar(db) == len(acoes) == auditoria.stats()["written"]
+    await db.close_connection()
+
+    print(f"{len(acoes)} ações gravadas e contadas nos dois caminhos\n")
+    print(f"{'antes (INSERT + commit na requisição)':<44} {antes * 1_000_000:10.1f} µs / requisição")
+    print(f"{'depois (registrar em memória)':<44} {depois * 1_000_000:10.1f} µs / requisição")
+    print(f"{'  descarga em lote (fora da requisição)':<44} {descarga / len(acoes) * 1_000_000:10.1f} µs / ação\n")
+
+
+async def pagina_offset(db: DatabaseManager, pagina: int, limit: int, usuario=None, q=None) -> list:
+    """Linha de base: OFFSET e LIKE, como faria um endpoint ingênuo."""
+    filtros, params = [], {}
+    if usuario:
+        filtros.append("usuario = :usuario")
+        params["usuario"] = usuario
+    if q:
+        filtros.append("busca LIKE :q")
+        params["q"] = f"%{q}%"
+    where = " AND ".join(filtros)
+    async with db.async_session_maker() as session:
+        resultado = await session.execute(
+            select(*COLUNAS).where(text(where or "1")).order_by(
+                RegistroHistorico.criado_em.desc(), RegistroHistorico.id.desc()
+            ).limit(limit).offset(pagina * limit),
+            params,
+        )
+        itens = [{**linha, "criado_em": linha["criado_em"].replace(tzinfo=timezone.utc)}
+                 for linha in resultado.mappings()]
+        return [item["id"] for item in itens]
+
+
+async def pagina_keyset(db: DatabaseManager, pagina: int, limit: int, usuario=None, q=None, cursores=None) -> list:
+    async with db.async_session_maker() as session:
+        cursor = cursores[pagina] if cursores else None
+        resultado = await listar_historico(session, usuario=usuario, q=q, cursor=cursor, limit=limit)
+        return [item["id"] for item in resultado["itens"]]
+
+
+async def obter_cursores(db: DatabaseManager, paginas: int, limit: int, usuario=None, q=None) -> list:
+    """Cursor do início de cada página, percorrendo-as em ordem como faria o cliente."""
+    cursores, cursor = [None], None
+    async with db.async_session_maker() as session:
+        for _ in range(paginas):
+            proximo = (await listar_historico(session, usuario=usuario, q=q, cursor=cursor, limit=limit))["proximo"]
+            cursor = decodificar_cursor(proximo)
+            cursores.append(cursor)
+    return cursores
+
+
+async def medir_consultas(tmp: str, registros: int, repeticoes: int, limit: int) -> None:
+    rng = random.Random(7)
+    db = await criar_banco(os.path.join(tmp, "historico.db"))
+    auditoria = Auditoria(lote=5000, max_pendentes=registros)
+    for _ in range(registros):
+        auditoria.registrar(*gerar_acao(rng))
+    await auditoria.descarregar(db.writer)
+    async with db.engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+    # Um prontuário que aparece uma vez: a busca precisa achar uma agulha no palheiro
+    async with db.async_session_maker() as session:
+        detalhes = (await session.execute(text("SELECT detalhes FROM historico WHERE id = :id"),
+                                          {"id": registros // 3})).scalar_one()
+    prontuario = detalhes.rsplit(" ", 1)[1]
+    print(f"{registros:,} registros no histórico, páginas de {limit}\n")
+
+    casos = (
+        ("página 1", 0, {}),
+        ("página 2000", 2000, {}),
+        ("usuário, página 20", 20, {"usuario": USUARIOS[5]}),
+        ("busca 'leito uti-12', página 20", 20, {"q": "leito uti-12"}),
+        ("busca 'reservou', página 50", 50, {"q": "reservou"}),
+        (f"busca prontuário {prontuario}", 0, {"q": prontuario}),
+    )
+    for rotulo, pagina, filtros in casos:
+        cursores = await obter_cursores(db, pagina, limit, **filtros) if pagina else None
+        antes = await pagina_offset(db, pagina, limit, **filtros)
+        depois = await pagina_keyset(db, pagina, limit, cursores=cursores, **filtros)
+        assert depois == antes and depois, rotulo
+        print(f"{rotulo}: {len(depois)} registros conferidos")
+        for nome, consultar in (("  antes (OFFSET + LIKE)", pagina_offset),
+                                ("  depois (keyset + FTS5)", pagina_keyset)):
+            kwargs = dict(filtros, cursores=cursores) if consultar is pagina_keyset else filtros
+            t0 = time.perf_counter()
+            for _ in range(repeticoes):
+                await consultar(db, pagina, limit, **kwargs)
+            print(f"{nome:<44} {(time.perf_counter() - t0) / repeticoes * 1000:9.3f} ms / consulta")
+    await db.close_connection()
+
+
+async def principal(acoes: int, registros: int, repeticoes: int, limit: int) -> None:
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        await medir_gravacao(tmp, [gerar_acao(rng) for _ in range(acoes)])
+        await medir_consultas(tmp, registros, repeticoes, limit)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--acoes", type=int, default=2000, help="Ações gravadas na medição de escrita")
+    parser.add_argument("--registros", type=int, default=300_000, help="Tamanho do histórico nas consultas")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(principal(args.acoes, args.registros, args.repeticoes, args.limit))
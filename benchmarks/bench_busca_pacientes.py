@@ -0,0 +1,98 @@
+"""
+Benchmark da busca de pacientes por nome (typeahead) no PacienteCsvProvider.
+
+Compara uma varredura linear (nomes já normalizados em memória, uma
+expressão regular por palavra sobre todas as linhas, como faria um filtro
+ingênuo no servidor) com o índice de prefixos do provedor. Os resultados
+das duas abordagens são conferidos entre si antes de medir.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_busca_pacientes --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.providers.implementations.paciente_csv_provider import PacienteCsvProvider
+from src.providers.interfaces.paciente_provider_interface import termos_busca
+
+PRENOMES = ["Maria", "José", "Ana", "João", "Antônio", "Francisco", "Carla", "Márcia", "Luís", "Sebastião",
+            "Letícia", "Mário", "Luana", "Conceição", "Raimundo", "Cecília", "Inês", "Benedito", "Júlia", "Otávio"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Lima", "Araújo", "Pereira", "Conceição", "Gonçalves",
+              "Simões", "Assunção", "Galvão", "Brandão", "Guimarães", "Magalhães", "Barbosa", "Ribeiro", "Lopes"]
+CONSULTAS = ["ma", "mar", "maria sil", "jo", "joao da", "conc", "seb ara", "leticia galvao", "otavio gui mag", "xyz"]
+
+
+def gerar_csv(path: str, rows: int) -> None:
+    rng = np.random.default_rng(7)
+    prenomes = rng.choice(PRENOMES, rows)
+    segundos = rng.choice(PRENOMES + [""] * 20, rows)
+    sobrenomes1 = rng.choice(SOBRENOMES, rows)
+    sobrenomes2 = rng.choice(SOBRENOMES, rows)
+    nomes = [" ".join(filter(None, partes)) + f" {i}" for i, partes in enumerate(zip(prenomes, segundos, sobrenomes1, sobrenomes2))]
+    pd.DataFrame({"codigo": np.arange(1, rows + 1), "nome": nomes, "sexo": "F"}).to_csv(path, index=False)
+
+
+class BuscaLinear:
+    """Linha de base: varre todos os nomes normalizados a cada busca."""
+    def __init__(self, nomes: pd.Series):
+        self.normalizados = pd.Series([" ".join(termos_busca(nome)) for nome in nomes])
+
+    def buscar(self, termo: str, limit: int) -> list:
+        mascara = np.ones(len(self.normalizados), dtype=bool)
+        palavras = termos_busca(termo)
+        for palavra in palavras:
+            mascara &= self.normalizados.str.contains(rf"\b{re.escape(palavra)}", regex=True).to_numpy()
+        achados = self.normalizados[mascara]
+        comeca = achados.str.startswith(palavras[0])
+        ordenados = pd.DataFrame({"comeca": ~comeca, "nome": achados}).sort_values(["comeca", "nome"], kind="stable")
+        return ordenados.index[:limit].tolist()
+
+
+def medir(nome: str, buscar, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for consulta in CONSULTAS:
+            buscar(consulta)
+    duracao = (time.perf_counter() - inicio) / (repeticoes * len(CONSULTAS)) * 1000
+    print(f"{nome:<36} {duracao:9.3f} ms / busca")
+    return duracao
+
+
+def main(rows: int, limit: int, repeticoes: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "pacientes.csv")
+        gerar_csv(csv_path, rows)
+        provedor = PacienteCsvProvider(csv_path)
+
+        carga = provedor._recarregar_se_alterado()
+        inicio = time.perf_counter()
+        indice = provedor._indexar_nomes(carga)
+        print(f"{rows:,} nomes; índice montado em {time.perf_counter() - inicio:.2f} s (na primeira busca)\n")
+        linear = BuscaLinear(carga.df["nome"])
+
+        for consulta in CONSULTAS:
+            esperado = linear.buscar(consulta, limit)
+            obtido = indice.buscar(termos_busca(consulta), limit).tolist()
+            assert obtido == esperado, (consulta, obtido, esperado)
+        exemplo = asyncio.run(provedor.buscar_pacientes("maria sil", limit=3))
+        print("'maria sil' ->", [paciente["nome"] for paciente in exemplo], "\n")
+
+        antes = medir("antes (varredura linear)", lambda q: linear.buscar(q, limit), 1)
+        depois = medir("depois (índice de prefixos)", lambda q: indice.buscar(termos_busca(q), limit), repeticoes)
+        print(f"Ganho: {antes / depois:,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.limit, args.repeticoes)
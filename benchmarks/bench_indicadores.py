@@ -0,0 +1,105 @@
+"""
+Benchmark dos indicadores operacionais (/api/indicadores) sobre um quadro
+de leitos sintético.
+
+Compara o recálculo por requisição (DataFrame do quadro + groupby, como
+faria um endpoint ingênuo) com o IndicadoresOcupacao, que ajusta contadores
+a cada lote de alterações do QuadroLeitos. Mede o custo por leitura e o custo
+que o motor acrescenta a cada sincronização do quadro, e confere que as
+contagens dos dois caminhos coincidem.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_indicadores --leitos 2000 --alteracoes 20
+"""
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from src.resources.indicadores import STATUS_FORA_DE_OPERACAO, STATUS_OCUPADOS, IndicadoresOcupacao
+from src.resources.quadro_leitos import QuadroLeitos
+
+STATUS = ["disponivel", "ocupado", "ocupado", "ocupado", "higienizacao", "desativado", "alta"]
+TIPOS = ["cirurgico", "hem", "obstetrico", "outro", "nao_definido"]
+ESPECIALIDADES = ["Cardiologia", "Clinica Medica", "Neurologia", "Trauma", "Oncologia", "Nefrologia"]
+
+
+def gerar_leito(rng: random.Random, numero: int) -> dict:
+    status = rng.choice(STATUS)
+    ocupado = status in STATUS_OCUPADOS
+    reservado = rng.random() < 0.2
+    return {
+        "leito_numero": f"UTI-{numero:05d}",
+        "status": status,
+        "tipo": rng.choice(TIPOS),
+        "paciente_prontuario": rng.randrange(1, 10**6) if ocupado else None,
+        "paciente_especialidade": rng.choice(ESPECIALIDADES) if ocupado else None,
+        "proximo_prontuario": rng.randrange(1, 10**6) if reservado else None,
+        "sinalizacao_transferencia": rng.random() < 0.1,
+    }
+
+
+def resumo_groupby(quadro: QuadroLeitos) -> dict:
+    """Linha de base: recalcula tudo a partir dos leitos a cada requisição."""
+    df = pd.DataFrame(quadro.listar())
+    ocupados = df[df["status"].isin(STATUS_OCUPADOS)]
+    operacionais = int((~df["status"].isin(STATUS_FORA_DE_OPERACAO)).sum())
+    return {
+        "total": len(df),
+        "por_status": df.groupby("status").size().to_dict(),
+        "por_tipo": {tipo: grupo.groupby("status").size().to_dict() for tipo, grupo in df.groupby("tipo")},
+        "por_especialidade": ocupados.groupby("paciente_especialidade").size().to_dict(),
+        "taxa": round(len(ocupados) / operacionais, 4) if operacionais else None,
+        "reservas_pendentes": int(df["proximo_prontuario"].notna().sum()),
+        "sinalizacoes_transferencia": int(df["sinalizacao_transferencia"].sum()),
+    }
+
+
+def comparar(motor: IndicadoresOcupacao, quadro: QuadroLeitos) -> None:
+    esperado = resumo_groupby(quadro)
+    obtido = motor.resumo()
+    assert obtido["leitos"]["total"] == esperado["total"]
+    assert obtido["leitos"]["por_status"] == esperado["por_status"]
+    assert {t: v["por_status"] for t, v in obtido["leitos"]["por_tipo"].items()} == esperado["por_tipo"]
+    assert obtido["por_especialidade"] == esperado["por_especialidade"]
+    assert obtido["ocupacao"]["taxa"] == esperado["taxa"]
+    assert obtido["reservas_pendentes"] == esperado["reservas_pendentes"]
+    assert obtido["sinalizacoes_transferencia"] == esperado["sinalizacoes_transferencia"]
+
+
+def main(leitos: int, alteracoes: int, rodadas: int, leituras: int) -> None:
+    rng = random.Random(42)
+    estado = {n: gerar_leito(rng, n) for n in range(leitos)}
+    quadro = QuadroLeitos()
+    quadro.aplicar(list(estado.values()))
+    motor = IndicadoresOcupacao(quadro)
+
+    custo_sync = []
+    for _ in range(rodadas):
+        for numero in rng.sample(range(leitos), alteracoes):
+            estado[numero] = gerar_leito(rng, numero)
+        inicio = time.perf_counter()
+        quadro.aplicar(list(estado.values()))
+        custo_sync.append(time.perf_counter() - inicio)
+    comparar(motor, quadro)
+    print(f"{leitos} leitos, {rodadas} sincronizações com {alteracoes} alterações cada: contagens conferidas\n")
+    print(f"{'sincronização do quadro (com o motor)':<40} {sum(custo_sync) / rodadas * 1000:9.3f} ms")
+
+    for nome, ler in (("antes (groupby por requisição)", lambda: resumo_groupby(quadro)),
+                      ("depois (contadores incrementais)", motor.resumo)):
+        inicio = time.perf_counter()
+        for _ in range(leituras):
+            ler()
+        duracao = (time.perf_counter() - inicio) / leituras * 1_000_000
+        print(f"{nome:<40} {duracao:9.1f} µs / leitura")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leitos", type=int, default=2000)
+    parser.add_argument("--alteracoes", type=int, default=20, help="Leitos alterados por sincronização")
+    parser.add_argument("--rodadas", type=int, default=200)
+    parser.add_argument("--leituras", type=int, default=200)
+    args = parser.parse_args()
+    main(args.leitos, args.alteracoes, args.rodadas, args.leituras)
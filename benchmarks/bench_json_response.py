@@ -0,0 +1,87 @@
+"""
+Benchmark da serialização das respostas de listagem: custo por 10 mil linhas.
+
+Compara o caminho padrão do FastAPI para `response_model=List[dict]`
+(validação do response_model + JSONResponse com json da stdlib) com o
+FastJSONResponse devolvido diretamente pelo endpoint.
+
+As linhas imitam as duas fontes: CSV (tipos nativos vindos do pandas) e
+Postgres (date e Decimal vindos do asyncpg).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_json_response --rows 10000
+"""
+import argparse
+import asyncio
+import datetime
+import time
+from decimal import Decimal
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.helpers import json_helper
+from src.helpers.json_helper import FastJSONResponse
+
+
+def gerar_linhas(rows: int, postgres: bool) -> List[dict]:
+    base = datetime.date(2024, 1, 1)
+    linhas = []
+    for codigo in range(1, rows + 1):
+        admissao = base + datetime.timedelta(days=codigo % 700)
+        linhas.append({
+            "codigo": codigo,
+            "prontuario": codigo,
+            "nome": f"Paciente {codigo}",
+            "dt_nascimento": base - datetime.timedelta(days=codigo % 33000),
+            "idade": Decimal(codigo % 95) if postgres else codigo % 95,
+            "nome_mae": f"Mãe {codigo}",
+            "sexo": "F" if codigo % 2 else "M",
+            "especialidade_atual": "Clínica Médica",
+            "data_admissao": admissao if postgres else admissao.isoformat(),
+            "origem_atendimento": "PS",
+        })
+    return linhas
+
+
+def medir(nome: str, serializar, linhas: List[dict], repeticoes: int) -> float:
+    serializar(linhas)  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        corpo = serializar(linhas)
+    duracao = (time.perf_counter() - inicio) / repeticoes
+    por_10k = duracao * 10_000 / len(linhas) * 1000
+    print(f"{nome:<44} {por_10k:9.2f} ms / 10k linhas  ({len(corpo) / 1024:,.0f} KiB)")
+    return por_10k
+
+
+def main(rows: int, repeticoes: int) -> None:
+    campo = create_model_field(name="Response_listar_pacientes", type_=List[dict], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def padrao(linhas):
+        # O que o FastAPI faz com o retorno de um endpoint com response_model=List[dict]
+        conteudo = loop.run_until_complete(serialize_response(field=campo, response_content=linhas, is_coroutine=True))
+        return JSONResponse(conteudo).body
+
+    def rapido(linhas):
+        return FastJSONResponse(linhas).body
+
+    print(f"Backend do FastJSONResponse: {'orjson' if json_helper.orjson else 'json (stdlib)'}")
+    for fonte, postgres in (("csv", False), ("postgres", True)):
+        linhas = gerar_linhas(rows, postgres)
+        print(f"\nLinhas no formato do provedor {fonte} ({rows} linhas):")
+        antes = medir("antes (response_model + JSONResponse)", padrao, linhas, repeticoes)
+        depois = medir("depois (FastJSONResponse direto)", rapido, linhas, repeticoes)
+        print(f"Ganho: {antes / depois:,.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.repeticoes)
@@ -0,0 +1,95 @@
+"""
+Benchmark do PacienteCsvProvider: requisições/s de `obter_paciente_por_codigo`.
+
+Compara o comportamento antigo (um provedor novo por requisição, com
+`pd.read_csv` + filtro booleano a cada chamada) com o provedor compartilhado
+e indexado por `codigo`.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_paciente_csv_provider --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.providers.implementations.paciente_csv_provider import PacienteCsvProvider
+
+
+class LegacyPacienteCsvProvider:
+    """Reprodução da implementação anterior, usada como linha de base."""
+    def __init__(self, csv_path: str):
+        self.df = pd.read_csv(csv_path)
+        self.df['codigo'] = self.df['codigo'].astype(int)
+
+    async def obter_paciente_por_codigo(self, codigo: int):
+        paciente_df = self.df[self.df['codigo'] == codigo]
+        return paciente_df.to_dict(orient='records')[0]
+
+
+def gerar_csv(path: str, rows: int) -> None:
+    rng = np.random.default_rng(42)
+    codigos = np.arange(1, rows + 1)
+    nascimentos = pd.Timestamp("1930-01-01") + pd.to_timedelta(rng.integers(0, 33000, rows), unit="D")
+    admissoes = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D")
+    df = pd.DataFrame({
+        "codigo": codigos,
+        "prontuario": codigos,
+        "nome": [f"Paciente {c}" for c in codigos],
+        "dt_nascimento": nascimentos.strftime("%Y-%m-%d"),
+        "idade": rng.integers(0, 95, rows),
+        "nome_mae": [f"Mae {c}" for c in codigos],
+        "nome_pai": [f"Pai {c}" for c in codigos],
+        "sexo": rng.choice(["F", "M"], rows),
+        "cor": rng.choice(["Branca", "Parda", "Preta", "Amarela", "Indigena"], rows),
+        "especialidade_atual": rng.choice(["Clinica Medica", "Cardiologia", "Neurologia", "Trauma", "Oncologia"], rows),
+        "diagnostico_principal": "Diagnostico sintetico",
+        "data_admissao": admissoes.strftime("%Y-%m-%d"),
+        "data_alta_prevista": (admissoes + pd.Timedelta(days=7)).strftime("%Y-%m-%d"),
+        "origem_atendimento": rng.choice(["PS", "Ambulatorio", "Transferido"], rows),
+    })
+    df.to_csv(path, index=False)
+
+
+async def medir(nome: str, requisicao, n: int, codigos: list) -> float:
+    inicio = time.perf_counter()
+    for i in range(n):
+        await requisicao(codigos[i % len(codigos)])
+    duracao = time.perf_counter() - inicio
+    rps = n / duracao
+    print(f"{nome:<40} {n:>8} req em {duracao:8.3f}s -> {rps:12.1f} req/s")
+    return rps
+
+
+async def main(rows: int, legacy_requests: int, requests: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "pacientes.csv")
+        print(f"Gerando CSV sintético com {rows} linhas...")
+        gerar_csv(csv_path, rows)
+        codigos = random.Random(7).sample(range(1, rows + 1), k=min(rows, 10_000))
+
+        async def legado(codigo):
+            # Antes: dependencies._get_paciente_csv_provider criava um provedor por requisição
+            return await LegacyPacienteCsvProvider(csv_path).obter_paciente_por_codigo(codigo)
+
+        inicio = time.perf_counter()
+        compartilhado = PacienteCsvProvider(csv_path)
+        print(f"Carga inicial do provedor compartilhado: {time.perf_counter() - inicio:.3f}s")
+
+        antes = await medir("antes (provedor por requisição)", legado, legacy_requests, codigos)
+        depois = await medir("depois (compartilhado + índice)", compartilhado.obter_paciente_por_codigo, requests, codigos)
+        print(f"Ganho: {depois / antes:,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--legacy-requests", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.legacy_requests, args.requests))
@@ -0,0 +1,79 @@
+"""
+Benchmark da carga a frio do PacienteCsvProvider: tempo para construir o
+provedor e memória privada (não compartilhável entre workers) que ele ocupa.
+
+Compara a leitura do CSV (parsing de texto pelo pandas, strings em objetos
+Python) com o snapshot Arrow gerado por `gerar_snapshot` (arquivo mapeado em
+memória, categóricas para colunas de baixa cardinalidade). Cada cenário roda
+num processo novo, como um worker do uvicorn subindo.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_paciente_snapshot --rows 1000000
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from benchmarks.bench_paciente_csv_provider import gerar_csv
+
+
+def _rss_kib(campo: str) -> int:
+    # RssAnon = memória privada do processo; RssFile = páginas de arquivo (compartilháveis)
+    try:
+        with open("/proc/self/status") as status:
+            for linha in status:
+                if linha.startswith(campo + ":"):
+                    return int(linha.split()[1])
+    except FileNotFoundError:
+        pass
+    return 0
+
+
+def _carregar(args) -> tuple:
+    csv_path, snapshot_path, esperado = args
+    from src.providers.implementations.paciente_csv_provider import PacienteCsvProvider
+
+    anon, arquivo = _rss_kib("RssAnon"), _rss_kib("RssFile")
+    inicio = time.perf_counter()
+    provedor = PacienteCsvProvider(csv_path, snapshot_path=snapshot_path)
+    duracao = time.perf_counter() - inicio
+    assert provedor._assinatura[0] == esperado
+    return duracao, _rss_kib("RssAnon") - anon, _rss_kib("RssFile") - arquivo
+
+
+def medir(nome: str, csv_path: str, snapshot_path: str, esperado: str, repeticoes: int) -> float:
+    contexto = multiprocessing.get_context("spawn")
+    resultados = []
+    for _ in range(repeticoes):
+        with contexto.Pool(1) as pool:
+            resultados.append(pool.apply(_carregar, ((csv_path, snapshot_path, esperado),)))
+    duracao, anon, arquivo = min(resultados)
+    print(f"{nome:<34} {duracao * 1000:9.1f} ms   privada: {anon / 1024:7.1f} MiB   arquivo: {arquivo / 1024:7.1f} MiB")
+    return duracao
+
+
+def main(rows: int, repeticoes: int) -> None:
+    from src.providers.implementations.paciente_csv_provider import gerar_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "pacientes.csv")
+        gerar_csv(csv_path, rows)
+        inicio = time.perf_counter()
+        snapshot_path = gerar_snapshot(csv_path)
+        print(f"{rows:,} linhas: CSV {os.path.getsize(csv_path) / 2**20:,.1f} MiB, "
+              f"snapshot {os.path.getsize(snapshot_path) / 2**20:,.1f} MiB "
+              f"(gerado em {time.perf_counter() - inicio:.1f} s)\n")
+        # Sem snapshot_path explícito o provedor usaria o .arrow; um caminho inexistente força o CSV
+        antes = medir("antes (pd.read_csv)", csv_path, os.path.join(tmp, "ausente.arrow"), csv_path, repeticoes)
+        depois = medir("depois (snapshot Arrow mapeado)", csv_path, snapshot_path, snapshot_path, repeticoes)
+    print(f"Ganho: {antes / depois:,.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.repeticoes)
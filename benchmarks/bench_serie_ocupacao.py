@@ -0,0 +1,130 @@
+"""
+Benchmark da série histórica de ocupação (/api/indicadores/ocupacao) sobre
+um ano de amostras sintéticas, uma por minuto, num SQLite temporário.
+
+Compara a agregação das amostras brutas a cada consulta (GROUP BY sobre a
+tabela de amostras, como faria um endpoint ingênuo que guardasse tudo) com a
+leitura dos baldes já consolidados pela SerieOcupacao. Antes de medir,
+confere que os baldes gravados amostra a amostra por `registrar` coincidem
+com a agregação direta das amostras, e mede o custo de cada gravação.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_serie_ocupacao --dias 365 --repeticoes 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from src.models.ocupacao import OcupacaoAgregado, OcupacaoAmostra
+from src.resources.database import Base, DatabaseManager
+from src.resources.serie_ocupacao import DIA, HORA, MINUTO, SerieOcupacao
+
+INICIO = 1_735_700_400  # 2025-01-01 00:00 (UTC-3)
+LEITOS = 60
+
+
+def gerar_amostras(dias: int) -> list:
+    rng = np.random.default_rng(3)
+    ts = INICIO + np.arange(dias * DIA // MINUTO) * MINUTO
+    # Ocupação oscila ao longo do dia, com ruído, e alguns leitos desativados
+    ocupados = 45 + 8 * np.sin(ts / DIA * 2 * np.pi) + rng.normal(0, 3, len(ts))
+    operacionais = LEITOS - rng.integers(0, 4, len(ts))
+    ocupados = np.clip(ocupados.round(), 0, operacionais).astype(int)
+    return list(zip(ts.tolist(), ocupados.tolist(), operacionais.tolist(), [LEITOS] * len(ts)))
+
+
+async def carregar_em_massa(db: DatabaseManager, serie: SerieOcupacao, amostras: list) -> None:
+    """Grava as amostras e monta os baldes com INSERT ... SELECT (mesmo resultado de registrar, mais rápido)."""
+    async with db.engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "INSERT INTO ocupacao_amostras (ts, ocupados, operacionais, total) VALUES (?, ?, ?, ?)", amostras
+        )
+        for passo, origem in ((MINUTO, None), (HORA, MINUTO), (DIA, HORA)):
+            balde = f"(({{col}} + {serie.deslocamento}) / {passo} * {passo} - {serie.deslocamento})"
+            if origem is None:
+                consulta = (f"SELECT {passo}, {balde.format(col='ts')}, count(*), sum(ocupados), sum(operacionais), "
+                            f"min(ocupados), max(ocupados) FROM ocupacao_amostras GROUP BY 2")
+            else:
+                consulta = (f"SELECT {passo}, {balde.format(col='inicio')}, sum(amostras), sum(soma_ocupados), "
+                            f"sum(soma_operacionais), min(min_ocupados), max(max_ocupados) "
+                            f"FROM ocupacao_agregados WHERE passo = {origem} GROUP BY 2")
+            await conn.exec_driver_sql(f"INSERT INTO ocupacao_agregados {consulta}")
+
+
+async def agregar_amostras(db: DatabaseManager, serie: SerieOcupacao, inicio: int, fim: int, passo: int) -> list:
+    """Linha de base: agrega as amostras brutas do período a cada consulta."""
+    async with db.async_session_maker() as session:
+        resultado = await session.execute(text(
+            "SELECT (ts + :desl) / :passo * :passo - :desl AS inicio, count(*), sum(ocupados), sum(operacionais), "
+            "min(ocupados), max(ocupados) FROM ocupacao_amostras WHERE ts >= :inicio AND ts < :fim + :passo "
+            "GROUP BY 1 ORDER BY 1"
+        ), {"desl": serie.deslocamento, "passo": passo, "inicio": serie.inicio_do_balde(inicio, passo), "fim": fim})
+        return [serie.ponto(*linha) for linha in resultado]
+
+
+async def consultar_baldes(db: DatabaseManager, serie: SerieOcupacao, inicio: int, fim: int, passo: int) -> list:
+    async with db.async_session_maker() as session:
+        return await serie.consultar(session, inicio, fim, passo)
+
+
+async def conferir_registrar(tmp: str, serie: SerieOcupacao, amostras: list) -> float:
+    """Grava amostras uma a uma pela fila de escrita e compara com a agregação direta."""
+    db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tmp, 'registrar.db')}", env_prefix="BENCH")
+    async with db.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[OcupacaoAmostra.__table__, OcupacaoAgregado.__table__])
+    inicio = time.perf_counter()
+    for amostra in amostras:
+        await serie.registrar(db.writer, *amostra)
+    custo = (time.perf_counter() - inicio) / len(amostras)
+    primeiro, ultimo = amostras[0][0], amostras[-1][0]
+    for passo in (MINUTO, HORA, DIA):
+        esperado = await agregar_amostras(db, serie, primeiro, ultimo, passo)
+        obtido = await consultar_baldes(db, serie, primeiro, ultimo, passo)
+        assert obtido == esperado, passo
+    await db.close_connection()
+    return custo
+
+
+async def principal(dias: int, repeticoes: int) -> None:
+    serie = SerieOcupacao(intervalo=MINUTO)
+    amostras = gerar_amostras(dias)
+    with tempfile.TemporaryDirectory() as tmp:
+        custo = await conferir_registrar(tmp, serie, amostras[:2 * DIA // MINUTO])
+        print(f"registrar: {custo * 1000:.2f} ms por amostra (amostra + 3 baldes); baldes conferidos\n")
+
+        db = DatabaseManager(f"sqlite+aiosqlite:///{os.path.join(tmp, 'serie.db')}", env_prefix="BENCH")
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[OcupacaoAmostra.__table__, OcupacaoAgregado.__table__])
+        await carregar_em_massa(db, serie, amostras)
+        fim = amostras[-1][0]
+        print(f"{len(amostras):,} amostras ({dias} dias)\n")
+
+        for rotulo, inicio, passo in (("1 ano por dia", INICIO, DIA),
+                                      ("30 dias por hora", fim - 30 * DIA, HORA),
+                                      ("24 h por minuto", fim - DIA, MINUTO)):
+            antes = await agregar_amostras(db, serie, inicio, fim, passo)
+            depois = await consultar_baldes(db, serie, inicio, fim, passo)
+            assert depois == antes, rotulo
+            print(f"{rotulo}: {len(depois)} pontos")
+            for nome, consultar in (("  antes (GROUP BY nas amostras)", agregar_amostras),
+                                    ("  depois (baldes consolidados)", consultar_baldes)):
+                tempos = []
+                for _ in range(repeticoes):
+                    t0 = time.perf_counter()
+                    await consultar(db, serie, inicio, fim, passo)
+                    tempos.append(time.perf_counter() - t0)
+                print(f"{nome:<44} {sum(tempos) / repeticoes * 1000:9.3f} ms / consulta")
+        await db.close_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(principal(args.dias, args.repeticoes))
@@ -0,0 +1,132 @@
+"""
+Teste de carga do refresh de token no banco da aplicação (SQLite) com vários
+processos, como vários workers do uvicorn.
+
+Compara o comportamento antigo (journal padrão, SELECT + DELETE/commit +
+INSERT/commit por refresh, cada requisição na sua sessão) com o perfil
+SQLite do DatabaseManager (WAL, synchronous=NORMAL, busy_timeout) e a rotação
+feita pela fila de escrita única, que agrupa commits.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bench_sqlite_refresh --workers 4 --concurrency 16 --seconds 5
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from sqlalchemy import delete
+
+
+def _gerenciador(dsn: str, ajustado: bool):
+    os.environ["BENCH_TUNING"] = "true" if ajustado else "false"
+    from src.resources.database import DatabaseManager
+    return DatabaseManager(dsn, env_prefix="BENCH")
+
+
+async def _preparar(dsn: str, tokens: int) -> None:
+    from src.auth.auth import auth_handler
+    from src.resources.database import Base
+
+    db_manager = _gerenciador(dsn, ajustado=True)
+    async with db_manager.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    for _ in range(tokens):
+        await auth_handler.create_refresh_token("usuario", ["Users"], db_manager.writer)
+    await db_manager.close_connection()
+
+
+async def _refresh_legado(db_manager, auth_handler, token: str) -> str:
+    """Reprodução do refresh anterior: três idas ao banco e dois commits."""
+    from src.models.refresh_token import RefreshToken
+
+    async with db_manager.async_session_maker() as db:
+        await auth_handler.verify_refresh_token(token, db)
+        await db.execute(delete(RefreshToken).where(RefreshToken.token_hash == auth_handler._hash_refresh_token(token)))
+        await db.commit()
+        novo, registro = auth_handler._new_refresh_token("usuario", ["Users"])
+        db.add(registro)
+        await db.commit()
+        return novo
+
+
+async def _refresh_novo(db_manager, auth_handler, token: str) -> str:
+    async with db_manager.async_session_maker() as db:
+        await auth_handler.verify_refresh_token(token, db)
+    return await auth_handler.rotate_refresh_token(token, "usuario", ["Users"], db_manager.writer)
+
+
+async def _worker_async(dsn: str, ajustado: bool, concorrencia: int, segundos: float, tokens_iniciais) -> tuple:
+    from src.auth.auth import auth_handler
+
+    db_manager = _gerenciador(dsn, ajustado)
+    refresh = _refresh_novo if ajustado else _refresh_legado
+    fim = time.perf_counter() + segundos
+    ok = bloqueios = 0
+
+    async def cliente(token: str):
+        nonlocal ok, bloqueios
+        while time.perf_counter() < fim:
+            try:
+                token = await refresh(db_manager, auth_handler, token)
+                ok += 1
+            except Exception as e:
+                if "locked" not in str(e):
+                    raise
+                bloqueios += 1
+
+    await asyncio.gather(*(cliente(token) for token in tokens_iniciais))
+    await db_manager.close_connection()
+    return ok, bloqueios
+
+
+def _worker(args) -> tuple:
+    return asyncio.run(_worker_async(*args))
+
+
+def _tokens_para_workers(dsn: str, workers: int, concorrencia: int):
+    # Cada cliente precisa de um refresh token válido próprio para começar
+    from src.auth.auth import auth_handler
+
+    async def criar():
+        db_manager = _gerenciador(dsn, ajustado=True)
+        tokens = [
+            [await auth_handler.create_refresh_token("usuario", ["Users"], db_manager.writer) for _ in range(concorrencia)]
+            for _ in range(workers)
+        ]
+        await db_manager.close_connection()
+        return tokens
+
+    return asyncio.run(criar())
+
+
+def medir(nome: str, ajustado: bool, workers: int, concorrencia: int, segundos: float) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        dsn = f"sqlite+aiosqlite:///{os.path.join(tmp, 'app.db')}"
+        asyncio.run(_preparar(dsn, tokens=1000))
+        tokens = _tokens_para_workers(dsn, workers, concorrencia)
+        if not ajustado:
+            # O arquivo foi criado em WAL pelo preparo; o modo antigo usa o journal padrão
+            sqlite3.connect(os.path.join(tmp, "app.db")).execute("PRAGMA journal_mode=DELETE").close()
+        with multiprocessing.get_context("spawn").Pool(workers) as pool:
+            resultados = pool.map(_worker, [(dsn, ajustado, concorrencia, segundos, tokens[i]) for i in range(workers)])
+    ok = sum(r[0] for r in resultados)
+    bloqueios = sum(r[1] for r in resultados)
+    taxa = ok / segundos
+    print(f"{nome:<40} {taxa:9.1f} refresh/s   'database is locked': {bloqueios}")
+    return taxa
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16, help="Refreshes simultâneos por worker")
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    print(f"{args.workers} workers x {args.concurrency} clientes, {args.seconds}s por cenário")
+    antes = medir("antes (journal padrão, 2 commits)", False, args.workers, args.concurrency, args.seconds)
+    depois = medir("depois (WAL + fila de escrita)", True, args.workers, args.concurrency, args.seconds)
+    print(f"Ganho: {depois / antes:,.1f}x")
@@ -1,7 +1,12 @@
 import os
 import jwt
 import re
+import asyncio
+import hashlib
 import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 from fastapi import Depends, HTTPException, status
@@ -9,11 +14,15 @@ from fastapi.security import OAuth2PasswordBearer
 from dotenv import load_dotenv
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
-from ldap3 import Server, Connection, ALL, SUBTREE, ALL_ATTRIBUTES
+from ldap3 import Server, Connection, NONE, SUBTREE
+from ldap3.utils.conv import escape_filter_chars
 from ldap3.core.exceptions import LDAPBindError, LDAPSocketOpenError, LDAPException
 
 from ..resources.database import get_app_db_session
+from ..resources.write_queue import WriteQueue
 from ..models.refresh_token import RefreshToken
+from ..helpers.cache_helper import MISSING, TTLCache
+from .ldap_pool import LdapConnectionPool, LdapPoolTimeout
 
 load_dotenv()
 
@@ -21,7 +30,48 @@ load_dotenv()
 JWT_SECRET = os.getenv("JWT_SECRET")
 JWT_EXP_HOURS = int(os.getenv("JWT_EXP_HOURS", 24))
 REFRESH_TOKEN_EXP_DAYS = int(os.getenv("REFRESH_TOKEN_EXP_DAYS", 30))
+# Cache dos perfis usados no refresh do token: perfis válidos e contas
+# desativadas/inexistentes (cache negativo) têm TTLs próprios, em segundos
+PROFILE_CACHE_TTL = float(os.getenv("AD_PROFILE_TTL", 300))
+PROFILE_CACHE_NEGATIVE_TTL = float(os.getenv("AD_PROFILE_NEGATIVE_TTL", 60))
+PROFILE_CACHE_MAX_MB = float(os.getenv("AD_PROFILE_CACHE_MAX_MB", 16))
+# Tokens já verificados mantidos em memória (claims até o exp de cada token)
+JWT_DECODE_CACHE_SIZE = int(os.getenv("JWT_DECODE_CACHE_SIZE", 10000))
+JWT_DECODE_CACHE_MAX_MB = float(os.getenv("JWT_DECODE_CACHE_MAX_MB", 32))
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
+# Atributos do AD copiados para o token (além de username e groups). O
+# frontend usa givenName e userPrincipalName; o resto é exibido no perfil.
+AD_ATTRIBUTES = [
+    attr.strip()
+    for attr in os.getenv("AD_ATTRIBUTES", "givenName,displayName,userPrincipalName,mail,title,department,employeeNumber").split(",")
+    if attr.strip()
+]
+# Opcional: só grupos cujo nome casa com esta regex entram no token
+AD_GROUP_FILTER = re.compile(os.getenv("AD_GROUP_FILTER")) if os.getenv("AD_GROUP_FILTER") else None
+
+GROUP_CN_PATTERN = re.compile(r"CN=([^,]+)")
+# Bit ACCOUNTDISABLE de userAccountControl
+UAC_ACCOUNT_DISABLED = 0x2
+
+def parse_group_names(member_of, group_filter: re.Pattern | None = None) -> list:
+    """Extrai o CN de cada DN de memberOf, numa única passada."""
+    groups = [match.group(1) for match in map(GROUP_CN_PATTERN.match, member_of) if match]
+    if group_filter is not None:
+        groups = [group for group in groups if group_filter.search(group)]
+    return groups
+
+def build_user_claims(username, attrs: dict, attributes, group_filter: re.Pattern | None = None) -> dict:
+    """
+    Monta as claims do usuário a partir dos atributos do AD: username, groups
+    e apenas os atributos permitidos que vieram preenchidos, como listas de strings.
+    """
+    claims = {"username": username, "groups": parse_group_names(attrs.get("memberOf") or [], group_filter)}
+    for key in attributes:
+        value = attrs.get(key)
+        if value in (None, [], ""):
+            continue
+        claims[key] = [str(v) for v in value] if isinstance(value, list) else str(value)
+    return claims
 
 # --- Interface e Implementações de Provedor de Autenticação ---
 
@@ -31,20 +81,38 @@ class AuthProviderInterface(ABC):
     def authenticate_user(self, username, password) -> dict:
         pass
 
+    async def authenticate_user_async(self, username, password) -> dict:
+        """
+        Versão para o event loop. Provedores que fazem I/O bloqueante devem
+        sobrescrevê-la; o padrão chama a versão síncrona diretamente.
+        """
+        return self.authenticate_user(username, password)
+
+    @abstractmethod
+    def get_user_profile(self, username) -> dict | None:
+        """
+        Busca o perfil (as mesmas claims do login) sem a senha do usuário, para
+        o refresh do token. Retorna None se a conta não existe ou está desativada.
+        """
+        pass
+
+    async def get_user_profile_async(self, username) -> dict | None:
+        return self.get_user_profile(username)
+
+    def pool_status(self) -> dict | None:
+        """Estado do pool de conexões do provedor, se houver."""
+        return None
+
+    def close(self) -> None:
+        """Libera conexões mantidas pelo provedor."""
+
 class MockAuthProvider(AuthProviderInterface):
     """Provedor de autenticação mock para desenvolvimento offline."""
     def authenticate_user(self, username, password) -> dict:
         print("--- Using Mock Authentication ---")
         if username == "admin" and password == "admin":
             print(f"Authentication successful for mock user: {username}")
-            # O nome do grupo que o frontend usa para identificar administradores
-            admin_group = "GLO-SEC-HCPE-SETISD"
-            return {
-                "username": "admin",
-                "displayName": ["Mock Admin"],
-                "groups": [admin_group, "Users"],
-                "email": "admin@mock.com"
-            }
+            return self.get_user_profile(username)
         else:
             print(f"Authentication failed for mock user: {username}")
             raise HTTPException(
@@ -52,6 +120,18 @@ class MockAuthProvider(AuthProviderInterface):
                 detail="Invalid mock credentials"
             )
 
+    def get_user_profile(self, username) -> dict | None:
+        if username != "admin":
+            return None
+        # O nome do grupo que o frontend usa para identificar administradores
+        admin_group = "GLO-SEC-HCPE-SETISD"
+        return {
+            "username": "admin",
+            "displayName": ["Mock Admin"],
+            "groups": [admin_group, "Users"],
+            "email": "admin@mock.com"
+        }
+
 class ActiveDirectoryAuthProvider(AuthProviderInterface):
     """Provedor de autenticação real usando LDAP/Active Directory."""
     def __init__(self):
@@ -61,75 +141,126 @@ class ActiveDirectoryAuthProvider(AuthProviderInterface):
         self.ad_bind_password = os.getenv("AD_BIND_PASSWORD")
         if not self.ad_url or not self.ad_basedn:
             raise RuntimeError("Active Directory is not configured. Check .env file.")
+        # Criado uma única vez; get_info=NONE evita baixar schema/DSA info a cada conexão
+        self.server = Server(self.ad_url, get_info=NONE)
+        # Buscas com a conta de serviço usam conexões reaproveitadas; só o bind
+        # com a senha do usuário continua sendo feito a cada login
+        self.search_pool: LdapConnectionPool | None = None
+        if self.ad_bind_user and self.ad_bind_password:
+            self.search_pool = LdapConnectionPool(
+                self.server,
+                self.ad_bind_user,
+                self.ad_bind_password,
+                tamanho=int(os.getenv("AD_POOL_SIZE", 4)),
+                tempo_espera=float(os.getenv("AD_POOL_TIMEOUT", 5)),
+                verificar_apos=float(os.getenv("AD_POOL_CHECK_SECONDS", 60)),
+            )
+        # Executor próprio para as chamadas LDAP (bloqueantes): um controlador de
+        # domínio lento ocupa no máximo estas threads, e não o threadpool do
+        # AnyIO usado pelo resto da API
+        self.max_concurrency = int(os.getenv("AD_MAX_CONCURRENCY", 8))
+        self.auth_timeout = float(os.getenv("AD_AUTH_TIMEOUT", 15))
+        self.executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="ldap-auth")
 
     def _bind(self, user, password) -> Connection:
-        server = Server(self.ad_url, get_info=ALL)
         return Connection(
-            server,
+            self.server,
             user=user,
             password=password,
             auto_bind=True,
             receive_timeout=10,
         )
 
-    def authenticate_user(self, username, password) -> dict:
-        print(f"--- Starting AD Authentication for user: {username} ---")
-        user_conn = None
-        search_conn = None
+    def pool_status(self) -> dict | None:
+        return self.search_pool.status() if self.search_pool else None
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.search_pool:
+            self.search_pool.fechar()
+
+    async def _run_blocking(self, func, *args):
+        loop = asyncio.get_running_loop()
         try:
-            user_bind_dn = f"EBSERHNET\\{username}"
-            user_conn = self._bind(user_bind_dn, password)
-
-            search_conn = user_conn
-            if self.ad_bind_user and self.ad_bind_password:
-                search_conn = self._bind(self.ad_bind_user, self.ad_bind_password)
-
-            search_filter = f"(&(objectClass=user)(sAMAccountName={username}))"
-            search_conn.search(
-                search_base=self.ad_basedn,
-                search_filter=search_filter,
-                search_scope=SUBTREE,
-                attributes=ALL_ATTRIBUTES,
-                size_limit=1,
+            return await asyncio.wait_for(
+                loop.run_in_executor(self.executor, func, *args),
+                timeout=self.auth_timeout,
             )
+        except asyncio.TimeoutError:
+            # A thread segue até o receive_timeout do LDAP, mas a requisição é liberada
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="AD authentication timed out")
 
-            if not search_conn.entries:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-
-            entry = search_conn.entries[0]
-            attrs = entry.entry_attributes_as_dict
-            user_info = {"username": username}
-
-            groups_attr = attrs.get("memberOf") or []
-            user_info["groups"] = [
-                re.match(r"CN=([^,]+)", group).group(1)
-                for group in groups_attr
-                if re.match(r"CN=([^,]+)", group)
-            ]
-
-            for key, value in attrs.items():
-                if key == "memberOf":
-                    continue
-                if isinstance(value, list):
-                    user_info[key] = [str(v) for v in value]
-                else:
-                    user_info[key] = str(value)
+    async def authenticate_user_async(self, username, password) -> dict:
+        return await self._run_blocking(self.authenticate_user, username, password)
 
-            print(f"--- AD Authentication successful for user: {username}. ---")
-            return user_info
+    async def get_user_profile_async(self, username) -> dict | None:
+        return await self._run_blocking(self.get_user_profile, username)
 
+    @contextmanager
+    def _ldap_errors(self):
+        """Converte exceções do ldap3 nas respostas HTTP da API."""
+        try:
+            yield
         except LDAPBindError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
         except LDAPSocketOpenError:
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="AD server is down or unreachable")
+        except LdapPoolTimeout:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="AD connection pool exhausted")
         except LDAPException as e:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"AD error: {e}")
+
+    def _search_user(self, conn: Connection, username, attributes=None) -> dict | None:
+        search_filter = f"(&(objectClass=user)(sAMAccountName={escape_filter_chars(username)}))"
+        conn.search(
+            search_base=self.ad_basedn,
+            search_filter=search_filter,
+            search_scope=SUBTREE,
+            attributes=attributes or ["memberOf", *AD_ATTRIBUTES],
+            size_limit=1,
+        )
+
+        if not conn.entries:
+            return None
+
+        return conn.entries[0].entry_attributes_as_dict
+
+    def authenticate_user(self, username, password) -> dict:
+        print(f"--- Starting AD Authentication for user: {username} ---")
+        user_conn = None
+        try:
+            with self._ldap_errors():
+                user_bind_dn = f"EBSERHNET\\{username}"
+                user_conn = self._bind(user_bind_dn, password)
+
+                if self.search_pool:
+                    attrs = self.search_pool.executar(lambda conn: self._search_user(conn, username))
+                else:
+                    attrs = self._search_user(user_conn, username)
+            if attrs is None:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+            user_info = build_user_claims(username, attrs, AD_ATTRIBUTES, AD_GROUP_FILTER)
+
+            print(f"--- AD Authentication successful for user: {username}. ---")
+            return user_info
         finally:
-            if search_conn and search_conn is not user_conn and search_conn.bound:
-                search_conn.unbind()
             if user_conn and user_conn.bound:
                 user_conn.unbind()
 
+    def get_user_profile(self, username) -> dict | None:
+        if not self.search_pool:
+            # Sem a senha do usuário, só a conta de serviço consegue consultar o AD
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Profile lookup requires AD_BIND_USER")
+        attributes = ["memberOf", "userAccountControl", *AD_ATTRIBUTES]
+        with self._ldap_errors():
+            attrs = self.search_pool.executar(lambda conn: self._search_user(conn, username, attributes))
+        if attrs is None:
+            return None
+        uac = attrs.get("userAccountControl") or [0]
+        if int(uac[0] if isinstance(uac, list) else uac) & UAC_ACCOUNT_DISABLED:
+            return None
+        return build_user_claims(username, attrs, AD_ATTRIBUTES, AD_GROUP_FILTER)
+
 # --- AuthHandler Principal ---
 
 class AuthHandler:
@@ -141,10 +272,48 @@ class AuthHandler:
         else:
             print("WARNING: AD environment variables not found. Using Mock authentication.")
             self.provider: AuthProviderInterface = MockAuthProvider()
+        self.profile_cache = TTLCache(max_bytes=int(PROFILE_CACHE_MAX_MB * 1024 * 1024))
+        # Chaveado pelo SHA-256 do token; só recebe tokens cuja assinatura já foi verificada
+        self.token_cache = TTLCache(
+            max_bytes=int(JWT_DECODE_CACHE_MAX_MB * 1024 * 1024),
+            max_entries=JWT_DECODE_CACHE_SIZE,
+        )
 
     def authenticate_user(self, username, password):
         return self.provider.authenticate_user(username, password)
 
+    async def authenticate_user_async(self, username, password):
+        user = await self.provider.authenticate_user_async(username, password)
+        # O perfil recém-obtido no login já serve para os próximos refreshes
+        self.profile_cache.set(self._profile_key(username), user, PROFILE_CACHE_TTL)
+        return user
+
+    @staticmethod
+    def _profile_key(username: str):
+        # sAMAccountName não diferencia maiúsculas de minúsculas
+        return username.lower()
+
+    async def get_user_profile(self, username) -> dict:
+        """
+        Perfil do usuário para o refresh do token, servido do cache quando
+        possível. Contas inexistentes ou desativadas também ficam em cache
+        (por menos tempo) e resultam em 401.
+        """
+        profile = await self.profile_cache.get_or_load(
+            self._profile_key(username),
+            lambda value: PROFILE_CACHE_TTL if value is not None else PROFILE_CACHE_NEGATIVE_TTL,
+            lambda: self.provider.get_user_profile_async(username),
+        )
+        if profile is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found or disabled")
+        return profile
+
+    def invalidate_user_profile(self, username) -> bool:
+        return self.profile_cache.invalidate(self._profile_key(username))
+
+    def close(self):
+        self.provider.close()
+
     def create_access_token(self, data: dict, expires_delta: timedelta | None = None):
         to_encode = data.copy()
         if 'username' in to_encode:
@@ -155,32 +324,114 @@ class AuthHandler:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="JWT_SECRET not configured")
         return jwt.encode(to_encode, JWT_SECRET, algorithm="HS256")
 
-    async def create_refresh_token(self, user_id: str, groups: list, db: AsyncSession) -> str:
+    @staticmethod
+    def _hash_refresh_token(refresh_token: str) -> bytes:
+        # Tokens aleatórios de 64 bytes: um SHA-256 simples basta, sem salt
+        return hashlib.sha256(refresh_token.encode()).digest()
+
+    def _new_refresh_token(self, user_id: str, groups: list) -> tuple[str, RefreshToken]:
         refresh_token_string = secrets.token_urlsafe(64)
         expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXP_DAYS)
-        new_refresh_token = RefreshToken(user_id=user_id, token=refresh_token_string, groups=groups, expires_at=expires_at)
-        db.add(new_refresh_token)
-        await db.commit()
+        new_refresh_token = RefreshToken(
+            user_id=user_id,
+            token_hash=self._hash_refresh_token(refresh_token_string),
+            groups=groups,
+            expires_at=expires_at,
+        )
+        return refresh_token_string, new_refresh_token
+
+    async def create_refresh_token(self, user_id: str, groups: list, writer: WriteQueue) -> str:
+        refresh_token_string, new_refresh_token = self._new_refresh_token(user_id, groups)
+
+        async def insert(db: AsyncSession):
+            db.add(new_refresh_token)
+
+        await writer.run(insert)
         return refresh_token_string
 
     async def verify_refresh_token(self, refresh_token: str, db: AsyncSession):
-        stmt = select(RefreshToken).where(RefreshToken.token == refresh_token)
+        stmt = select(RefreshToken).where(RefreshToken.token_hash == self._hash_refresh_token(refresh_token))
         result = await db.execute(stmt)
         token_obj = result.scalar_one_or_none()
         if not token_obj or token_obj.expires_at < datetime.utcnow():
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
         return token_obj
 
-    async def invalidate_refresh_token(self, refresh_token: str, db: AsyncSession):
-        stmt = delete(RefreshToken).where(RefreshToken.token == refresh_token)
-        await db.execute(stmt)
-        await db.commit()
+    async def rotate_refresh_token(self, refresh_token: str, user_id: str, groups: list, writer: WriteQueue) -> str:
+        """
+        Troca o refresh token numa única transação: o antigo só é apagado se
+        ainda estiver válido, e o novo é gravado junto. Se outra requisição já
+        tiver usado o token antigo, nada é gravado e responde 401.
+        """
+        refresh_token_string, new_refresh_token = self._new_refresh_token(user_id, groups)
+
+        async def rotate(db: AsyncSession):
+            result = await db.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.token_hash == self._hash_refresh_token(refresh_token),
+                    RefreshToken.expires_at >= datetime.utcnow(),
+                )
+            )
+            if result.rowcount != 1:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
+            db.add(new_refresh_token)
+
+        await writer.run(rotate)
+        return refresh_token_string
+
+    async def invalidate_refresh_token(self, refresh_token: str, writer: WriteQueue):
+        stmt = delete(RefreshToken).where(RefreshToken.token_hash == self._hash_refresh_token(refresh_token))
+        await writer.run(lambda db: db.execute(stmt))
+
+    async def purge_expired_refresh_tokens(self, writer: WriteQueue, batch_size: int = 500) -> int:
+        """
+        Apaga os refresh tokens expirados em lotes de `batch_size`, um lote
+        por operação na fila de escrita, para não segurar o lock de escrita
+        do SQLite por muito tempo. Retorna quantos foram apagados.
+        """
+        async def purge_batch(db: AsyncSession) -> int:
+            expired = (
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at < datetime.utcnow())
+                .limit(batch_size)
+                .scalar_subquery()
+            )
+            result = await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(expired)))
+            return result.rowcount
+
+        total = 0
+        while True:
+            purged = await writer.run(purge_batch)
+            total += purged
+            if purged < batch_size:
+                return total
+
+    async def sweep_expired_refresh_tokens(self, writer: WriteQueue, interval: float, batch_size: int = 500) -> None:
+        """Laço de fundo que chama purge_expired_refresh_tokens a cada `interval` segundos."""
+        while True:
+            try:
+                purged = await self.purge_expired_refresh_tokens(writer, batch_size)
+                if purged:
+                    print(f"INFO: Purged {purged} expired refresh tokens.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ERROR: Failed to purge expired refresh tokens: {e}")
+            await asyncio.sleep(interval)
 
     def decode_token(self, token: str = Depends(oauth2_scheme)):
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self.token_cache.get(key)
+        # O exp é conferido a cada uso: um token em cache expira no mesmo instante em que o jwt.decode o recusaria
+        if payload is not MISSING and time.time() < payload["exp"]:
+            return dict(payload)
         try:
             if not JWT_SECRET:
                 raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="JWT_SECRET not configured")
             payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+            exp = payload.get("exp")
+            if isinstance(exp, (int, float)):
+                self.token_cache.set(key, dict(payload), exp - time.time())
             return payload
         except jwt.ExpiredSignatureError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
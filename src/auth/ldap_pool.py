@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from ldap3 import Connection, Server
+from ldap3.core.exceptions import LDAPCommunicationError, LDAPException
+
+class LdapPoolTimeout(LDAPException):
+    """Nenhuma conexão do pool ficou livre dentro do tempo de espera."""
+
+class LdapConnectionPool:
+    """
+    Pool limitado de conexões LDAP já autenticadas com a conta de serviço.
+
+    As conexões são reaproveitadas entre logins em vez de abrir socket e
+    fazer bind a cada requisição. Uma conexão ociosa há mais de
+    `verificar_apos` segundos é testada (Who Am I) antes de ser entregue, e
+    conexões que falham durante o uso são descartadas; a próxima retirada abre
+    uma nova. Thread-safe: os logins rodam no threadpool.
+    """
+    def __init__(
+        self,
+        server: Server,
+        user: str,
+        password: str,
+        tamanho: int = 4,
+        tempo_espera: float = 5,
+        verificar_apos: float = 60,
+        receive_timeout: int = 10,
+    ):
+        self.server = server
+        self.user = user
+        self.password = password
+        self.tempo_espera = tempo_espera
+        self.verificar_apos = verificar_apos
+        self.receive_timeout = receive_timeout
+        self.tamanho = tamanho
+        self._vagas = threading.BoundedSemaphore(tamanho)
+        # LIFO: a conexão usada mais recentemente é a que tem menos chance de ter caído
+        self._ociosas: "queue.LifoQueue[tuple[float, Connection]]" = queue.LifoQueue()
+        self._fechado = False
+        self._contadores = threading.Lock()
+        self.em_uso = 0
+        self.abertas = 0
+        self.retiradas = 0
+        self.descartadas = 0
+        self.esgotamentos = 0
+
+    def _abrir(self) -> Connection:
+        conexao = Connection(
+            self.server,
+            user=self.user,
+            password=self.password,
+            auto_bind=True,
+            receive_timeout=self.receive_timeout,
+        )
+        self.abertas += 1
+        return conexao
+
+    def _descartar(self, conexao: Connection) -> None:
+        self.descartadas += 1
+        try:
+            conexao.unbind()
+        except Exception:
+            pass
+
+    def _saudavel(self, conexao: Connection, ociosa_desde: float) -> bool:
+        if conexao.closed or not conexao.bound:
+            return False
+        if time.monotonic() - ociosa_desde < self.verificar_apos:
+            return True
+        try:
+            conexao.extend.standard.who_am_i()
+            return conexao.result.get("result") == 0
+        except LDAPException:
+            return False
+
+    def _retirar(self) -> Connection:
+        while True:
+            try:
+                ociosa_desde, conexao = self._ociosas.get_nowait()
+            except queue.Empty:
+                return self._abrir()
+            if self._saudavel(conexao, ociosa_desde):
+                return conexao
+            self._descartar(conexao)
+
+    @contextmanager
+    def conexao(self) -> Iterator[Connection]:
+        """
+        Empresta uma conexão do pool. Erros LDAP durante o uso descartam a
+        conexão em vez de devolvê-la.
+        """
+        if not self._vagas.acquire(timeout=self.tempo_espera):
+            self.esgotamentos += 1
+            raise LdapPoolTimeout("LDAP connection pool exhausted")
+        with self._contadores:
+            self.em_uso += 1
+        conexao: Optional[Connection] = None
+        try:
+            conexao = self._retirar()
+            self.retiradas += 1
+            yield conexao
+        except LDAPException:
+            if conexao is not None:
+                self._descartar(conexao)
+                conexao = None
+            raise
+        finally:
+            if conexao is not None:
+                if self._fechado:
+                    self._descartar(conexao)
+                else:
+                    self._ociosas.put((time.monotonic(), conexao))
+            with self._contadores:
+                self.em_uso -= 1
+            self._vagas.release()
+
+    def executar(self, operacao):
+        """
+        Executa `operacao(conexao)` com uma conexão do pool. Se a conexão
+        tiver sido derrubada pelo servidor, tenta mais uma vez com outra.
+        """
+        try:
+            with self.conexao() as conexao:
+                return operacao(conexao)
+        except LDAPCommunicationError:
+            with self.conexao() as conexao:
+                return operacao(conexao)
+
+    def fechar(self) -> None:
+        self._fechado = True
+        while True:
+            try:
+                _, conexao = self._ociosas.get_nowait()
+            except queue.Empty:
+                return
+            self._descartar(conexao)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "tamanho": self.tamanho,
+            "ociosas": self._ociosas.qsize(),
+            "em_uso": self.em_uso,
+            "abertas": self.abertas,
+            "retiradas": self.retiradas,
+            "descartadas": self.descartadas,
+            "esgotamentos": self.esgotamentos,
+        }
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.alerta import AlertaLido
+from ..resources.alertas import MotorAlertas
+from ..resources.write_queue import WriteQueue
+
+async def listar_alertas(
+    motor: MotorAlertas,
+    db: AsyncSession,
+    usuario: str,
+    tipo: Optional[str] = None,
+    nao_lidos: bool = False,
+) -> Dict[str, Any]:
+    """
+    Alertas abertos com o estado de leitura do usuário. Os alertas vêm do
+    motor, já avaliados e ordenados; do banco só se leem as marcações do
+    próprio usuário.
+    """
+    alertas = motor.listar(tipo)
+    lidos = set((await db.execute(
+        select(AlertaLido.alerta_id).where(AlertaLido.usuario == usuario)
+    )).scalars())
+    itens: List[Dict[str, Any]] = []
+    for alerta in alertas:
+        lido = alerta.id in lidos
+        if nao_lidos and lido:
+            continue
+        itens.append({
+            "id": alerta.id,
+            "regra": alerta.regra,
+            "tipo": alerta.tipo,
+            "titulo": alerta.titulo,
+            "mensagem": alerta.mensagem,
+            "leito_numero": alerta.leito_numero,
+            "data_hora": datetime.fromtimestamp(alerta.aberto_em).astimezone(),
+            "lido": lido,
+        })
+    return {
+        "versao": motor.versao,
+        "nao_lidos": sum(1 for alerta in alertas if alerta.id not in lidos),
+        "alertas": itens,
+    }
+
+async def marcar_lido(
+    motor: MotorAlertas,
+    writer: WriteQueue,
+    usuario: str,
+    alerta_id: str,
+    lido: bool,
+    retencao_dias: float,
+) -> bool:
+    """
+    Marca (ou desmarca) um alerta aberto como lido pelo usuário. Retorna
+    False se o alerta não está aberto. Na mesma escrita são apagadas as
+    marcações do usuário com mais de `retencao_dias` cujos alertas já não
+    estão abertos, para que a tabela não cresça com alertas encerrados.
+    """
+    if motor.obter(alerta_id) is None:
+        return False
+    abertos = [alerta.id for alerta in motor.listar()]
+
+    async def gravar(session: AsyncSession) -> None:
+        # A coluna guarda UTC sem fuso
+        agora = datetime.now(timezone.utc).replace(tzinfo=None)
+        if lido:
+            await session.execute(
+                insert(AlertaLido)
+                .values(usuario=usuario, alerta_id=alerta_id, lido_em=agora)
+                .on_conflict_do_nothing(index_elements=["usuario", "alerta_id"])
+            )
+            await session.execute(delete(AlertaLido).where(
+                AlertaLido.usuario == usuario,
+                AlertaLido.lido_em < agora - timedelta(days=retencao_dias),
+                AlertaLido.alerta_id.not_in(abertos),
+            ))
+        else:
+            await session.execute(delete(AlertaLido).where(
+                AlertaLido.usuario == usuario,
+                AlertaLido.alerta_id == alerta_id,
+            ))
+
+    await writer.run(gravar)
+    return True
@@ -0,0 +1,75 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, List
+
+from ..resources.broadcaster import Broadcaster
+from ..resources.quadro_leitos import AlteracaoLeito
+
+def publicador_de_leitos(broadcaster: Broadcaster) -> Callable[[List[AlteracaoLeito]], None]:
+    """
+    Cria o ouvinte do QuadroLeitos que transforma cada lote de alterações em
+    eventos: "leitos" com os leitos alterados e, quando a ocupação muda,
+    "pacientes" com os prontuários que entraram ou saíram de um leito.
+    """
+    def publicar(alteracoes: List[AlteracaoLeito]) -> None:
+        broadcaster.publicar("leitos", {
+            "versao": alteracoes[-1].versao,
+            "leitos": [a.atual for a in alteracoes if a.atual is not None],
+            "removidos": [a.leito_numero for a in alteracoes if a.atual is None],
+        })
+
+        prontuarios = set()
+        for alteracao in alteracoes:
+            antes = (alteracao.anterior or {}).get("paciente_prontuario")
+            depois = (alteracao.atual or {}).get("paciente_prontuario")
+            if antes != depois:
+                prontuarios.update(p for p in (antes, depois) if p is not None)
+        if prontuarios:
+            broadcaster.publicar("pacientes", {"prontuarios": sorted(prontuarios)})
+    return publicar
+
+async def vigiar_leitos(sincronizar: Callable[[], Awaitable[None]], intervalo: float) -> None:
+    """
+    Laço de fundo que ressincroniza o quadro de leitos a cada `intervalo`
+    segundos. É a única consulta à fonte: as alterações encontradas chegam a
+    todos os clientes conectados pelo broadcaster.
+    """
+    while True:
+        try:
+            await sincronizar()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"ERROR: Falha ao sincronizar o quadro de leitos: {e}")
+        await asyncio.sleep(intervalo)
+
+async def transmitir_eventos(
+    broadcaster: Broadcaster,
+    heartbeat: float,
+) -> AsyncIterator[str]:
+    """
+    Gera o fluxo SSE de uma conexão. Envia um comentário de heartbeat quando
+    não há eventos por `heartbeat` segundos, para manter proxies e o
+    navegador cientes de que a conexão está viva.
+
+    A assinatura é feita aqui dentro, e não no endpoint: se o cliente cair
+    antes da primeira iteração, o gerador nunca começa e não sobra
+    assinatura sem o `finally` que a cancela.
+    """
+    assinatura = broadcaster.assinar()
+    try:
+        # Orienta o EventSource a reconectar após 3s se a conexão cair
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(assinatura.fila.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if frame is None:
+                # Consumidor lento descartado: o cliente reconecta e deve
+                # ressincronizar via /api/leitos/changes
+                yield "event: descartado\ndata: {}\n\n"
+                return
+            yield frame
+    finally:
+        broadcaster.cancelar(assinatura)
@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Integer, column, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.historico import RegistroHistorico
+from ..resources.auditoria import normalizar_busca
+
+# Buscas com menos caracteres que isso não formam um trigrama do índice FTS5
+MIN_TRIGRAMA = 3
+# Acima desse número de registros encontrados, varrer o histórico em ordem
+# (LIKE) acha uma página mais rápido que ordenar todos os encontrados pelo FTS5
+MAX_ENCONTRADOS_FTS = 2000
+
+_BUSCA_FTS = text(
+    "SELECT rowid FROM historico_busca WHERE historico_busca MATCH :termo LIMIT :limite"
+).columns(column("rowid", Integer))
+_CONTAGEM_FTS = text(
+    "SELECT count(*) FROM (SELECT rowid FROM historico_busca WHERE historico_busca MATCH :termo LIMIT :limite)"
+)
+
+def codificar_cursor(criado_em: datetime, id: int) -> str:
+    return f"{criado_em.isoformat()},{id}"
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Lança ValueError se o cursor não veio de `codificar_cursor`."""
+    criado_em, id = cursor.rsplit(",", 1)
+    return datetime.fromisoformat(criado_em), int(id)
+
+async def listar_historico(
+    db: AsyncSession,
+    usuario: Optional[str] = None,
+    entidade: Optional[str] = None,
+    tipo: Optional[str] = None,
+    q: Optional[str] = None,
+    cursor: Optional[Tuple[datetime, int]] = None,
+    limit: int = 50,
+) -> Dict[str, Any]:
+    """
+    Uma página do histórico, do registro mais recente para o mais antigo.
+
+    A paginação é por chave (keyset) em (criado_em, id): a próxima página
+    começa logo após o último registro recebido, lendo direto do índice em
+    vez de pular linhas com OFFSET, então a página 1000 custa o mesmo que a
+    primeira. Filtros por usuário ou entidade usam os índices compostos
+    (usuario, criado_em) e (entidade, criado_em).
+
+    A busca textual (sem acentos, por trecho) vai ao índice FTS5 de
+    trigramas quando o termo é seletivo: os poucos registros encontrados
+    são ordenados e paginados. Termos frequentes ("leito") ou com menos de
+    três caracteres usam LIKE, percorrendo o histórico já na ordem do índice
+    até completar a página, o que para termos frequentes acontece cedo.
+
+    `cursor` é o `proximo` da página anterior já decodificado por
+    `decodificar_cursor`.
+    """
+    consulta = select(
+        RegistroHistorico.id,
+        RegistroHistorico.criado_em,
+        RegistroHistorico.usuario,
+        RegistroHistorico.tipo,
+        RegistroHistorico.acao,
+        RegistroHistorico.entidade,
+        RegistroHistorico.detalhes,
+    )
+    if usuario:
+        consulta = consulta.where(RegistroHistorico.usuario == usuario)
+    if entidade:
+        consulta = consulta.where(RegistroHistorico.entidade == entidade)
+    if tipo:
+        consulta = consulta.where(RegistroHistorico.tipo == tipo)
+    termo = normalizar_busca(q) if q else ""
+    seletivo = False
+    if len(termo) >= MIN_TRIGRAMA:
+        # Frase FTS5: o termo inteiro como trecho contíguo, aspas escapadas
+        frase = '"' + termo.replace('"', '""') + '"'
+        # Contagem limitada: para de ler o índice ao passar do máximo
+        encontrados = (await db.execute(_CONTAGEM_FTS, {"termo": frase, "limite": MAX_ENCONTRADOS_FTS + 1})).scalar_one()
+        seletivo = encontrados <= MAX_ENCONTRADOS_FTS
+    if seletivo:
+        busca = _BUSCA_FTS.bindparams(termo=frase, limite=MAX_ENCONTRADOS_FTS + 1)
+        consulta = consulta.where(RegistroHistorico.id.in_(busca))
+    elif termo:
+        trecho = termo.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        consulta = consulta.where(RegistroHistorico.busca.like(f"%{trecho}%", escape="\\"))
+    if cursor is not None:
+        consulta = consulta.where(tuple_(RegistroHistorico.criado_em, RegistroHistorico.id) < cursor)
+
+    consulta = consulta.order_by(RegistroHistorico.criado_em.desc(), RegistroHistorico.id.desc()).limit(limit + 1)
+    linhas = (await db.execute(consulta)).mappings().all()
+    itens = [
+        {**linha, "criado_em": linha["criado_em"].replace(tzinfo=timezone.utc)}
+        for linha in linhas[:limit]
+    ]
+    proximo = None
+    if len(linhas) > limit:
+        ultima = linhas[limit - 1]
+        proximo = codificar_cursor(ultima["criado_em"], ultima["id"])
+    return {"itens": itens, "proximo": proximo}
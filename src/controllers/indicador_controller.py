@@ -0,0 +1,12 @@
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..resources.indicadores import IndicadoresOcupacao
+from ..resources.serie_ocupacao import SerieOcupacao
+
+async def obter_indicadores(motor: IndicadoresOcupacao) -> Dict[str, Any]:
+    return motor.resumo()
+
+async def consultar_ocupacao(serie: SerieOcupacao, db: AsyncSession, inicio: int, fim: int, passo: int) -> List[Dict[str, Any]]:
+    return await serie.consultar(db, inicio, fim, passo)
@@ -0,0 +1,22 @@
+from typing import List, Dict, Any, Optional
+
+from ..providers.interfaces.leito_provider_interface import LeitoProviderInterface
+
+async def listar_leitos(
+    provider: LeitoProviderInterface,
+    status: Optional[str] = None,
+    tipo: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    return await provider.listar_leitos(status=status, tipo=tipo)
+
+async def obter_leito(
+    leito_numero: str,
+    provider: LeitoProviderInterface
+) -> Dict[str, Any]:
+    return await provider.obter_leito(leito_numero)
+
+async def listar_alteracoes(
+    desde: int,
+    provider: LeitoProviderInterface
+) -> Dict[str, Any]:
+    return await provider.listar_alteracoes(desde)
\ No newline at end of file
@@ -1,14 +1,74 @@
-from typing import List, Dict, Any
+import csv
+import io
+from typing import List, Dict, Any, AsyncIterator, Optional, Sequence
 
-from ..providers.interfaces.paciente_provider_interface import PacienteProviderInterface
+import pandas as pd
+
+from ..helpers.json_helper import dumps
+from ..providers.interfaces.paciente_provider_interface import FiltroPacientes, PacienteProviderInterface
 
 async def listar_pacientes(
+    provider: PacienteProviderInterface,
+    filtro: Optional[FiltroPacientes] = None,
+    after_codigo: Optional[int] = None,
+    limit: int = 100,
+    campos: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    return await provider.listar_pacientes(
+        filtro=filtro,
+        after_codigo=after_codigo,
+        limit=limit,
+        campos=campos,
+    )
+
+async def exportar_pacientes(
+    provider: PacienteProviderInterface,
+    formato: str,
+    filtro: Optional[FiltroPacientes] = None,
+    campos: Optional[Sequence[str]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Serializa os pacientes lote a lote (NDJSON ou CSV), para envio via
+    StreamingResponse. Só um lote fica em memória por vez. Células vazias (NaN,
+    pd.NA, NaT) saem como null no NDJSON, como nas respostas JSON da API, e
+    como campo vazio no CSV.
+    """
+    cabecalho_escrito = False
+    async for lote in provider.iterar_pacientes(filtro=filtro, campos=campos):
+        if formato == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=list(lote[0].keys()))
+            if not cabecalho_escrito:
+                writer.writeheader()
+                cabecalho_escrito = True
+            # Células vazias saem vazias, e não como "nan"
+            writer.writerows({campo: None if pd.isna(valor) else valor for campo, valor in paciente.items()}
+                             for paciente in lote)
+            yield buffer.getvalue().encode("utf-8")
+        else:
+            yield b"".join(dumps(paciente) + b"\n" for paciente in lote)
+
+async def buscar_pacientes(
+    termo: str,
+    limit: int,
     provider: PacienteProviderInterface
 ) -> List[Dict[str, Any]]:
-    return await provider.listar_pacientes()
+    return await provider.buscar_pacientes(termo, limit=limit)
 
 async def obter_paciente_por_codigo(
     codigo: int,
     provider: PacienteProviderInterface
 ) -> Dict[str, Any]:
-    return await provider.obter_paciente_por_codigo(codigo)
\ No newline at end of file
+    return await provider.obter_paciente_por_codigo(codigo)
+
+async def obter_pacientes_por_codigos(
+    codigos: Sequence[int],
+    provider: PacienteProviderInterface
+) -> Dict[str, Any]:
+    # Códigos repetidos são consultados uma vez, mantendo a ordem do pedido
+    codigos = list(dict.fromkeys(codigos))
+    pacientes = await provider.obter_pacientes_por_codigos(codigos)
+    return {
+        "pacientes": pacientes,
+        "nao_encontrados": [codigo for codigo in codigos if codigo not in pacientes],
+    }
@@ -0,0 +1,155 @@
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.solicitacao import Solicitacao
+from ..resources.alocacao import AlocadorLeitos, SolicitacaoLeito
+from ..resources.auditoria import auditoria
+from ..resources.write_queue import WriteQueue
+
+def _para_alocador(linha: Solicitacao) -> SolicitacaoLeito:
+    return SolicitacaoLeito(
+        id=linha.id,
+        prontuario=linha.prontuario,
+        especialidade=linha.especialidade,
+        tipo=linha.tipo,
+        urgencia=linha.urgencia,
+        criada_em=linha.criada_em.replace(tzinfo=timezone.utc).timestamp(),
+        idade=linha.idade,
+        solicitante=linha.solicitante,
+    )
+
+async def carregar_pendentes(alocador: AlocadorLeitos, db: AsyncSession) -> int:
+    """Carrega no alocador as solicitações pendentes gravadas no banco (na subida da aplicação)."""
+    linhas = (await db.execute(select(Solicitacao).where(Solicitacao.status == "pendente"))).scalars().all()
+    for linha in linhas:
+        alocador.adicionar(_para_alocador(linha))
+    return len(linhas)
+
+async def listar_solicitacoes(alocador: AlocadorLeitos) -> Dict[str, Any]:
+    """
+    Solicitações pendentes em ordem de prioridade, cada uma com o leito
+    sugerido: livre agora ou, na falta, o próximo com previsão de liberação.
+    A listagem vem pronta do alocador; aqui só se calcula o tempo de espera.
+    """
+    agora = time.time()
+    return {
+        "versao": alocador.versao,
+        "solicitacoes": [
+            {
+                "id": item["solicitacao"].id,
+                "prontuario": item["solicitacao"].prontuario,
+                "idade": item["solicitacao"].idade,
+                "especialidade": item["solicitacao"].especialidade,
+                "tipo": item["solicitacao"].tipo,
+                "urgencia": item["solicitacao"].urgencia,
+                "solicitante": item["solicitacao"].solicitante,
+                "criada_em": datetime.fromtimestamp(item["solicitacao"].criada_em).astimezone(),
+                "espera_minutos": round((agora - item["solicitacao"].criada_em) / 60, 1),
+                "posicao": item["posicao"],
+                "leito_numero": item["leito_numero"],
+                "leito_disponivel": item["leito_disponivel"],
+                "previsao_liberacao": item["previsao_liberacao"],
+            }
+            for item in alocador.listar()
+        ],
+        "leitos_livres": alocador.leitos_livres(),
+    }
+
+async def criar_solicitacao(
+    alocador: AlocadorLeitos,
+    writer: WriteQueue,
+    dados: Dict[str, Any],
+    solicitante: str,
+) -> Dict[str, Any]:
+    """
+    Grava a solicitação e a insere no alocador, que já calcula a sugestão de
+    leito. A ação vai para o histórico sem esperar outra escrita no banco.
+    """
+    # As colunas DateTime guardam UTC sem fuso
+    criada_em = datetime.now(timezone.utc)
+
+    async def gravar(session: AsyncSession) -> int:
+        resultado = await session.execute(
+            insert(Solicitacao)
+            .values(**dados, solicitante=solicitante, status="pendente", criada_em=criada_em.replace(tzinfo=None))
+            .returning(Solicitacao.id)
+        )
+        return resultado.scalar_one()
+
+    id = await writer.run(gravar)
+    alocador.adicionar(SolicitacaoLeito(
+        id=id,
+        criada_em=criada_em.timestamp(),
+        solicitante=solicitante,
+        **dados,
+    ))
+    auditoria.registrar(
+        solicitante, "solicitacao", "Nova solicitação", f"solicitacao:{id}",
+        f"Vaga {dados['tipo']} ({dados['urgencia']}) - {dados['especialidade']} - Prontuário {dados['prontuario']}",
+    )
+    return {"id": id, "leito_numero": alocador.leito_sugerido(id)}
+
+async def encerrar_solicitacao(
+    alocador: AlocadorLeitos,
+    writer: WriteQueue,
+    id: int,
+    status: str,
+    usuario: str,
+    leito_numero: Optional[str] = None,
+) -> bool:
+    """
+    Encerra uma solicitação pendente como "atendida" (no leito `leito_numero`)
+    ou "cancelada". O leito dela, se havia, passa ao próximo da fila.
+
+    A solicitação (e o leito, no atendimento) é retirada do alocador antes
+    de esperar a gravação: uma requisição concorrente já não a encontra
+    pendente nem vê o leito livre. Retorna False se ela não estava mais
+    pendente, no alocador ou no banco (encerrada por outro worker). Se a
+    gravação falhar, o alocador volta ao estado anterior.
+    """
+    pendente = alocador.pendente(id)
+    if pendente is None:
+        return False
+    if status == "atendida":
+        if not alocador.leito_livre(leito_numero, pendente.tipo):
+            return False
+        alocador.atender(id, leito_numero)
+    else:
+        alocador.remover(id)
+
+    async def gravar(session: AsyncSession) -> int:
+        resultado = await session.execute(
+            update(Solicitacao)
+            .where(Solicitacao.id == id, Solicitacao.status == "pendente")
+            .values(status=status, leito_numero=leito_numero, encerrada_em=datetime.now(timezone.utc).replace(tzinfo=None))
+        )
+        return resultado.rowcount
+
+    try:
+        alteradas = await writer.run(gravar)
+    except BaseException:
+        alocador.adicionar(pendente)
+        if status == "atendida":
+            alocador.liberar(leito_numero)
+        raise
+    if not alteradas:
+        # Já encerrada no banco: fica fora da fila, mas o leito não foi reservado
+        if status == "atendida":
+            alocador.liberar(leito_numero)
+        return False
+
+    if status == "atendida":
+        auditoria.registrar(
+            usuario, "reserva", "Reservou leito", f"leito:{leito_numero}",
+            f"Leito {leito_numero} para Prontuário {pendente.prontuario} (solicitação {id})",
+        )
+    else:
+        auditoria.registrar(
+            usuario, "cancelamento", "Cancelou solicitação", f"solicitacao:{id}",
+            f"Prontuário {pendente.prontuario}",
+        )
+    return True
@@ -1,12 +1,22 @@
 import os
+from functools import lru_cache
 from typing import Callable
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .providers.interfaces.paciente_provider_interface import PacienteProviderInterface
+from .providers.interfaces.leito_provider_interface import LeitoProviderInterface
 from .providers.implementations.paciente_postgres_provider import PacientePostgresProvider
 from .providers.implementations.paciente_csv_provider import PacienteCsvProvider
+from .providers.implementations.paciente_cached_provider import PacienteCachedProvider
+from .providers.implementations.leito_postgres_provider import LeitoPostgresProvider
+from .providers.implementations.leito_csv_provider import LeitoCsvProvider
+from .helpers.cache_helper import TTLCache
 from .resources.database import get_aghu_db_session
+from .resources.quadro_leitos import QuadroLeitos
+from .resources.indicadores import IndicadoresOcupacao
+from .resources.alertas import REGRAS_PADRAO, MotorAlertas, carregar_regras
+from .resources.alocacao import AlocadorLeitos
 
 # 1. Funções "getter" simples e independentes (privadas por convenção)
 def _get_paciente_postgres_provider(
@@ -14,19 +24,134 @@ def _get_paciente_postgres_provider(
 ) -> PacienteProviderInterface:
     return PacientePostgresProvider(session=session)
 
+@lru_cache(maxsize=None)
+def _get_shared_paciente_csv_provider(csv_path: str) -> PacienteCsvProvider:
+    # Uma única instância por arquivo e por processo: o CSV é lido uma vez e
+    # o próprio provedor se recarrega quando o arquivo muda em disco.
+    return PacienteCsvProvider(csv_path=csv_path)
+
 def _get_paciente_csv_provider() -> PacienteProviderInterface:
     csv_path = os.getenv("PACIENTE_CSV_PATH", "data/pacientes.csv")
-    return PacienteCsvProvider(csv_path=csv_path)
+    return _get_shared_paciente_csv_provider(csv_path)
+
+@lru_cache(maxsize=None)
+def get_paciente_cache() -> TTLCache:
+    # Cache compartilhado pelo processo, usado pelas estratégias "<fonte>+cache"
+    max_mb = float(os.getenv("PACIENTE_CACHE_MAX_MB", 64))
+    return TTLCache(max_bytes=int(max_mb * 1024 * 1024))
+
+@lru_cache(maxsize=None)
+def _com_cache(
+    get_provider: Callable[..., PacienteProviderInterface]
+) -> Callable[..., PacienteProviderInterface]:
+    def _get_paciente_cached_provider(
+        provider: PacienteProviderInterface = Depends(get_provider)
+    ) -> PacienteProviderInterface:
+        return PacienteCachedProvider(
+            provider,
+            get_paciente_cache(),
+            ttl_listar=float(os.getenv("PACIENTE_CACHE_TTL_LISTAR", 30)),
+            ttl_obter=float(os.getenv("PACIENTE_CACHE_TTL_OBTER", 60)),
+        )
+    return _get_paciente_cached_provider
 
 # 2. A FÁBRICA: A única função que o roteador vai conhecer.
 def get_paciente_provider(strategy: str) -> Callable[..., PacienteProviderInterface]:
     """
     Esta é uma fábrica. Baseado na string 'strategy', ela não retorna o provedor,
     mas sim a FUNÇÃO DE DEPENDÊNCIA correta que o FastAPI deve usar.
+
+    O sufixo "+cache" (ex.: "postgres+cache") envolve o provedor escolhido
+    no cache de leitura compartilhado do processo.
     """
-    if strategy.upper() == "POSTGRES":
+    fonte, _, sufixo = strategy.upper().partition("+")
+    if sufixo == "CACHE":
+        return _com_cache(get_paciente_provider(fonte))
+    elif sufixo:
+        raise ValueError(f"Estratégia de provedor desconhecida: {strategy}")
+
+    if fonte == "POSTGRES":
         return _get_paciente_postgres_provider
-    elif strategy.upper() == "CSV":
+    elif fonte == "CSV":
         return _get_paciente_csv_provider
     else:
         raise ValueError(f"Estratégia de provedor desconhecida: {strategy}")
+
+# --- Leitos ---
+
+def _get_leito_postgres_provider(
+    session: AsyncSession = Depends(get_aghu_db_session)
+) -> LeitoProviderInterface:
+    return LeitoPostgresProvider(session=session)
+
+@lru_cache(maxsize=None)
+def _get_shared_leito_csv_provider(csv_path: str) -> LeitoCsvProvider:
+    return LeitoCsvProvider(csv_path=csv_path)
+
+def _get_leito_csv_provider() -> LeitoProviderInterface:
+    csv_path = os.getenv("LEITO_CSV_PATH", "data/leitos.csv")
+    return _get_shared_leito_csv_provider(csv_path)
+
+def get_leito_provider(strategy: str) -> Callable[..., LeitoProviderInterface]:
+    """
+    Fábrica de dependências do domínio de leitos (mesmo padrão de get_paciente_provider).
+    """
+    if strategy.upper() == "POSTGRES":
+        return _get_leito_postgres_provider
+    elif strategy.upper() == "CSV":
+        return _get_leito_csv_provider
+    else:
+        raise ValueError(f"Estratégia de provedor desconhecida: {strategy}")
+
+def obter_quadro_leitos(strategy: str) -> QuadroLeitos:
+    """
+    Quadro de leitos compartilhado usado pela estratégia, para quem precisa
+    observar as alterações fora de uma requisição (eventos, indicadores etc.).
+    """
+    if strategy.upper() == "POSTGRES":
+        return LeitoPostgresProvider.quadro
+    elif strategy.upper() == "CSV":
+        return _get_leito_csv_provider().quadro
+    else:
+        raise ValueError(f"Estratégia de provedor desconhecida: {strategy}")
+
+@lru_cache(maxsize=None)
+def obter_indicadores(strategy: str) -> IndicadoresOcupacao:
+    """
+    Motor de indicadores do processo, assinado ao quadro de leitos da
+    estratégia: é atualizado a cada lote de alterações, não por requisição.
+    """
+    return IndicadoresOcupacao(obter_quadro_leitos(strategy))
+
+@lru_cache(maxsize=None)
+def obter_motor_alertas(strategy: str) -> MotorAlertas:
+    """
+    Motor de alertas do processo, assinado ao quadro de leitos da estratégia.
+    As regras vêm de ALERTAS_REGRAS_PATH (JSON) ou, sem ele, de REGRAS_PADRAO.
+    """
+    caminho = os.getenv("ALERTAS_REGRAS_PATH")
+    regras = carregar_regras(caminho) if caminho else REGRAS_PADRAO
+    return MotorAlertas(obter_quadro_leitos(strategy), regras)
+
+@lru_cache(maxsize=None)
+def obter_alocador(strategy: str) -> AlocadorLeitos:
+    """
+    Alocador de leitos do processo, assinado ao quadro de leitos da
+    estratégia. SOLICITACOES_ANTECEDENCIA_ESPECIALIDADES dá horas de
+    prioridade extra por especialidade, no formato "Trauma:2,Cardiologia:1".
+    """
+    antecedencias = {}
+    for item in filter(None, os.getenv("SOLICITACOES_ANTECEDENCIA_ESPECIALIDADES", "").split(",")):
+        especialidade, horas = item.rsplit(":", 1)
+        antecedencias[especialidade.strip()] = float(horas)
+    return AlocadorLeitos(obter_quadro_leitos(strategy), antecedencia_especialidade=antecedencias)
+
+async def sincronizar_leitos(strategy: str, app) -> None:
+    """Ressincroniza o quadro de leitos com a fonte, sem depender de uma requisição."""
+    if strategy.upper() == "POSTGRES":
+        async for session in app.state.aghu_db.get_session():
+            await LeitoPostgresProvider(session=session).sincronizar()
+    elif strategy.upper() == "CSV":
+        await _get_leito_csv_provider().sincronizar()
+    else:
+        raise ValueError(f"Estratégia de provedor desconhecida: {strategy}")
@@ -0,0 +1,36 @@
+"""
+Etapa de build dos snapshots Arrow usados pelos provedores CSV.
+
+Converte os CSVs de pacientes e de leitos (PACIENTE_CSV_PATH e LEITO_CSV_PATH)
+em arquivos `.arrow` ao lado deles. Os provedores passam a ler o snapshot
+sempre que ele for tão novo quanto o CSV; depois de editar um CSV, rode de
+novo para voltar ao caminho rápido.
+
+Uso (a partir da raiz do projeto):
+    python -m src.gerar_snapshots
+"""
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+
+from .providers.implementations import leito_csv_provider, paciente_csv_provider
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pacientes", default=os.getenv("PACIENTE_CSV_PATH", "data/pacientes.csv"))
+    parser.add_argument("--leitos", default=os.getenv("LEITO_CSV_PATH", "data/leitos.csv"))
+    args = parser.parse_args()
+
+    for csv_path, gerar in ((args.pacientes, paciente_csv_provider.gerar_snapshot), (args.leitos, leito_csv_provider.gerar_snapshot)):
+        inicio = time.perf_counter()
+        destino = gerar(csv_path)
+        duracao = (time.perf_counter() - inicio) * 1000
+        print(f"{csv_path} -> {destino} ({os.path.getsize(destino) / 1024:,.0f} KiB, {duracao:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
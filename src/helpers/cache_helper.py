@@ -0,0 +1,157 @@
+# src/helpers/cache_helper.py
+
+import asyncio
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, Union
+
+MISSING = object()
+
+def estimate_size(value: Any) -> int:
+    """
+    Roughly estimates the memory footprint of a value, in bytes.
+    Walks dicts, lists, tuples and sets; everything else is sys.getsizeof.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+class TTLCache:
+    """
+    In-memory cache with a per-entry TTL and LRU eviction bounded by an
+    approximate memory budget.
+
+    `get_or_load` coalesces concurrent misses for the same key ("single-flight"):
+    only the first caller runs the loader, the others await its result.
+    Cached values are shared between callers and must not be mutated.
+    """
+    def __init__(self, max_bytes: int, max_entries: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, int]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Returns the cached value, or MISSING if absent or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return MISSING
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Stores a value for `ttl` seconds, evicting least recently used entries
+        while the cache is over its budget. Values larger than the whole
+        budget are not stored.
+        """
+        if ttl <= 0:
+            return
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes or (self.max_entries and len(self._entries) > self.max_entries):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drops a single entry. Returns whether it was present.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                return True
+            return False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        ttl: Union[float, Callable[[Any], float]],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Returns the cached value or runs `loader` to produce it. Exceptions
+        raised by the loader are propagated to every waiter and never cached.
+        `ttl` may be a callable that picks the TTL from the loaded value
+        (e.g. a shorter one for negative results).
+        """
+        while True:
+            value = self.get(key)
+            if value is not MISSING:
+                return value
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The caller that was loading got cancelled: try again ourselves
+                if pending.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # Marks the exception as retrieved when nobody is waiting
+            raise
+        else:
+            self.set(key, value, ttl(value) if callable(ttl) else ttl)
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,70 @@
+# src/helpers/json_helper.py
+
+import datetime
+import json
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """
+    Converts the types found in provider rows that the JSON backends do not
+    handle natively: NumPy scalars (from pandas), pandas Timestamps (a
+    datetime subclass), pd.NA from Arrow-backed columns, Decimals from
+    asyncpg and tuples/sets.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA:
+        # Missing values in Arrow-backed (snapshot) columns
+        return None
+    if isinstance(value, (datetime.date, datetime.time)):
+        # pd.NaT is a datetime subclass that is not equal to itself
+        return None if value != value else value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(content: Any) -> bytes:
+        """
+        Serializes content to compact UTF-8 JSON. NaN becomes null.
+        """
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(content: Any) -> bytes:
+        """
+        Serializes content to compact UTF-8 JSON (stdlib fallback, used when
+        orjson is not installed).
+        """
+        return json.dumps(
+            content,
+            default=_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when available.
+
+    Used as the application's default response class. Endpoints that return
+    large lists of plain rows can return it directly
+    (`return FastJSONResponse(rows)`), which skips FastAPI's response
+    validation and jsonable_encoder pass over every row.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,118 @@
+# src/helpers/snapshot_helper.py
+
+import os
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401 - registers pa.ipc
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+SNAPSHOT_SUFFIX = ".arrow"
+
+def snapshot_path_for(csv_path: str) -> str:
+    """Default snapshot location: next to the CSV, same name, `.arrow` suffix."""
+    return os.path.splitext(csv_path)[0] + SNAPSHOT_SUFFIX
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def use_snapshot(csv_path: str, snapshot_path: str) -> bool:
+    """
+    True when the snapshot can replace the CSV: pyarrow is installed, the
+    snapshot exists and it is not older than the CSV (a CSV edited after the
+    last build wins until the snapshot is rebuilt).
+    """
+    if pa is None:
+        return False
+    snapshot_mtime = _mtime_ns(snapshot_path)
+    if snapshot_mtime is None:
+        return False
+    csv_mtime = _mtime_ns(csv_path)
+    return csv_mtime is None or snapshot_mtime >= csv_mtime
+
+def source_signature(csv_path: str, snapshot_path: str) -> Optional[Tuple[str, int, int]]:
+    """(path, mtime, size) of the file a provider should read, or None if neither exists."""
+    path = snapshot_path if use_snapshot(csv_path, snapshot_path) else csv_path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return path, stat.st_mtime_ns, stat.st_size
+
+def build_snapshot(
+    csv_path: str,
+    snapshot_path: Optional[str] = None,
+    categorical: Sequence[str] = (),
+    prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    **read_csv_kwargs: Any,
+) -> str:
+    """
+    Converts a CSV into an uncompressed Arrow IPC file that can be memory-mapped.
+
+    The CSV is parsed by pandas with `read_csv_kwargs`, so column types match
+    what the CSV loader would infer. `categorical` columns are stored
+    dictionary-encoded and `prepare` may reorder or fix up the frame before it
+    is written. The file is written to a temporary path and renamed, so
+    readers never see a partial snapshot. Returns the snapshot path.
+    """
+    if pa is None:
+        raise RuntimeError("pyarrow is required to build snapshots")
+    snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+    df = pd.read_csv(csv_path, **read_csv_kwargs)
+    for column in categorical:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    if prepare is not None:
+        df = prepare(df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    temporary = f"{snapshot_path}.tmp"
+    # No compression: compressed buffers would have to be decoded into private memory
+    with pa.OSFile(temporary, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temporary, snapshot_path)
+    return snapshot_path
+
+def read_snapshot(snapshot_path: str) -> "pa.Table":
+    """
+    Opens a snapshot as a memory-mapped Arrow table. Column buffers point into
+    the page cache, so processes reading the same file share its pages and
+    nothing is parsed at load time.
+    """
+    with pa.memory_map(snapshot_path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+def iso_dates_to_numpy(series: pd.Series) -> "Optional[np.ndarray]":
+    """
+    Parses an Arrow-backed text column of ISO dates (YYYY-MM-DD) into
+    datetime64[D] with a vectorised Arrow cast, much faster than
+    `pd.to_datetime`. Returns None when the column is not Arrow-backed or
+    holds anything else, so callers can fall back to pandas.
+    """
+    if pa is None or not isinstance(series.dtype, pd.StringDtype) or series.dtype.storage != "pyarrow":
+        return None
+    try:
+        dates = pa.array(series.array).cast(pa.date32())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return None
+    return dates.to_numpy(zero_copy_only=False).astype("datetime64[D]")
+
+def snapshot_to_pandas(table: "pa.Table") -> pd.DataFrame:
+    """
+    Converts a snapshot table to pandas without copying string data: text
+    columns become Arrow-backed `string[pyarrow]` columns (nulls are `pd.NA`),
+    dictionary columns become categoricals and null-free numeric columns are
+    zero-copy views where possible.
+    """
+    string_dtype = pd.StringDtype("pyarrow")
+    return table.to_pandas(
+        split_blocks=True,
+        types_mapper={pa.string(): string_dtype, pa.large_string(): string_dtype}.get,
+    )
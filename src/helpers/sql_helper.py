@@ -1,5 +1,16 @@
 # src/helpers/sql_helper.py
 
+import asyncio
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Mapping, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+
+SQL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'providers', 'sql'))
+
 def read_sql_file(file_path: str) -> str:
     """
     Reads the content of a SQL file.
@@ -7,11 +18,181 @@ def read_sql_file(file_path: str) -> str:
     with open(file_path, 'r') as f:
         return f.read()
 
-def create_query(sql_content: str, params: dict) -> str:
+# "#name" placeholders, as used by the original SQL templates. String literals
+# are matched too, only so that a '#' inside them is left untouched.
+PLACEHOLDER_PATTERN = re.compile(r"'(?:[^']|'')*'|(?<![\w#])#([A-Za-z_]\w*)")
+# "IN (#name)": the parameter receives a list and is expanded into one bind per
+# item. String literals are matched for the same reason as above.
+IN_PLACEHOLDER_PATTERN = re.compile(r"'(?:[^']|'')*'|\bIN\s*\(\s*#([A-Za-z_]\w*)\s*\)", re.IGNORECASE)
+
+@lru_cache(maxsize=256)
+def compile_query(sql_content: str) -> TextClause:
     """
-    Replaces placeholders in a SQL query with the provided parameters.
-    Placeholders should be in the format #placeholder_name.
+    Compiles a SQL template into a TextClause, translating #name placeholders
+    into real bind parameters (:name). Compiled once per distinct template.
+
+    Placeholders used as `IN (#name)` become expanding parameters that take a
+    list. On Postgres prefer `= ANY(#name)` with a list: it binds a single
+    array, so the statement text (and its prepared plan) does not change with
+    the number of items.
     """
-    for key, value in params.items():
-        sql_content = sql_content.replace(f"#{key}", str(value))
-    return sql_content
+    expanding: List[str] = []
+
+    def expand(match: re.Match) -> str:
+        if not match.group(1):
+            return match.group(0)
+        expanding.append(match.group(1))
+        # SQLAlchemy renders the parentheses of an expanding parameter itself
+        return f"IN #{match.group(1)}"
+
+    sql_content = IN_PLACEHOLDER_PATTERN.sub(expand, sql_content)
+    statement = text(PLACEHOLDER_PATTERN.sub(
+        lambda match: f":{match.group(1)}" if match.group(1) else match.group(0),
+        sql_content,
+    ))
+    if expanding:
+        statement = statement.bindparams(*(bindparam(name, expanding=True) for name in dict.fromkeys(expanding)))
+    return statement
+
+def create_query(sql_content: str, params: dict) -> Tuple[TextClause, Dict[str, Any]]:
+    """
+    Prepares a SQL template with #placeholder_name placeholders for execution.
+
+    Values are sent as bind parameters instead of being interpolated into
+    the SQL, so every call reuses the same statement (and server-side plan)
+    and values cannot inject SQL. Returns the statement and the parameters
+    to pass to `session.execute`.
+    """
+    return compile_query(sql_content), _bind_values(params)
+
+def _bind_values(params: Mapping[str, Any]) -> Dict[str, Any]:
+    # Tuples and sets are sent as lists, which drivers accept for arrays and IN lists
+    return {
+        key: list(value) if isinstance(value, (tuple, set, frozenset)) else value
+        for key, value in params.items()
+    }
+
+class SqlRegistry:
+    """
+    Loads every .sql file under a directory once and keeps each one compiled
+    as a reusable TextClause, addressed by its path without extension
+    (e.g. "paciente/obter_paciente").
+
+    Files may use `:name` or `#name` placeholders (see compile_query). The
+    bind parameters of each statement are extracted at load time, so a query
+    executed with missing or unknown parameters fails before reaching the
+    database.
+    """
+    def __init__(self, base_dir: str = SQL_DIR):
+        self.base_dir = base_dir
+        self._sql: Dict[str, str] = {}
+        self._statements: Dict[str, TextClause] = {}
+        self._params: Dict[str, FrozenSet[str]] = {}
+        self._mtimes: Dict[str, int] = {}
+        self.load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.base_dir, f"{name}.sql")
+
+    def _scan(self) -> Dict[str, int]:
+        found = {}
+        for root, _, files in os.walk(self.base_dir):
+            for file_name in files:
+                if file_name.endswith(".sql"):
+                    path = os.path.join(root, file_name)
+                    name = os.path.relpath(path, self.base_dir)[:-len(".sql")].replace(os.sep, "/")
+                    found[name] = os.stat(path).st_mtime_ns
+        return found
+
+    def _compile(self, name: str) -> None:
+        sql = read_sql_file(self._path(name)).strip().rstrip(";")
+        statement = compile_query(sql)
+        self._sql[name] = statement.text
+        self._statements[name] = statement
+        self._params[name] = frozenset(statement._bindparams)
+
+    def load(self) -> None:
+        """
+        (Re)loads every SQL file found under the base directory.
+        """
+        found = self._scan()
+        for name in found:
+            self._compile(name)
+        for name in set(self._sql) - set(found):
+            self._forget(name)
+        self._mtimes = found
+
+    def reload_changed(self) -> List[str]:
+        """
+        Recompiles only the files added or modified since the last load.
+        Returns the names that changed.
+        """
+        found = self._scan()
+        changed = [name for name, mtime in found.items() if self._mtimes.get(name) != mtime]
+        for name in changed:
+            self._compile(name)
+        for name in set(self._sql) - set(found):
+            self._forget(name)
+            changed.append(name)
+        self._mtimes = found
+        return changed
+
+    def _forget(self, name: str) -> None:
+        self._sql.pop(name, None)
+        self._statements.pop(name, None)
+        self._params.pop(name, None)
+
+    def _check_name(self, name: str) -> None:
+        if name not in self._statements:
+            raise RuntimeError(f"Arquivo SQL não encontrado em: {self._path(name)}")
+
+    def sql(self, name: str) -> str:
+        """
+        Returns the raw SQL of a file, for queries composed at runtime.
+        """
+        self._check_name(name)
+        return self._sql[name]
+
+    def get(self, name: str) -> TextClause:
+        """
+        Returns the compiled statement of a file.
+        """
+        self._check_name(name)
+        return self._statements[name]
+
+    def params(self, name: str) -> FrozenSet[str]:
+        self._check_name(name)
+        return self._params[name]
+
+    def prepare(self, name: str, params: Mapping[str, Any] | None = None) -> Tuple[TextClause, Dict[str, Any]]:
+        """
+        Returns the compiled statement with its parameters, after checking
+        that they match exactly the bind parameters declared in the file.
+        """
+        expected = self.params(name)
+        given = _bind_values(params or {})
+        missing = expected - given.keys()
+        unknown = given.keys() - expected
+        if missing or unknown:
+            raise ValueError(
+                f"Invalid parameters for SQL '{name}': "
+                f"missing={sorted(missing)}, unknown={sorted(unknown)}"
+            )
+        return self._statements[name], given
+
+    async def watch(self, interval: float = 1.0) -> None:
+        """
+        Development helper: polls the SQL directory and recompiles files as
+        they are edited. Enabled with SQL_AUTO_RELOAD=true.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changed = self.reload_changed()
+                if changed:
+                    print(f"INFO: Reloaded SQL files: {', '.join(sorted(changed))}")
+            except Exception as e:
+                print(f"ERROR: Failed to reload SQL files: {e}")
+
+# Loaded once at import; every provider shares the compiled statements
+sql_registry = SqlRegistry()
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import FileResponse
 import os
+import asyncio
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
@@ -9,6 +10,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from .resources.database import DatabaseManager, Base
+from .helpers.json_helper import FastJSONResponse
+from .resources.broadcaster import broadcaster
+from .resources.serie_ocupacao import serie_ocupacao
+from .resources.auditoria import auditoria
+from .helpers.sql_helper import sql_registry
+from .dependencies import obter_alocador, obter_indicadores, obter_motor_alertas, obter_quadro_leitos, sincronizar_leitos
+from .controllers import evento_controller, solicitacao_controller
+from .auth.auth import auth_handler
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,7 +27,7 @@ async def lifespan(app: FastAPI):
     # Initialize AGHU DB Manager and store in app.state
     aghu_dsn = os.getenv("POSTGRES_DSN")
     if aghu_dsn:
-        app.state.aghu_db = DatabaseManager(aghu_dsn)
+        app.state.aghu_db = DatabaseManager(aghu_dsn, env_prefix="POSTGRES")
         print("AGHU PostgreSQL connection pool initialized.")
     else:
         print("WARNING: POSTGRES_DSN not found. Skipping AGHU DB initialization.")
@@ -33,7 +42,7 @@ async def lifespan(app: FastAPI):
         default_sqlite_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data", "app.db"))
         app_dsn = f"sqlite+aiosqlite:///{default_sqlite_path}"
         print(f"WARNING: SQLITE_DSN not found. Using default local SQLite at {default_sqlite_path}.")
-    app.state.app_db = DatabaseManager(app_dsn)
+    app.state.app_db = DatabaseManager(app_dsn, env_prefix="SQLITE")
     print("App SQLite connection pool initialized.")
 
     # Create tables for App DB (if they don't exist) - for development only, Alembic handles this in production
@@ -41,22 +50,78 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
     print("App SQLite tables checked/created.")
 
+    # Bed/patient change events: a single background sync feeds every SSE client
+    from .routers import leito
+    if leito.STRATEGY.upper() != "POSTGRES" or hasattr(app.state, 'aghu_db'):
+        obter_quadro_leitos(leito.STRATEGY).assinar(evento_controller.publicador_de_leitos(broadcaster))
+        # Indicadores e alertas assinam o quadro desde a subida, não só na primeira consulta
+        indicadores = obter_indicadores(leito.STRATEGY)
+        obter_motor_alertas(leito.STRATEGY)
+        # Solicitações pendentes voltam à fila do alocador
+        async for session in app.state.app_db.get_session():
+            pendentes = await solicitacao_controller.carregar_pendentes(obter_alocador(leito.STRATEGY), session)
+        print(f"Bed allocator loaded with {pendentes} pending requests.")
+        app.state.vigia_leitos = asyncio.create_task(evento_controller.vigiar_leitos(
+            lambda: sincronizar_leitos(leito.STRATEGY, app),
+            float(os.getenv("EVENTOS_VIGIA_SECONDS", 5)),
+        ))
+        print("Bed board watcher started.")
+        # Série histórica da ocupação, amostrada dos mesmos contadores
+        app.state.ocupacao_sampler = asyncio.create_task(
+            serie_ocupacao.amostrar(app.state.app_db.writer, indicadores)
+        )
+    else:
+        print("WARNING: AGHU DB not initialized. Skipping bed board watcher.")
+
+    # Expired refresh tokens are deleted in batches in the background
+    app.state.token_sweeper = asyncio.create_task(auth_handler.sweep_expired_refresh_tokens(
+        app.state.app_db.writer,
+        float(os.getenv("REFRESH_TOKEN_SWEEP_SECONDS", 3600)),
+        int(os.getenv("REFRESH_TOKEN_SWEEP_BATCH", 500)),
+    ))
+
+    # Audit log entries are buffered in memory and written in batches
+    app.state.auditoria_flusher = asyncio.create_task(auditoria.gravar_periodicamente(app.state.app_db.writer))
+
+    # Development only: recompile .sql files as they are edited
+    if os.getenv("SQL_AUTO_RELOAD", "false").lower() == "true":
+        app.state.sql_watcher = asyncio.create_task(sql_registry.watch())
+        print("SQL auto-reload enabled.")
+
     yield
 
     # Shutdown
     print("Shutting down...")
+    if hasattr(app.state, 'sql_watcher'):
+        app.state.sql_watcher.cancel()
+    if hasattr(app.state, 'vigia_leitos'):
+        app.state.vigia_leitos.cancel()
+    if hasattr(app.state, 'token_sweeper'):
+        app.state.token_sweeper.cancel()
+    if hasattr(app.state, 'ocupacao_sampler'):
+        app.state.ocupacao_sampler.cancel()
+    if hasattr(app.state, 'auditoria_flusher'):
+        app.state.auditoria_flusher.cancel()
+        # Final flush, so a clean shutdown loses no buffered entries
+        try:
+            gravados = await auditoria.descarregar(app.state.app_db.writer)
+            print(f"Audit log flushed ({gravados} entries).")
+        except Exception as e:
+            print(f"ERROR: Failed to flush audit log: {e}")
     if hasattr(app.state, 'aghu_db') and app.state.aghu_db:
         await app.state.aghu_db.close_connection()
         print("AGHU PostgreSQL connection pool closed.")
     if hasattr(app.state, 'app_db') and app.state.app_db:
         await app.state.app_db.close_connection()
         print("App SQLite connection pool closed.")
+    auth_handler.close()
 
 app = FastAPI(
     title="Esqueleto de Aplicação Web Full-Stack",
     description="Aplicação Backend monolítica (API REST) em Python/FastAPI, com foco em acesso e agregação de dados heterogêneos.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Serve o frontend Vue 3 empacotado
@@ -70,8 +135,14 @@ async def serve_frontend():
     return FileResponse(os.path.join("src", "static", "dist", "index.html"))
 
 # Placeholder para incluir os roteadores da API
-from .routers import paciente, auth, admin
+from .routers import paciente, leito, indicadores, alertas, solicitacoes, historico, eventos, auth, admin
 app.include_router(paciente.router)
+app.include_router(leito.router)
+app.include_router(indicadores.router)
+app.include_router(alertas.router)
+app.include_router(solicitacoes.router)
+app.include_router(historico.router)
+app.include_router(eventos.router)
 app.include_router(auth.router)
 app.include_router(admin.router)
 
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+from ..resources.database import Base
+
+class AlertaLido(Base):
+    """An alert occurrence a user marked as read. Unread is the absence of a row."""
+    __tablename__ = "alertas_lidos"
+    # Clustered on (usuario, alerta_id): a user's marks are read with one range scan
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    usuario = Column(String, primary_key=True) # AD username (username from JWT)
+    alerta_id = Column(String, primary_key=True)
+    lido_em = Column(DateTime, nullable=False, server_default=func.now())
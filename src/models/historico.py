@@ -0,0 +1,40 @@
+from sqlalchemy import DDL, Column, DateTime, Index, Integer, String, event
+from ..resources.database import Base
+
+class RegistroHistorico(Base):
+    """An audited user action. Append-only: rows are never updated."""
+    __tablename__ = "historico"
+    # Every SQLite index ends with the rowid (id), so these also serve the
+    # (criado_em, id) keyset order without sorting
+    __table_args__ = (
+        Index("ix_historico_usuario_criado_em", "usuario", "criado_em"),
+        Index("ix_historico_entidade_criado_em", "entidade", "criado_em"),
+        Index("ix_historico_criado_em", "criado_em"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    criado_em = Column(DateTime, nullable=False)
+    usuario = Column(String, nullable=False) # AD username (username from JWT)
+    tipo = Column(String, nullable=False) # solicitacao, reserva, cancelamento...
+    acao = Column(String, nullable=False)
+    entidade = Column(String, nullable=False) # e.g. "leito:UTI-04", "solicitacao:12"
+    detalhes = Column(String, nullable=True)
+    # Lowercase, accent-free user + action + details, indexed by historico_busca
+    busca = Column(String, nullable=False)
+
+# Substring search: FTS5 trigram index over `busca`, kept in sync by triggers.
+# Also created by the Alembic migration; autogenerate ignores these tables.
+BUSCA_DDL = (
+    "CREATE VIRTUAL TABLE historico_busca USING fts5("
+    "busca, content='historico', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER historico_busca_ai AFTER INSERT ON historico BEGIN "
+    "INSERT INTO historico_busca (rowid, busca) VALUES (new.id, new.busca); END",
+    "CREATE TRIGGER historico_busca_ad AFTER DELETE ON historico BEGIN "
+    "INSERT INTO historico_busca (historico_busca, rowid, busca) VALUES ('delete', old.id, old.busca); END",
+)
+for _ddl in BUSCA_DDL:
+    event.listen(RegistroHistorico.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+event.listen(
+    RegistroHistorico.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS historico_busca").execute_if(dialect="sqlite"),
+)
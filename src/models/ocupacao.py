@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, SmallInteger
+from ..resources.database import Base
+
+class OcupacaoAmostra(Base):
+    """Raw occupancy sample. Append-only, at most one row per sampling instant."""
+    __tablename__ = "ocupacao_amostras"
+
+    # Epoch seconds aligned to the sampling interval. INTEGER PRIMARY KEY is the
+    # SQLite rowid itself: no separate index, and rows are stored in time order
+    ts = Column(Integer, primary_key=True, autoincrement=False)
+    ocupados = Column(SmallInteger, nullable=False)
+    operacionais = Column(SmallInteger, nullable=False)
+    total = Column(SmallInteger, nullable=False)
+
+class OcupacaoAgregado(Base):
+    """
+    Occupancy rolled up into a bucket of `passo` seconds (minute, hour, day).
+    Sums are kept instead of averages so buckets can be merged exactly.
+    """
+    __tablename__ = "ocupacao_agregados"
+    # Clustered on (passo, inicio): a range query reads one contiguous run of rows
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    passo = Column(Integer, primary_key=True)
+    inicio = Column(Integer, primary_key=True)
+    amostras = Column(Integer, nullable=False)
+    soma_ocupados = Column(Integer, nullable=False)
+    soma_operacionais = Column(Integer, nullable=False)
+    min_ocupados = Column(SmallInteger, nullable=False)
+    max_ocupados = Column(SmallInteger, nullable=False)
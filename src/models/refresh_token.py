@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, JSON
 from sqlalchemy.sql import func
 from ..resources.database import Base
 
@@ -7,7 +7,9 @@ class RefreshToken(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(String, index=True) # This will store the AD username (sub from JWT)
-    token = Column(String, unique=True, index=True)
+    # SHA-256 of the token sent in the cookie: the token itself is never stored,
+    # and a fixed 32-byte key keeps the unique index small
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False)
     groups = Column(JSON, nullable=True) # Store user groups
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True) # Indexed for the expiry sweeper
     created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from ..resources.database import Base
+
+class Solicitacao(Base):
+    """A request for an ICU bed. Pending ones are loaded into the AlocadorLeitos on startup."""
+    __tablename__ = "solicitacoes"
+
+    id = Column(Integer, primary_key=True)
+    prontuario = Column(Integer, nullable=False)
+    idade = Column(Integer, nullable=True)
+    especialidade = Column(String, nullable=False)
+    tipo = Column(String, nullable=False) # Requested bed type (cirurgico, hem, obstetrico, outro)
+    urgencia = Column(String, nullable=False) # emergencia, urgencia or eletiva
+    solicitante = Column(String, nullable=True) # AD username (username from JWT)
+    status = Column(String, nullable=False, server_default="pendente", index=True) # pendente, atendida or cancelada
+    leito_numero = Column(String, nullable=True) # Bed given to the request, once atendida
+    criada_em = Column(DateTime, nullable=False, server_default=func.now())
+    encerrada_em = Column(DateTime, nullable=True)
@@ -0,0 +1,159 @@
+import asyncio
+import csv
+import logging
+import time
+from datetime import date
+from typing import List, Dict, Any, Optional, Tuple
+from fastapi import HTTPException, status
+
+from ..interfaces.leito_provider_interface import LeitoProviderInterface
+from ...resources.quadro_leitos import QuadroLeitos
+from ...helpers.snapshot_helper import build_snapshot, read_snapshot, snapshot_path_for, source_signature
+
+COLUNAS_INTEIRAS = ("paciente_prontuario", "paciente_idade", "proximo_prontuario")
+COLUNAS_DATA = ("previsao_liberacao",)
+COLUNAS_BOOLEANAS = ("sinalizacao_transferencia",)
+COLUNAS_CATEGORICAS_SNAPSHOT = ("status", "tipo", "paciente_especialidade", "proximo_especialidade", "tipo_reserva")
+# Intervalo mínimo (s) entre verificações do arquivo disparadas por requisições
+INTERVALO_VERIFICACAO = 2.0
+
+logger = logging.getLogger(__name__)
+
+def gerar_snapshot(csv_path: str, snapshot_path: Optional[str] = None) -> str:
+    """
+    Converte o CSV de leitos no snapshot Arrow lido pelo provedor. As células
+    são gravadas como texto, exatamente como o csv.DictReader as entrega, para
+    que a conversão de tipos continue sendo a de `_converter_linha`.
+    """
+    return build_snapshot(
+        csv_path,
+        snapshot_path,
+        categorical=COLUNAS_CATEGORICAS_SNAPSHOT,
+        dtype=str,
+        keep_default_na=False,
+    )
+
+def _converter_linha(linha: Dict[str, str]) -> Dict[str, Any]:
+    # Células vazias viram None; números, datas e booleanos são convertidos
+    # para que o quadro compare e sirva os mesmos tipos do provedor Postgres.
+    leito: Dict[str, Any] = {}
+    for coluna, valor in linha.items():
+        valor = valor.strip() if valor is not None else ""
+        if valor == "":
+            leito[coluna] = None
+        elif coluna in COLUNAS_INTEIRAS:
+            leito[coluna] = int(valor)
+        elif coluna in COLUNAS_DATA:
+            leito[coluna] = date.fromisoformat(valor)
+        elif coluna in COLUNAS_BOOLEANAS:
+            leito[coluna] = valor.lower() == "true"
+        else:
+            leito[coluna] = valor
+    return leito
+
+class LeitoCsvProvider(LeitoProviderInterface):
+    """
+    Provedor de leitos baseado em CSV, compartilhado pelo processo.
+
+    O arquivo é relido apenas quando o mtime ou o tamanho mudam; cada releitura
+    é aplicada ao QuadroLeitos, que só registra os leitos que de fato mudaram.
+    Um snapshot Arrow (`gerar_snapshot`) tão novo quanto o CSV é lido no lugar dele.
+
+    As requisições leem o quadro vigente: no máximo a cada
+    `intervalo_verificacao` segundos elas agendam uma sincronização, cuja
+    verificação e leitura do arquivo rodam numa thread. Só a aplicação ao
+    quadro (e o aviso aos ouvintes) volta ao event loop.
+    """
+
+    def __init__(
+        self,
+        csv_path: str = 'data/leitos.csv',
+        snapshot_path: Optional[str] = None,
+        intervalo_verificacao: float = INTERVALO_VERIFICACAO,
+    ):
+        self.csv_path = csv_path
+        self.snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+        self.intervalo_verificacao = intervalo_verificacao
+        self.quadro = QuadroLeitos()
+        self._assinatura: Tuple[str, int, int] | None = None
+        self._sincronizacao: Optional[asyncio.Task] = None
+        self._verificacao: Optional[asyncio.Task] = None
+        self._aplicar(self._ler_se_alterado())
+        self._verificado_em = time.monotonic()
+
+    def _ler_assinatura(self) -> Tuple[str, int, int]:
+        # Caminho lido (snapshot ou CSV), mtime e tamanho
+        assinatura = source_signature(self.csv_path, self.snapshot_path)
+        if assinatura is None:
+            raise RuntimeError(f"Arquivo CSV de leitos não encontrado em: {self.csv_path}")
+        return assinatura
+
+    def _carregar(self, caminho: str) -> List[Dict[str, Any]]:
+        try:
+            if caminho == self.snapshot_path:
+                return [_converter_linha(linha) for linha in read_snapshot(caminho).to_pylist()]
+            with open(caminho, newline='', encoding='utf-8') as f:
+                return [_converter_linha(linha) for linha in csv.DictReader(f)]
+        except FileNotFoundError:
+            raise RuntimeError(f"Arquivo CSV de leitos não encontrado em: {caminho}")
+
+    def _ler_se_alterado(self) -> Optional[Tuple[Tuple[str, int, int], List[Dict[str, Any]]]]:
+        """Assinatura e linhas do arquivo, se ele mudou desde a última aplicação (None = não mudou)."""
+        assinatura = self._ler_assinatura()
+        if assinatura == self._assinatura:
+            return None
+        return assinatura, self._carregar(assinatura[0])
+
+    def _aplicar(self, leitura: Optional[Tuple[Tuple[str, int, int], List[Dict[str, Any]]]]) -> None:
+        if leitura is not None:
+            assinatura, leitos = leitura
+            self.quadro.aplicar(leitos)
+            self._assinatura = assinatura
+
+    async def _sincronizar(self) -> None:
+        self._aplicar(await asyncio.to_thread(self._ler_se_alterado))
+
+    async def sincronizar(self) -> None:
+        """
+        Reaplica o CSV (ou o snapshot) ao quadro se o arquivo mudou em disco.
+        Chamadas simultâneas aguardam a mesma sincronização.
+        """
+        if self._sincronizacao is None or self._sincronizacao.done():
+            self._sincronizacao = asyncio.create_task(self._sincronizar())
+        # Blindada: o cancelamento de quem espera não interrompe a aplicação ao quadro
+        await asyncio.shield(self._sincronizacao)
+
+    def _quadro_vigente(self) -> QuadroLeitos:
+        """
+        Quadro atual, sem I/O no event loop. Agenda a sincronização quando o
+        intervalo venceu e não há outra verificação em andamento.
+        """
+        agora = time.monotonic()
+        if agora - self._verificado_em >= self.intervalo_verificacao and (
+            self._verificacao is None or self._verificacao.done()
+        ):
+            self._verificado_em = agora
+            self._verificacao = asyncio.create_task(self._verificar())
+        return self.quadro
+
+    async def _verificar(self) -> None:
+        try:
+            await self.sincronizar()
+        except Exception:
+            # O quadro anterior continua valendo; a próxima verificação tenta de novo
+            logger.exception("Failed to reload bed CSV %s", self.csv_path)
+        finally:
+            # O intervalo conta a partir do fim da sincronização, não do início
+            self._verificado_em = time.monotonic()
+
+    async def listar_leitos(self, status: Optional[str] = None, tipo: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._quadro_vigente().listar(status=status, tipo=tipo)
+
+    async def obter_leito(self, leito_numero: str) -> Dict[str, Any]:
+        leito = self._quadro_vigente().obter(leito_numero)
+        if leito is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leito não encontrado no CSV")
+        return leito
+
+    async def listar_alteracoes(self, desde: int) -> Dict[str, Any]:
+        return self._quadro_vigente().alteracoes_desde(desde)
@@ -0,0 +1,55 @@
+import asyncio
+import os
+import time
+from typing import List, Dict, Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from ..interfaces.leito_provider_interface import LeitoProviderInterface
+from ...resources.quadro_leitos import QuadroLeitos
+from ...helpers.sql_helper import sql_registry
+
+class LeitoPostgresProvider(LeitoProviderInterface):
+    """
+    Provedor de leitos baseado no AGHU.
+
+    Uma instância é criada por requisição (com a sessão do AGHU), mas o quadro
+    é compartilhado pelo processo e ressincronizado no máximo uma vez a cada
+    LEITO_SYNC_SECONDS: vários clientes consultando o quadro custam uma única
+    consulta por intervalo.
+    """
+    quadro = QuadroLeitos()
+    _sincronizado_em = 0.0
+    _lock = asyncio.Lock()
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.intervalo = float(os.getenv("LEITO_SYNC_SECONDS", 5))
+
+    async def sincronizar(self) -> None:
+        cls = type(self)
+        if time.monotonic() - cls._sincronizado_em < self.intervalo:
+            return
+        async with cls._lock:
+            # Outra requisição pode ter sincronizado enquanto aguardávamos
+            if time.monotonic() - cls._sincronizado_em < self.intervalo:
+                return
+            query, params = sql_registry.prepare("leito/listar_leitos")
+            result = await self.session.execute(query, params)
+            cls.quadro.aplicar(dict(leito) for leito in result.mappings().all())
+            cls._sincronizado_em = time.monotonic()
+
+    async def listar_leitos(self, status: Optional[str] = None, tipo: Optional[str] = None) -> List[Dict[str, Any]]:
+        await self.sincronizar()
+        return self.quadro.listar(status=status, tipo=tipo)
+
+    async def obter_leito(self, leito_numero: str) -> Dict[str, Any]:
+        await self.sincronizar()
+        leito = self.quadro.obter(leito_numero)
+        if leito is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Leito não encontrado")
+        return leito
+
+    async def listar_alteracoes(self, desde: int) -> Dict[str, Any]:
+        await self.sincronizar()
+        return self.quadro.alteracoes_desde(desde)
@@ -0,0 +1,81 @@
+from typing import List, Dict, Any, AsyncIterator, Optional, Sequence
+
+from ..interfaces.paciente_provider_interface import FiltroPacientes, PacienteProviderInterface, termos_busca
+from ...helpers.cache_helper import MISSING, TTLCache
+
+class PacienteCachedProvider(PacienteProviderInterface):
+    """
+    Decorador de leitura (read-through) para qualquer PacienteProviderInterface.
+
+    O provedor interno pode ser criado por requisição (ex.: com a sessão do
+    AGHU), mas o `cache` é compartilhado pelo processo. Falhas, como o 404 de
+    paciente inexistente, não são guardadas. A exportação não passa pelo cache.
+    """
+
+    def __init__(
+        self,
+        provider: PacienteProviderInterface,
+        cache: TTLCache,
+        ttl_listar: float = 30,
+        ttl_obter: float = 60,
+    ):
+        self.provider = provider
+        self.cache = cache
+        self.ttl_listar = ttl_listar
+        self.ttl_obter = ttl_obter
+
+    async def listar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        after_codigo: Optional[int] = None,
+        limit: int = 100,
+        campos: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        chave = ("listar_pacientes", filtro, after_codigo, limit, tuple(campos) if campos else None)
+        return await self.cache.get_or_load(
+            chave,
+            self.ttl_listar,
+            lambda: self.provider.listar_pacientes(filtro=filtro, after_codigo=after_codigo, limit=limit, campos=campos),
+        )
+
+    def iterar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        campos: Optional[Sequence[str]] = None,
+        tamanho_lote: int = 5000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        return self.provider.iterar_pacientes(filtro=filtro, campos=campos, tamanho_lote=tamanho_lote)
+
+    async def buscar_pacientes(self, termo: str, limit: int = 20) -> List[Dict[str, Any]]:
+        # Chave pelo termo normalizado: "José" e "jose " compartilham a entrada
+        chave = ("buscar_pacientes", tuple(termos_busca(termo)), limit)
+        return await self.cache.get_or_load(
+            chave,
+            self.ttl_listar,
+            lambda: self.provider.buscar_pacientes(termo, limit=limit),
+        )
+
+    async def obter_paciente_por_codigo(self, codigo: int) -> Dict[str, Any]:
+        return await self.cache.get_or_load(
+            ("obter_paciente_por_codigo", codigo),
+            self.ttl_obter,
+            lambda: self.provider.obter_paciente_por_codigo(codigo),
+        )
+
+    async def obter_pacientes_por_codigos(self, codigos: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        # Compartilha as entradas de obter_paciente_por_codigo: só os códigos
+        # ausentes do cache vão, juntos, ao provedor interno
+        encontrados: Dict[int, Dict[str, Any]] = {}
+        faltantes = []
+        for codigo in codigos:
+            paciente = self.cache.get(("obter_paciente_por_codigo", codigo))
+            if paciente is MISSING:
+                faltantes.append(codigo)
+            else:
+                encontrados[codigo] = paciente
+        if faltantes:
+            carregados = await self.provider.obter_pacientes_por_codigos(faltantes)
+            for codigo, paciente in carregados.items():
+                self.cache.set(("obter_paciente_por_codigo", codigo), paciente, self.ttl_obter)
+            encontrados.update(carregados)
+        return {codigo: encontrados[codigo] for codigo in codigos if codigo in encontrados}
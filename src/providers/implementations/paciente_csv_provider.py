@@ -1,25 +1,427 @@
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from itertools import chain
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from typing import List, Dict, Any, AsyncIterator, Optional, Sequence, Tuple
 from fastapi import HTTPException, status
 
-from ..interfaces.paciente_provider_interface import PacienteProviderInterface
+from ..interfaces.paciente_provider_interface import (
+    COLUNAS_BUSCA,
+    FiltroPacientes,
+    PacienteProviderInterface,
+    normalizar_campos,
+    termos_busca,
+)
+from ...helpers.snapshot_helper import (
+    build_snapshot,
+    iso_dates_to_numpy,
+    read_snapshot,
+    snapshot_path_for,
+    snapshot_to_pandas,
+    source_signature,
+)
+
+# Colunas de baixa cardinalidade filtradas por igualdade: comparamos os códigos
+# inteiros do categórico em vez das strings.
+COLUNAS_CATEGORICAS = ("especialidade_atual", "sexo")
+# Colunas gravadas com dicionário (categóricas) no snapshot Arrow
+COLUNAS_CATEGORICAS_SNAPSHOT = ("sexo", "cor", "especialidade_atual", "origem_atendimento")
+# Tamanho do bloco varrido por vez ao filtrar; limita o trabalho por página
+# quando os filtros são pouco seletivos.
+TAMANHO_BLOCO = 65536
+# Palavras do nome consideradas no desempate alfabético da busca por nome
+PALAVRAS_ORDENACAO = 6
+# Intervalo mínimo (s) entre verificações do arquivo em disco
+INTERVALO_VERIFICACAO = 2.0
+
+logger = logging.getLogger(__name__)
+
+def _to_native(value: Any) -> Any:
+    # Converte escalares NumPy para tipos nativos, como faz o to_dict(orient='records')
+    if value is pd.NA:
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+def _ordenar_por_codigo(df: pd.DataFrame) -> pd.DataFrame:
+    # Garante que a coluna de código seja tratada como inteiro para comparações
+    if df['codigo'].dtype != np.int64:
+        df['codigo'] = df['codigo'].astype(np.int64)
+    # Ordenação estável por código: a paginação por chave vira um searchsorted.
+    # O snapshot já é gravado ordenado; reordenar copiaria as colunas mapeadas.
+    if not df['codigo'].is_monotonic_increasing:
+        df = df.sort_values('codigo', kind='stable', ignore_index=True)
+    return df
+
+def gerar_snapshot(csv_path: str, snapshot_path: Optional[str] = None) -> str:
+    """
+    Converte o CSV de pacientes no snapshot Arrow lido pelo provedor: já
+    ordenado por `codigo` e com as colunas de baixa cardinalidade categóricas.
+    """
+    return build_snapshot(
+        csv_path,
+        snapshot_path,
+        categorical=COLUNAS_CATEGORICAS_SNAPSHOT,
+        prepare=_ordenar_por_codigo,
+    )
+
+@dataclass(frozen=True)
+class _CargaCsv:
+    """Resultado de uma leitura do CSV. É substituído por inteiro a cada recarga."""
+    df: pd.DataFrame
+    codigos: np.ndarray
+    indice: Dict[int, int]
+    colunas: List[Tuple[str, Any]]
+    categorias: Dict[str, Tuple[pd.Index, np.ndarray]]
+    data_admissao: Optional[np.ndarray]
+
+class _IndiceNomes:
+    """
+    Índice de prefixos dos nomes normalizados (ver `termos_busca`), montado na
+    primeira busca de cada carga.
+
+    O vocabulário de palavras fica ordenado, então as palavras que começam com
+    um prefixo formam uma faixa contígua achada por busca binária; as linhas
+    de cada palavra ficam agrupadas na mesma ordem (CSR), e a faixa de
+    palavras vira uma fatia de `linhas` sem cópia. As palavras de cada linha
+    também são guardadas para conferir os demais termos só nos candidatos.
+    """
+    def __init__(self, nomes: pd.Series):
+        palavras_por_nome = [termos_busca(nome) if isinstance(nome, str) else [] for nome in nomes]
+        quantidades = np.fromiter(map(len, palavras_por_nome), dtype=np.int64, count=len(palavras_por_nome))
+        codigos, vocabulario = pd.factorize(np.array(list(chain.from_iterable(palavras_por_nome)), dtype=object), sort=True)
+        self.vocabulario: List[str] = list(vocabulario)
+        # Palavras de cada linha, na ordem do nome (a primeira decide a relevância)
+        self.palavras_linha = codigos.astype(np.int32)
+        self.inicio_linha = np.concatenate(([0], np.cumsum(quantidades)))
+        # Linhas de cada palavra do vocabulário, agrupadas em ordem de palavra
+        linhas_palavras = np.repeat(np.arange(len(quantidades), dtype=np.int32), quantidades)
+        ordem = np.argsort(self.palavras_linha, kind='stable')
+        self.linhas = linhas_palavras[ordem]
+        self.inicio = np.concatenate(([0], np.cumsum(np.bincount(codigos, minlength=len(self.vocabulario)))))
+        self.ordem_nome = self._ordem_alfabetica(linhas_palavras, len(quantidades))
+
+    def _ordem_alfabetica(self, linhas_palavras: np.ndarray, total: int) -> np.ndarray:
+        """
+        Posição alfabética de cada nome normalizado, usada como desempate.
+        Como o vocabulário está ordenado, comparar os códigos palavra a palavra
+        equivale a comparar os nomes; evita ordenar um array de strings.
+        """
+        posicoes = np.arange(len(linhas_palavras)) - self.inicio_linha[linhas_palavras]
+        visiveis = posicoes < PALAVRAS_ORDENACAO
+        # -1 nas posições sem palavra: o nome mais curto vem antes, como na comparação de strings
+        chaves = np.full((PALAVRAS_ORDENACAO, total), -1, dtype=np.int32)
+        chaves[posicoes[visiveis], linhas_palavras[visiveis]] = self.palavras_linha[visiveis]
+        ordem_nome = np.empty(total, dtype=np.int64)
+        ordem_nome[np.lexsort(chaves[::-1])] = np.arange(total)
+        return ordem_nome
+
+    def faixa(self, prefixo: str) -> Tuple[int, int]:
+        """Faixa [inicio, fim) do vocabulário com as palavras que começam com `prefixo`."""
+        # As palavras só têm [a-z0-9], todos menores que '\x7f'
+        return bisect_left(self.vocabulario, prefixo), bisect_left(self.vocabulario, prefixo + "\x7f")
+
+    def tem_palavra(self, linhas: np.ndarray, faixa: Tuple[int, int]) -> np.ndarray:
+        """Máscara das `linhas` com alguma palavra na faixa do vocabulário."""
+        if not len(linhas):
+            return np.zeros(0, dtype=bool)
+        inicios = self.inicio_linha[linhas]
+        quantidades = self.inicio_linha[linhas + 1] - inicios
+        primeiras = np.cumsum(quantidades) - quantidades
+        posicoes = np.repeat(inicios - primeiras, quantidades) + np.arange(int(quantidades.sum()))
+        codigos = self.palavras_linha[posicoes]
+        return np.logical_or.reduceat((codigos >= faixa[0]) & (codigos < faixa[1]), primeiras)
+
+    def buscar(self, palavras: Sequence[str], limit: int) -> np.ndarray:
+        """Linhas dos `limit` nomes mais relevantes que atendem a todas as palavras."""
+        faixas = [self.faixa(palavra) for palavra in palavras]
+        tamanhos = [self.inicio[fim] - self.inicio[inicio] for inicio, fim in faixas]
+        if not all(tamanhos):
+            return np.empty(0, dtype=np.int32)
+        # Os candidatos vêm da palavra mais seletiva; as demais só são conferidas neles
+        guia = int(np.argmin(tamanhos))
+        inicio, fim = faixas[guia]
+        linhas = self.linhas[self.inicio[inicio]:self.inicio[fim]]
+        for indice, faixa in enumerate(faixas):
+            if indice != guia:
+                linhas = linhas[self.tem_palavra(linhas, faixa)]
+
+        # Relevância: nome começando pela primeira palavra digitada, depois ordem alfabética
+        primeira = self.palavras_linha[self.inicio_linha[linhas]]
+        comeca = (primeira >= faixas[0][0]) & (primeira < faixas[0][1])
+        chave = np.where(comeca, 0, len(self.ordem_nome)) + self.ordem_nome[linhas]
+        # Seleção parcial dos melhores: o custo não depende de ordenar todos os
+        # candidatos. Um nome com duas palavras na faixa aparece duas vezes,
+        # então a seleção cresce até sobrar `limit` linhas distintas.
+        k = limit
+        while True:
+            k = min(len(chave), k * 4)
+            melhores = np.argpartition(chave, k - 1)[:k] if k < len(chave) else np.arange(len(chave))
+            selecionadas = linhas[melhores[np.argsort(chave[melhores], kind='stable')]]
+            _, primeiras = np.unique(selecionadas, return_index=True)
+            resultado = selecionadas[np.sort(primeiras)]
+            if len(resultado) >= limit or k == len(chave):
+                return resultado[:limit]
 
 class PacienteCsvProvider(PacienteProviderInterface):
-    def __init__(self, csv_path: str = 'data/pacientes.csv'):
+    """
+    Provedor de pacientes baseado em CSV.
+
+    A instância é pensada para ser compartilhada pelo processo inteiro (ver
+    `dependencies._get_paciente_csv_provider`): o arquivo é lido uma única vez,
+    ordenado por `codigo` (a paginação é binária sobre essa coluna), um índice
+    `codigo -> posição da linha` é mantido em memória e o CSV só é
+    recarregado quando o mtime ou o tamanho do arquivo mudam.
+
+    As requisições nunca esperam pelo disco: no máximo a cada
+    `intervalo_verificacao` segundos, a verificação do arquivo (e a recarga,
+    se ele mudou) é agendada numa thread, e até ela terminar as consultas
+    continuam servidas pela carga anterior.
+
+    Se existir um snapshot Arrow (`gerar_snapshot`) tão novo quanto o CSV, ele
+    é lido no lugar do CSV: o arquivo é mapeado em memória, sem parsing, e os
+    workers que o abrem compartilham as mesmas páginas.
+
+    A busca por nome usa um `_IndiceNomes` montado na primeira busca após cada
+    carga, fora do event loop, para não pesar no tempo de subida.
+    """
+
+    def __init__(
+        self,
+        csv_path: str = 'data/pacientes.csv',
+        snapshot_path: Optional[str] = None,
+        intervalo_verificacao: float = INTERVALO_VERIFICACAO,
+    ):
+        self.csv_path = csv_path
+        self.snapshot_path = snapshot_path or snapshot_path_for(csv_path)
+        self.intervalo_verificacao = intervalo_verificacao
+        self._lock = threading.Lock()
+        self._assinatura: Tuple[str, int, int] | None = None
+        self._lock_indice = threading.Lock()
+        self._indice_nomes: Tuple[_CargaCsv, _IndiceNomes] | None = None
+        self._verificacao: Optional[asyncio.Task] = None
+        self._recarregar_se_alterado()
+        self._verificado_em = time.monotonic()
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._carga.df
+
+    def _ler_assinatura(self) -> Tuple[str, int, int]:
+        # Caminho lido (snapshot ou CSV), mtime e tamanho
+        assinatura = source_signature(self.csv_path, self.snapshot_path)
+        if assinatura is None:
+            raise RuntimeError(f"Arquivo CSV de pacientes não encontrado em: {self.csv_path}")
+        return assinatura
+
+    def _carregar(self, caminho: str) -> _CargaCsv:
         try:
-            self.df = pd.read_csv(csv_path)
-            # Garante que a coluna de código seja tratada como inteiro para comparações
-            self.df['codigo'] = self.df['codigo'].astype(int)
+            if caminho == self.snapshot_path:
+                df = snapshot_to_pandas(read_snapshot(caminho))
+            else:
+                df = pd.read_csv(caminho)
         except FileNotFoundError:
-            raise RuntimeError(f"Arquivo CSV de pacientes não encontrado em: {csv_path}")
+            raise RuntimeError(f"Arquivo CSV de pacientes não encontrado em: {caminho}")
+        df = _ordenar_por_codigo(df)
 
-    async def listar_pacientes(self) -> List[Dict[str, Any]]:
-        return self.df.to_dict(orient='records')
+        categorias = {}
+        for coluna in COLUNAS_CATEGORICAS:
+            if coluna in df.columns:
+                categorico = pd.Categorical(df[coluna])
+                categorias[coluna] = (categorico.categories, categorico.codes)
+
+        data_admissao = None
+        if 'data_admissao' in df.columns:
+            data_admissao = iso_dates_to_numpy(df['data_admissao'])
+            if data_admissao is None:
+                data_admissao = pd.to_datetime(df['data_admissao'], errors='coerce').to_numpy(dtype='datetime64[D]')
+
+        # Índice hash codigo -> posição. Percorrido de trás para frente para que,
+        # havendo códigos duplicados, prevaleça a primeira ocorrência.
+        codigos = df['codigo'].tolist()
+        indice = dict(zip(reversed(codigos), range(len(codigos) - 1, -1, -1)))
+
+        return _CargaCsv(
+            df=df,
+            codigos=df['codigo'].to_numpy(),
+            indice=indice,
+            # Colunas do snapshot (texto Arrow, categóricas) são acessadas sem
+            # materializar um array de objetos Python
+            colunas=[
+                (nome, df[nome].array if isinstance(df[nome].dtype, pd.api.extensions.ExtensionDtype) else df[nome].to_numpy())
+                for nome in df.columns
+            ],
+            categorias=categorias,
+            data_admissao=data_admissao,
+        )
+
+    def _recarregar_se_alterado(self) -> _CargaCsv:
+        """Recarrega o CSV se ele mudou em disco e devolve a carga vigente."""
+        assinatura = self._ler_assinatura()
+        if assinatura != self._assinatura:
+            with self._lock:
+                # Outra thread pode ter recarregado enquanto aguardávamos o lock
+                assinatura = self._ler_assinatura()
+                if assinatura != self._assinatura:
+                    self._carga = self._carregar(assinatura[0])
+                    self._assinatura = assinatura
+        return self._carga
+
+    def _carga_vigente(self) -> _CargaCsv:
+        """
+        Carga atual, sem I/O no event loop. Agenda a verificação do arquivo
+        quando o intervalo venceu e não há outra em andamento.
+        """
+        agora = time.monotonic()
+        if agora - self._verificado_em >= self.intervalo_verificacao and (
+            self._verificacao is None or self._verificacao.done()
+        ):
+            self._verificado_em = agora
+            self._verificacao = asyncio.create_task(self._verificar())
+        return self._carga
+
+    async def _verificar(self) -> None:
+        try:
+            await asyncio.to_thread(self._recarregar_se_alterado)
+        except Exception:
+            # A carga anterior continua valendo; a próxima verificação tenta de novo
+            logger.exception("Failed to reload patient CSV %s", self.csv_path)
+        finally:
+            # O intervalo conta a partir do fim da recarga, não do início
+            self._verificado_em = time.monotonic()
+
+    def _indexar_nomes(self, carga: _CargaCsv) -> _IndiceNomes:
+        with self._lock_indice:
+            if self._indice_nomes is None or self._indice_nomes[0] is not carga:
+                self._indice_nomes = (carga, _IndiceNomes(carga.df['nome']))
+            return self._indice_nomes[1]
+
+    @staticmethod
+    def _mascara(carga: _CargaCsv, filtro: FiltroPacientes, inicio: int, fim: int) -> Optional[np.ndarray]:
+        """Máscara booleana das linhas [inicio, fim) que atendem ao filtro (None = todas)."""
+        mascara = None
+
+        def combinar(parcial: np.ndarray) -> None:
+            nonlocal mascara
+            mascara = parcial if mascara is None else mascara & parcial
+
+        for coluna in COLUNAS_CATEGORICAS:
+            valor = getattr(filtro, coluna)
+            if valor is None:
+                continue
+            if coluna not in carga.categorias:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Filtro indisponível no CSV: {coluna}")
+            categorias, codigos = carga.categorias[coluna]
+            posicao = categorias.get_indexer([valor])[0]
+            # Valor inexistente no arquivo: nenhuma linha atende
+            combinar(codigos[inicio:fim] == posicao if posicao >= 0 else np.zeros(fim - inicio, dtype=bool))
+
+        if filtro.data_admissao_inicio is not None or filtro.data_admissao_fim is not None:
+            if carga.data_admissao is None:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Filtro indisponível no CSV: data_admissao")
+            datas = carga.data_admissao[inicio:fim]
+            if filtro.data_admissao_inicio is not None:
+                combinar(datas >= np.datetime64(filtro.data_admissao_inicio, 'D'))
+            if filtro.data_admissao_fim is not None:
+                combinar(datas <= np.datetime64(filtro.data_admissao_fim, 'D'))
+
+        return mascara
+
+    def _posicoes(
+        self,
+        carga: _CargaCsv,
+        filtro: Optional[FiltroPacientes],
+        inicio: int,
+        limit: int,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Posições (no frame ordenado) de até `limit` linhas que atendem ao filtro,
+        a partir de `inicio`, varrendo em blocos. Devolve também onde a varredura parou.
+        """
+        total = len(carga.codigos)
+        if filtro is None or filtro == FiltroPacientes():
+            parada = min(inicio + limit, total)
+            return np.arange(inicio, parada), parada
+
+        encontradas = []
+        faltam = limit
+        while inicio < total and faltam > 0:
+            fim_bloco = min(inicio + TAMANHO_BLOCO, total)
+            mascara = self._mascara(carga, filtro, inicio, fim_bloco)
+            bloco = np.flatnonzero(mascara)[:faltam]
+            if len(bloco) == faltam:
+                # A página fechou no meio do bloco: a próxima varredura recomeça logo após
+                fim_bloco = inicio + int(bloco[-1]) + 1
+            encontradas.append(bloco + inicio)
+            faltam -= len(bloco)
+            inicio = fim_bloco
+        posicoes = np.concatenate(encontradas) if encontradas else np.empty(0, dtype=np.intp)
+        return posicoes, inicio
+
+    async def listar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        after_codigo: Optional[int] = None,
+        limit: int = 100,
+        campos: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        carga = self._carga_vigente()
+        colunas = normalizar_campos(campos, carga.df.columns)
+        inicio = 0
+        if after_codigo is not None:
+            inicio = int(np.searchsorted(carga.codigos, after_codigo, side='right'))
+        posicoes, _ = self._posicoes(carga, filtro, inicio, limit)
+        return carga.df.iloc[posicoes][colunas].to_dict(orient='records')
+
+    async def iterar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        campos: Optional[Sequence[str]] = None,
+        tamanho_lote: int = 5000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        # A carga é fixada no início: uma recarga durante a exportação não afeta este fluxo
+        carga = self._carga_vigente()
+        colunas = normalizar_campos(campos, carga.df.columns)
+        inicio, total = 0, len(carga.codigos)
+        while inicio < total:
+            posicoes, inicio = self._posicoes(carga, filtro, inicio, tamanho_lote)
+            if len(posicoes):
+                yield carga.df.iloc[posicoes][colunas].to_dict(orient='records')
+
+    async def buscar_pacientes(self, termo: str, limit: int = 20) -> List[Dict[str, Any]]:
+        carga = self._carga_vigente()
+        if 'nome' not in carga.df.columns:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Busca indisponível no CSV: nome")
+        palavras = termos_busca(termo)
+        if not palavras:
+            return []
+        indice = self._indice_nomes
+        if indice is not None and indice[0] is carga:
+            indice = indice[1]
+        else:
+            indice = await asyncio.to_thread(self._indexar_nomes, carga)
+        colunas = [coluna for coluna in COLUNAS_BUSCA if coluna in carga.df.columns]
+        return carga.df.iloc[indice.buscar(palavras, limit)][colunas].to_dict(orient='records')
 
     async def obter_paciente_por_codigo(self, codigo: int) -> Dict[str, Any]:
-        paciente_df = self.df[self.df['codigo'] == codigo]
-        if paciente_df.empty:
+        carga = self._carga_vigente()
+        posicao = carga.indice.get(codigo)
+        if posicao is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paciente não encontrado no CSV")
-        
-        # .to_dict('records') retorna uma lista, então pegamos o primeiro elemento
-        return paciente_df.to_dict(orient='records')[0]
+
+        return {nome: _to_native(valores[posicao]) for nome, valores in carga.colunas}
+
+    async def obter_pacientes_por_codigos(self, codigos: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        carga = self._carga_vigente()
+        if not len(codigos) or not len(carga.codigos):
+            return {}
+        procurados = np.asarray(codigos, dtype=carga.codigos.dtype)
+        # Busca binária vetorizada no frame ordenado (side='left' = primeira ocorrência, como no índice)
+        posicoes = np.minimum(np.searchsorted(carga.codigos, procurados), len(carga.codigos) - 1)
+        achados = carga.codigos[posicoes] == procurados
+        linhas = carga.df.iloc[posicoes[achados]].to_dict(orient='records')
+        return {linha['codigo']: linha for linha in linhas}
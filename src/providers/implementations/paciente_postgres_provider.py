@@ -1,41 +1,144 @@
-import os
-from typing import List, Dict, Any
+from datetime import timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Optional, Sequence, Tuple
 from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from ..interfaces.paciente_provider_interface import PacienteProviderInterface
+from ...helpers.sql_helper import sql_registry
+from ..interfaces.paciente_provider_interface import (
+    FiltroPacientes,
+    PacienteProviderInterface,
+    normalizar_campos,
+    termos_busca,
+)
 
-def get_sql_query(file_path: str) -> str:
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    # Ajuste no caminho para voltar dois níveis (implementations -> providers -> src) e depois entrar em providers/sql
-    sql_file_path = os.path.join(base_dir, '..', 'sql', file_path)
-    try:
-        with open(sql_file_path, 'r') as f:
-            return f.read()
-    except FileNotFoundError:
-        raise RuntimeError(f"Arquivo SQL não encontrado em: {sql_file_path}")
+# Colunas expostas por paciente/listar_pacientes.sql
+COLUNAS_LISTAGEM = ("codigo", "nome", "dt_nascimento", "sexo", "cor", "especialidade_atual", "data_admissao")
+
+# Predicados aplicados sobre as colunas das tabelas (e não sobre as expressões
+# projetadas), para que o Postgres possa usar os índices de cada uma.
+PREDICADOS_LISTAGEM = {
+    "after_codigo": "pac.codigo > :after_codigo",
+    "especialidade_atual": "esp.nome_especialidade = :especialidade_atual",
+    "sexo": "pac.sexo = :sexo",
+    "data_admissao_inicio": "inte.dthr_internacao >= :data_admissao_inicio",
+    "data_admissao_fim": "inte.dthr_internacao < :data_admissao_fim",
+}
+
+# Teto de candidatos do ramo "contém" da busca por nome: os primeiros em
+# ordem alfabética (top-N no Postgres), para que o resultado seja estável
+# e a junção final fique pequena quando o termo é pouco seletivo
+CANDIDATOS_BUSCA = 500
+
+@lru_cache(maxsize=128)
+def _montar_listagem(
+    base: str,
+    predicados: Tuple[str, ...],
+    colunas: Tuple[str, ...],
+    paginada: bool = True,
+) -> TextClause:
+    """
+    Monta a consulta de listagem para uma combinação de filtros e projeção.
+    Há poucas combinações possíveis, então cada uma é montada uma única vez
+    (o SQL base faz parte da chave, para acompanhar recargas do registro).
+    """
+    consulta = base
+    if predicados:
+        consulta += "\nWHERE " + "\n  AND ".join(PREDICADOS_LISTAGEM[nome] for nome in predicados)
+    consulta += "\nORDER BY pac.codigo"
+    if paginada:
+        consulta += "\nLIMIT :limit"
+    return text(f"SELECT {', '.join(colunas)}\nFROM (\n{consulta}\n) AS pacientes\nORDER BY codigo")
+
+def _parametros_filtro(filtro: Optional[FiltroPacientes], after_codigo: Optional[int] = None) -> Dict[str, Any]:
+    """Parâmetros dos predicados ativos; as chaves escolhem os predicados da consulta."""
+    filtro = filtro or FiltroPacientes()
+    params: Dict[str, Any] = {
+        "after_codigo": after_codigo,
+        "especialidade_atual": filtro.especialidade_atual,
+        "sexo": filtro.sexo,
+        "data_admissao_inicio": filtro.data_admissao_inicio,
+        # O fim do intervalo é inclusivo; comparamos com o início do dia seguinte
+        "data_admissao_fim": filtro.data_admissao_fim + timedelta(days=1) if filtro.data_admissao_fim else None,
+    }
+    return {nome: valor for nome, valor in params.items() if valor is not None}
 
 class PacientePostgresProvider(PacienteProviderInterface):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def listar_pacientes(self) -> List[Dict[str, Any]]:
-        query_string = get_sql_query("paciente/listar_pacientes.sql")
-        query = text(query_string)
-        
-        result = await self.session.execute(query)
+    async def listar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        after_codigo: Optional[int] = None,
+        limit: int = 100,
+        campos: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        colunas = normalizar_campos(campos, COLUNAS_LISTAGEM)
+        params = _parametros_filtro(filtro, after_codigo)
+        query = _montar_listagem(sql_registry.sql("paciente/listar_pacientes"), tuple(params), tuple(colunas))
+
+        result = await self.session.execute(query, {**params, "limit": limit})
         pacientes = result.mappings().all()
         return [dict(paciente) for paciente in pacientes]
 
+    async def iterar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        campos: Optional[Sequence[str]] = None,
+        tamanho_lote: int = 5000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        colunas = normalizar_campos(campos, COLUNAS_LISTAGEM)
+        params = _parametros_filtro(filtro)
+        query = _montar_listagem(sql_registry.sql("paciente/listar_pacientes"), tuple(params), tuple(colunas), paginada=False)
+
+        # Cursor do lado do servidor: o asyncpg busca `tamanho_lote` linhas por vez
+        result = await self.session.stream(query, params, execution_options={"yield_per": tamanho_lote})
+        try:
+            async for lote in result.mappings().partitions(tamanho_lote):
+                yield [dict(paciente) for paciente in lote]
+        finally:
+            await result.close()
+
     async def obter_paciente_por_codigo(self, codigo: int) -> Dict[str, Any]:
-        query_string = get_sql_query("paciente/obter_paciente.sql")
-        query = text(query_string)
+        query, params = sql_registry.prepare("paciente/obter_paciente", {"codigo": codigo})
         
-        result = await self.session.execute(query, {"codigo": codigo})
+        result = await self.session.execute(query, params)
         paciente = result.mappings().first()
         
         if not paciente:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paciente não encontrado")
             
         return dict(paciente)
+
+    async def obter_pacientes_por_codigos(self, codigos: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        if not codigos:
+            return {}
+        # = ANY(:codigos) envia um único array: o texto do SQL (e o plano) não muda com a quantidade
+        query, params = sql_registry.prepare("paciente/obter_pacientes", {"codigos": list(codigos)})
+        result = await self.session.execute(query, params)
+        return {paciente["codigo"]: dict(paciente) for paciente in result.mappings()}
+
+    async def buscar_pacientes(self, termo: str, limit: int = 20) -> List[Dict[str, Any]]:
+        palavras = termos_busca(termo)
+        if not palavras:
+            return []
+        # Os índices de docs/SETUP.md ("Busca de pacientes") atendem os dois ramos da
+        # consulta: btree para o prefixo e trigramas (pg_trgm) para o "contém"
+        query, params = sql_registry.prepare("paciente/buscar_pacientes", {
+            "prefixo": palavras[0] + "%",
+            # A palavra mais longa tem os trigramas mais seletivos
+            "contem": "%" + max(palavras, key=len) + "%",
+            # \m = início de palavra: cada termo precisa iniciar alguma palavra do nome
+            "palavras": [r"\m" + palavra for palavra in palavras],
+            "limit": limit,
+            "candidatos": CANDIDATOS_BUSCA,
+        })
+        result = await self.session.execute(query, params)
+        # Um nome que começa pelo prefixo também aparece no ramo "contém"
+        pacientes: Dict[int, Dict[str, Any]] = {}
+        for paciente in result.mappings():
+            pacientes.setdefault(paciente["codigo"], dict(paciente))
+        return list(pacientes.values())[:limit]
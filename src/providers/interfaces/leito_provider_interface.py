@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+class LeitoProviderInterface(ABC):
+    """Interface (contrato) para provedores de dados de leitos."""
+
+    @abstractmethod
+    async def listar_leitos(self, status: Optional[str] = None, tipo: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Deve retornar os leitos, opcionalmente filtrados por status e/ou tipo."""
+        pass
+
+    @abstractmethod
+    async def obter_leito(self, leito_numero: str) -> Dict[str, Any]:
+        """Deve retornar um único leito pelo seu número."""
+        pass
+
+    @abstractmethod
+    async def listar_alteracoes(self, desde: int) -> Dict[str, Any]:
+        """
+        Deve retornar apenas os leitos alterados após a versão `desde`, no
+        formato {"versao", "completo", "leitos", "removidos"}. Com `completo`
+        verdadeiro, `leitos` traz o quadro inteiro e substitui a cópia do cliente.
+        """
+        pass
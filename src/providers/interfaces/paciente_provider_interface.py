@@ -1,15 +1,103 @@
+import re
+import unicodedata
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Dict, Any, AsyncIterator, Optional, Sequence
+from fastapi import HTTPException, status
+
+@dataclass(frozen=True)
+class FiltroPacientes:
+    """Filtros aplicados na própria fonte de dados ao listar pacientes."""
+    especialidade_atual: Optional[str] = None
+    sexo: Optional[str] = None
+    data_admissao_inicio: Optional[date] = None
+    data_admissao_fim: Optional[date] = None
+
+def normalizar_campos(campos: Optional[Sequence[str]], disponiveis: Sequence[str]) -> List[str]:
+    """
+    Valida a projeção pedida contra as colunas disponíveis no provedor.
+    `codigo` é sempre incluído, pois é o cursor da paginação.
+    """
+    if not campos:
+        return list(disponiveis)
+    desconhecidos = [campo for campo in campos if campo not in disponiveis]
+    if desconhecidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos desconhecidos: {', '.join(desconhecidos)}",
+        )
+    return list(dict.fromkeys(["codigo", *campos]))
+
+# Colunas devolvidas pela busca por nome (typeahead)
+COLUNAS_BUSCA = ("codigo", "nome", "dt_nascimento", "sexo", "cor", "nome_mae")
+
+PALAVRA_BUSCA = re.compile(r"[a-z0-9]+")
+
+def termos_busca(texto: str) -> List[str]:
+    """
+    Normaliza o texto da busca por nome como os provedores normalizam os nomes:
+    sem acentos, em minúsculas e dividido em palavras (letras e dígitos).
+    """
+    if not texto.isascii():
+        texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return PALAVRA_BUSCA.findall(texto.lower())
 
 class PacienteProviderInterface(ABC):
     """Interface (contrato) para provedores de dados de pacientes."""
 
     @abstractmethod
-    async def listar_pacientes(self) -> List[Dict[str, Any]]:
-        """Deve retornar uma lista de pacientes."""
+    async def listar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        after_codigo: Optional[int] = None,
+        limit: int = 100,
+        campos: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Deve retornar uma página de pacientes ordenada por `codigo`.
+
+        A paginação é por chave (keyset): a próxima página é obtida passando o
+        `codigo` do último paciente recebido em `after_codigo`. Quando `campos`
+        é informado, apenas essas colunas (mais `codigo`) são retornadas.
+        """
+        pass
+
+    @abstractmethod
+    def iterar_pacientes(
+        self,
+        filtro: Optional[FiltroPacientes] = None,
+        campos: Optional[Sequence[str]] = None,
+        tamanho_lote: int = 5000,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Deve percorrer todos os pacientes que atendem ao filtro, em ordem de
+        `codigo`, entregando lotes de até `tamanho_lote` linhas sem carregar o
+        resultado inteiro em memória. Implementado como gerador assíncrono.
+        """
         pass
 
     @abstractmethod
     async def obter_paciente_por_codigo(self, codigo: int) -> Dict[str, Any]:
         """Deve retornar um único paciente pelo seu código."""
         pass
+
+    @abstractmethod
+    async def obter_pacientes_por_codigos(self, codigos: Sequence[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Deve retornar, numa única consulta à fonte, os pacientes encontrados
+        indexados por código. Códigos inexistentes apenas ficam de fora do
+        resultado (não geram 404).
+        """
+        pass
+
+    @abstractmethod
+    async def buscar_pacientes(self, termo: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Deve retornar até `limit` pacientes (colunas de COLUNAS_BUSCA) cujo
+        nome tem, para cada palavra de `termo`, uma palavra que começa com ela,
+        sem diferenciar acentos ou maiúsculas. Ordem de relevância para
+        typeahead: primeiro os nomes que começam pela primeira palavra
+        digitada, depois os demais, cada grupo em ordem alfabética.
+        """
+        pass
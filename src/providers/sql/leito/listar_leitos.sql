@@ -0,0 +1,31 @@
+SELECT
+    lto.lto_id AS leito_numero,
+    CASE tml.grupo_mvto_leito
+        WHEN 'O' THEN 'ocupado'
+        WHEN 'L' THEN 'disponivel'
+        WHEN 'BL' THEN 'higienizacao'
+        WHEN 'B' THEN 'desativado'
+        WHEN 'A' THEN 'alta'
+        ELSE 'nao_definido'
+    END AS status,
+    COALESCE(lto.tipo_leito_uti, 'nao_definido') AS tipo,
+    pac.prontuario AS paciente_prontuario,
+    CAST(date_part('year', age(pac.dt_nascimento)) AS integer) AS paciente_idade,
+    esp.nome_especialidade AS paciente_especialidade,
+    NULL::integer AS proximo_prontuario,
+    NULL::varchar AS proximo_especialidade,
+    NULL::varchar AS tipo_reserva,
+    COALESCE(inte.ind_transferencia_pendente = 'S', false) AS sinalizacao_transferencia,
+    CAST(inte.dt_prev_alta AS date) AS previsao_liberacao
+FROM agh.ain_leitos lto
+JOIN agh.ain_tipos_mvto_leito tml
+    ON tml.codigo = lto.tml_codigo
+LEFT JOIN agh.ain_internacoes inte
+    ON inte.lto_lto_id = lto.lto_id
+   AND inte.ind_paciente_internado = 'S'
+LEFT JOIN agh.aip_pacientes pac
+    ON pac.codigo = inte.pac_codigo
+LEFT JOIN agh.agh_especialidades esp
+    ON esp.seq = inte.esp_seq
+WHERE lto.ind_situacao = 'A'
+ORDER BY lto.lto_id
@@ -0,0 +1,19 @@
+SELECT pac.codigo, pac.nome, pac.dt_nascimento, pac.sexo, pac.cor, pac.nome_mae
+FROM (
+    (SELECT pac.codigo, 0 AS prioridade, public.f_unaccent(lower(pac.nome)) AS nome_normalizado
+     FROM agh.aip_pacientes pac
+     WHERE public.f_unaccent(lower(pac.nome)) LIKE :prefixo
+       AND public.f_unaccent(lower(pac.nome)) ~ ALL(:palavras)
+     ORDER BY public.f_unaccent(lower(pac.nome))
+     LIMIT :limit)
+    UNION ALL
+    (SELECT pac.codigo, 1 AS prioridade, public.f_unaccent(lower(pac.nome)) AS nome_normalizado
+     FROM agh.aip_pacientes pac
+     WHERE public.f_unaccent(lower(pac.nome)) LIKE :contem
+       AND public.f_unaccent(lower(pac.nome)) ~ ALL(:palavras)
+     ORDER BY public.f_unaccent(lower(pac.nome))
+     LIMIT :candidatos)
+) AS candidatos
+JOIN agh.aip_pacientes pac
+    ON pac.codigo = candidatos.codigo
+ORDER BY candidatos.prioridade, candidatos.nome_normalizado, pac.codigo;
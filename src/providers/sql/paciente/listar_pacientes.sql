@@ -1,4 +1,20 @@
-SELECT codigo, nome, dt_nascimento
-FROM agh.aip_pacientes
-ORDER BY nome
-LIMIT 100;
\ No newline at end of file
+SELECT
+    pac.codigo,
+    pac.nome,
+    pac.dt_nascimento,
+    pac.sexo,
+    pac.cor,
+    esp.nome_especialidade AS especialidade_atual,
+    CAST(inte.dthr_internacao AS date) AS data_admissao
+FROM agh.aip_pacientes pac
+-- Uma linha por paciente (a paginação é por codigo): só a internação aberta mais recente
+LEFT JOIN LATERAL (
+    SELECT i.dthr_internacao, i.esp_seq
+    FROM agh.ain_internacoes i
+    WHERE i.pac_codigo = pac.codigo
+      AND i.ind_paciente_internado = 'S'
+    ORDER BY i.dthr_internacao DESC
+    LIMIT 1
+) inte ON true
+LEFT JOIN agh.agh_especialidades esp
+    ON esp.seq = inte.esp_seq
@@ -0,0 +1,3 @@
+SELECT codigo, nome, dt_nascimento, sexo, cor, nome_mae, nome_pai
+FROM agh.aip_pacientes
+WHERE codigo = ANY(:codigos);
\ No newline at end of file
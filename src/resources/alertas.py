@@ -0,0 +1,328 @@
+# src/resources/alertas.py
+
+import bisect
+import hashlib
+import heapq
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from string import Formatter
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .quadro_leitos import AlteracaoLeito, QuadroLeitos
+
+# Alert types, most severe first (also the listing order)
+TIPOS_ALERTA = ("critico", "aviso", "info")
+OPERADORES = ("igual", "diferente", "em", "preenchido", "verdadeiro", "vencido")
+
+def _instante(valor: Any) -> Optional[float]:
+    """Epoch seconds for a date (end of that day), datetime or ISO string. Naive values are local time."""
+    if isinstance(valor, str):
+        valor = datetime.fromisoformat(valor) if "T" in valor or " " in valor else date.fromisoformat(valor)
+    if isinstance(valor, datetime):
+        return valor.timestamp()
+    if isinstance(valor, date):
+        return datetime.combine(valor + timedelta(days=1), datetime.min.time()).timestamp()
+    return None
+
+@dataclass(frozen=True)
+class Condicao:
+    """
+    A test on one bed field. `em` takes a list of values. `vencido` holds
+    once the date in the field is more than `valor` hours in the past (a
+    date without time is due at the end of that day); it is the only
+    operator whose result changes without the bed changing.
+    """
+    campo: str
+    operador: str
+    valor: Any = None
+
+    def __post_init__(self):
+        if self.operador not in OPERADORES:
+            raise ValueError(f"Unknown operator '{self.operador}' for field '{self.campo}'")
+        if self.operador == "em":
+            object.__setattr__(self, "valor", frozenset(self.valor))
+
+    def avaliar(self, leito: Dict[str, Any]) -> bool:
+        valor = leito.get(self.campo)
+        if self.operador == "igual":
+            return valor == self.valor
+        if self.operador == "diferente":
+            return valor != self.valor
+        if self.operador == "em":
+            return valor in self.valor
+        if self.operador == "preenchido":
+            return valor is not None and valor != ""
+        return bool(valor)
+
+    def vence_em(self, leito: Dict[str, Any]) -> Optional[float]:
+        """For `vencido`: the instant the condition starts to hold, or None if the field is empty."""
+        instante = _instante(leito.get(self.campo))
+        if instante is None:
+            return None
+        return instante + (self.valor or 0) * 3600
+
+class _CamposMensagem(dict):
+    def __missing__(self, chave: str) -> str:
+        return "-"
+
+@dataclass(frozen=True)
+class RegraAlerta:
+    """
+    Declarative alert rule: the alert is open on a bed while every condition
+    holds. `mensagem` is a format string over the bed fields. An open alert
+    is identified by the rule, the bed and the values shown in the message,
+    so it keeps its id (and its read state) until what it says changes.
+    With `validade_horas`, the alert leaves the list after that time even
+    if the condition still holds, until the condition clears or the message
+    changes.
+    """
+    codigo: str
+    tipo: str
+    titulo: str
+    mensagem: str
+    condicoes: Tuple[Condicao, ...]
+    validade_horas: Optional[float] = None
+    campos_mensagem: Tuple[str, ...] = field(init=False)
+    campos: FrozenSet[str] = field(init=False)
+
+    def __post_init__(self):
+        if self.tipo not in TIPOS_ALERTA:
+            raise ValueError(f"Unknown alert type '{self.tipo}' in rule '{self.codigo}'")
+        object.__setattr__(self, "condicoes", tuple(self.condicoes))
+        campos_mensagem = tuple(sorted({nome for _, nome, _, _ in Formatter().parse(self.mensagem) if nome}))
+        object.__setattr__(self, "campos_mensagem", campos_mensagem)
+        # Fields whose change can open, close or reword the alert
+        object.__setattr__(self, "campos", frozenset(c.campo for c in self.condicoes) | set(campos_mensagem))
+
+    def avaliar(self, leito: Dict[str, Any], agora: float) -> Tuple[bool, Optional[float]]:
+        """
+        Whether the alert holds now and, if it does not yet hold only because
+        of `vencido` conditions, the instant at which it will.
+        """
+        pendente: Optional[float] = None
+        for condicao in self.condicoes:
+            if condicao.operador != "vencido":
+                if not condicao.avaliar(leito):
+                    return False, None
+                continue
+            instante = condicao.vence_em(leito)
+            if instante is None:
+                return False, None
+            if instante > agora:
+                pendente = max(pendente or instante, instante)
+        return pendente is None, pendente
+
+    def formatar(self, leito: Dict[str, Any]) -> str:
+        campos = _CamposMensagem(
+            (nome, valor.strftime("%d/%m/%Y") if isinstance(valor, date) else valor)
+            for nome, valor in leito.items() if valor is not None
+        )
+        return self.mensagem.format_map(campos)
+
+    def ocorrencia(self, leito_numero: str, leito: Dict[str, Any]) -> str:
+        valores = repr(tuple(leito.get(nome) for nome in self.campos_mensagem)).encode()
+        return f"{self.codigo}:{leito_numero}:{hashlib.blake2b(valores, digest_size=4).hexdigest()}"
+
+@dataclass(frozen=True)
+class Alerta:
+    id: str
+    regra: str
+    tipo: str
+    titulo: str
+    mensagem: str
+    leito_numero: str
+    aberto_em: float
+
+def _ordem(alerta: Alerta) -> Tuple[float, str]:
+    # Newest first; the id breaks ties so every alert has a distinct position
+    return (-alerta.aberto_em, alerta.id)
+
+def carregar_regras(caminho: str) -> List[RegraAlerta]:
+    """Reads rules from a JSON list of objects with the RegraAlerta fields."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        definicoes = json.load(arquivo)
+    return [
+        RegraAlerta(
+            codigo=definicao["codigo"],
+            tipo=definicao["tipo"],
+            titulo=definicao["titulo"],
+            mensagem=definicao["mensagem"],
+            condicoes=tuple(Condicao(**condicao) for condicao in definicao["condicoes"]),
+            validade_horas=definicao.get("validade_horas"),
+        )
+        for definicao in definicoes
+    ]
+
+REGRAS_PADRAO = (
+    RegraAlerta(
+        codigo="sinalizacao_transferencia",
+        tipo="critico",
+        titulo="Sinalização de Transferência",
+        mensagem="Leito {leito_numero} marcado para transferência (paciente {paciente_prontuario}).",
+        condicoes=(Condicao("sinalizacao_transferencia", "verdadeiro"),),
+    ),
+    RegraAlerta(
+        codigo="previsao_liberacao_vencida",
+        tipo="aviso",
+        titulo="Previsão de Liberação Vencida",
+        mensagem="Leito {leito_numero}: a previsão de liberação era {previsao_liberacao}.",
+        condicoes=(
+            Condicao("status", "em", ("ocupado", "alta")),
+            Condicao("previsao_liberacao", "vencido"),
+        ),
+    ),
+    RegraAlerta(
+        codigo="alta_com_reserva",
+        tipo="aviso",
+        titulo="Alta Aguardando Liberação",
+        mensagem="Paciente {paciente_prontuario} de alta no leito {leito_numero}, reservado para o paciente {proximo_prontuario}.",
+        condicoes=(
+            Condicao("status", "igual", "alta"),
+            Condicao("proximo_prontuario", "preenchido"),
+        ),
+    ),
+    RegraAlerta(
+        codigo="reserva_pendente",
+        tipo="info",
+        titulo="Leito Reservado",
+        mensagem="Leito {leito_numero} reservado para o paciente {proximo_prontuario} ({proximo_especialidade}, {tipo_reserva}).",
+        condicoes=(Condicao("proximo_prontuario", "preenchido"),),
+        validade_horas=24,
+    ),
+)
+
+class MotorAlertas:
+    """
+    Alert rules evaluated incrementally against the bed board.
+
+    Each rule is indexed by the fields it reads. When a batch of changes
+    arrives, only the rules reading a field that actually changed on a bed
+    are re-evaluated for that bed, so a sync touching a few beds costs a few
+    evaluations no matter how many rules and beds exist. Time-based
+    conditions (`vencido`) and alert validity are scheduled in a heap and
+    re-evaluated when due, on the next read. Open alerts are kept sorted
+    per type as they open and close, so listing never sorts.
+
+    Alerts are deduplicated by (rule, bed): a rule holding on a bed has at
+    most one open alert, kept (same id, same opening time) across syncs.
+    """
+    def __init__(self, quadro: QuadroLeitos, regras: Iterable[RegraAlerta], relogio=time.time):
+        self.quadro = quadro
+        self.relogio = relogio
+        self.regras: Dict[str, RegraAlerta] = {}
+        self._por_campo: Dict[str, List[RegraAlerta]] = {}
+        for regra in regras:
+            if regra.codigo in self.regras:
+                raise ValueError(f"Duplicate alert rule '{regra.codigo}'")
+            self.regras[regra.codigo] = regra
+            for campo in regra.campos:
+                self._por_campo.setdefault(campo, []).append(regra)
+        self.versao = 0
+        self.avaliacoes = 0
+        self._abertos: Dict[Tuple[str, str], Alerta] = {}
+        self._por_id: Dict[str, Alerta] = {}
+        # (rule, bed) -> occurrence id that expired and must not reopen
+        self._expirados: Dict[Tuple[str, str], str] = {}
+        # Heap of (instant, rule, bed) to re-evaluate when time passes; only the
+        # entry matching `_agendados` is live, older ones are skipped when popped
+        self._agenda: List[Tuple[float, str, str]] = []
+        self._agendados: Dict[Tuple[str, str], float] = {}
+        self._por_tipo: Dict[str, List[Alerta]] = {tipo: [] for tipo in TIPOS_ALERTA}
+        self._todos: List[Alerta] = []
+        self._versao_todos = -1
+
+        agora = self.relogio()
+        for leito in quadro.listar():
+            for regra in self.regras.values():
+                self._avaliar(regra, leito["leito_numero"], leito, agora)
+        quadro.assinar(self.aplicar)
+
+    def _agendar(self, chave: Tuple[str, str], instante: float) -> None:
+        if self._agendados.get(chave) != instante:
+            self._agendados[chave] = instante
+            heapq.heappush(self._agenda, (instante, *chave))
+
+    def _fechar(self, chave: Tuple[str, str]) -> None:
+        alerta = self._abertos.pop(chave)
+        del self._por_id[alerta.id]
+        lista = self._por_tipo[alerta.tipo]
+        del lista[bisect.bisect_left(lista, _ordem(alerta), key=_ordem)]
+        self.versao += 1
+
+    def _avaliar(self, regra: RegraAlerta, numero: str, leito: Optional[Dict[str, Any]], agora: float) -> None:
+        self.avaliacoes += 1
+        chave = (regra.codigo, numero)
+        vale, pendente = regra.avaliar(leito, agora) if leito is not None else (False, None)
+        if pendente is not None:
+            self._agendar(chave, pendente)
+        aberto = self._abertos.get(chave)
+        if not vale:
+            self._expirados.pop(chave, None)
+            if aberto is not None:
+                self._fechar(chave)
+            return
+
+        ocorrencia = regra.ocorrencia(numero, leito)
+        if self._expirados.get(chave) == ocorrencia:
+            return
+        if aberto is not None and aberto.id == ocorrencia:
+            if regra.validade_horas is not None and agora >= aberto.aberto_em + regra.validade_horas * 3600:
+                self._fechar(chave)
+                self._expirados[chave] = ocorrencia
+            return
+
+        self._expirados.pop(chave, None)
+        if aberto is not None:
+            self._fechar(chave)
+        alerta = Alerta(ocorrencia, regra.codigo, regra.tipo, regra.titulo, regra.formatar(leito), numero, agora)
+        self._abertos[chave] = alerta
+        self._por_id[alerta.id] = alerta
+        bisect.insort(self._por_tipo[alerta.tipo], alerta, key=_ordem)
+        self.versao += 1
+        if regra.validade_horas is not None:
+            self._agendar(chave, agora + regra.validade_horas * 3600)
+
+    def aplicar(self, alteracoes: List[AlteracaoLeito]) -> None:
+        """QuadroLeitos listener: re-evaluates the rules reading the fields that changed."""
+        agora = self.relogio()
+        for alteracao in alteracoes:
+            anterior, atual = alteracao.anterior, alteracao.atual
+            if anterior is None or atual is None:
+                regras = self.regras.values()
+            else:
+                regras = {
+                    regra.codigo: regra
+                    for campo in anterior.keys() | atual.keys()
+                    if anterior.get(campo) != atual.get(campo)
+                    for regra in self._por_campo.get(campo, ())
+                }.values()
+            for regra in regras:
+                self._avaliar(regra, alteracao.leito_numero, atual, agora)
+
+    def vencer(self, agora: Optional[float] = None) -> None:
+        """Re-evaluates the scheduled (rule, bed) pairs whose instant has passed."""
+        agora = agora if agora is not None else self.relogio()
+        vencidos = set()
+        while self._agenda and self._agenda[0][0] <= agora:
+            instante, codigo, numero = heapq.heappop(self._agenda)
+            if self._agendados.get((codigo, numero)) == instante:
+                del self._agendados[(codigo, numero)]
+                vencidos.add((codigo, numero))
+        for codigo, numero in vencidos:
+            self._avaliar(self.regras[codigo], numero, self.quadro.obter(numero), agora)
+
+    def listar(self, tipo: Optional[str] = None) -> List[Alerta]:
+        """Open alerts, most severe first and newest first within a type."""
+        self.vencer()
+        if tipo is not None:
+            return self._por_tipo[tipo]
+        if self._versao_todos != self.versao:
+            self._todos = [alerta for tipo in TIPOS_ALERTA for alerta in self._por_tipo[tipo]]
+            self._versao_todos = self.versao
+        return self._todos
+
+    def obter(self, alerta_id: str) -> Optional[Alerta]:
+        self.vencer()
+        return self._por_id.get(alerta_id)
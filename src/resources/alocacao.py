@@ -0,0 +1,361 @@
+# src/resources/alocacao.py
+
+import bisect
+import heapq
+from dataclasses import dataclass, field, replace
+from datetime import date
+from operator import attrgetter
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from .quadro_leitos import AlteracaoLeito, QuadroLeitos
+
+# Bed types a request can ask for; a "nao_definido" bed serves any of them
+TIPOS_LEITO = ("cirurgico", "hem", "obstetrico", "outro")
+TIPO_GENERICO = "nao_definido"
+# Hours of waiting each urgency is worth: an elective request that has waited
+# 24 h ranks with an emergency arriving now
+ANTECEDENCIA_HORAS = {"emergencia": 24.0, "urgencia": 12.0, "eletiva": 0.0}
+STATUS_OCUPADOS = ("ocupado", "alta")
+
+_prioridade = attrgetter("prioridade")
+
+@dataclass(frozen=True)
+class SolicitacaoLeito:
+    id: int
+    prontuario: int
+    especialidade: str
+    tipo: str
+    urgencia: str
+    criada_em: float
+    idade: Optional[int] = None
+    solicitante: Optional[str] = None
+    # Lower ranks first. Fixed at creation: waiting time is accounted for by
+    # ordering on the creation instant, so the heap never needs re-keying
+    prioridade: Tuple[float, int] = field(default=(0.0, 0), compare=False)
+
+def _prontuario_reservado(leito: Dict[str, Any]) -> bool:
+    return leito.get("proximo_prontuario") is not None
+
+class AlocadorLeitos:
+    """
+    Suggests a bed for each pending bed request, kept up to date as beds
+    and requests change.
+
+    Requests rank by creation time minus the advance given by their urgency
+    (ANTECEDENCIA_HORAS) and specialty, so long waits eventually outrank
+    higher urgencies. Unassigned requests wait in one heap per bed type.
+    Free beds (status "disponivel", no reservation) are indexed by type, and
+    occupied beds with a `previsao_liberacao` by type and release date.
+
+    The suggestions follow a greedy rule kept incrementally: a request gets a
+    free bed of its type, else a generic one; a request that arrives with no
+    free bed takes the bed of the lowest-ranked request holding a compatible
+    one, if it outranks it, and the displaced request is placed again. A bed
+    that frees up goes to the best waiting compatible request. Each event
+    costs O(log n) heap operations instead of re-matching every request.
+    Requests without a free bed are shown the beds expected to free up
+    first, in rank order.
+    """
+    def __init__(
+        self,
+        quadro: QuadroLeitos,
+        antecedencia_horas: Mapping[str, float] = ANTECEDENCIA_HORAS,
+        antecedencia_especialidade: Optional[Mapping[str, float]] = None,
+    ):
+        self.quadro = quadro
+        self.antecedencia_horas = dict(antecedencia_horas)
+        self.antecedencia_especialidade = dict(antecedencia_especialidade or {})
+        self.versao = 0
+        self._pendentes: Dict[int, SolicitacaoLeito] = {}
+        # Pending requests in rank order, kept sorted as they come and go
+        self._ordem: List[SolicitacaoLeito] = []
+        # Unassigned requests per requested type: heap of (prioridade, id), lazily cleaned
+        self._filas: Dict[str, List[Tuple[Tuple[float, int], int]]] = {tipo: [] for tipo in TIPOS_LEITO}
+        # Free, unassigned beds per bed type, plus a heap of their numbers
+        # (lowest first) that may hold stale entries, skipped when popped
+        self._livres: Dict[str, Set[str]] = {}
+        self._fila_livres: Dict[str, List[str]] = {}
+        # request id <-> suggested free bed
+        self._atribuicoes: Dict[int, str] = {}
+        self._ocupantes: Dict[str, int] = {}
+        # Assigned requests per bed type, lowest ranked on top: heap of (negated prioridade, id)
+        self._atribuidas: Dict[str, List[Tuple[Tuple[float, int], int]]] = {}
+        # Requests of each type sitting on generic beds, moved when a bed of their
+        # type frees: heap of (prioridade, id), lazily cleaned
+        self._em_genericos: Dict[str, List[Tuple[Tuple[float, int], int]]] = {tipo: [] for tipo in TIPOS_LEITO}
+        # Occupied beds expected to free up, per bed type: sorted (previsao_liberacao, leito_numero)
+        self._previsoes: Dict[str, List[Tuple[date, str]]] = {}
+        # Bed -> (tipo, free?, previsao) as last indexed
+        self._indexados: Dict[str, Tuple[str, bool, Optional[date]]] = {}
+        # Beds handed to a request here, held until the board reflects the change
+        self._retidos: Set[str] = set()
+        self._listagem: List[Dict[str, Any]] = []
+        self._versao_listagem = -1
+
+        for leito in quadro.listar():
+            self._indexar(leito["leito_numero"], leito)
+        quadro.assinar(self.aplicar)
+
+    # --- Ranking -------------------------------------------------------
+
+    def prioridade(self, criada_em: float, urgencia: str, especialidade: str, id: int) -> Tuple[float, int]:
+        antecedencia = self.antecedencia_horas.get(urgencia, 0.0) + self.antecedencia_especialidade.get(especialidade, 0.0)
+        return (criada_em - antecedencia * 3600, id)
+
+    @staticmethod
+    def _compativeis(tipo_solicitado: str) -> Tuple[str, str]:
+        return (tipo_solicitado, TIPO_GENERICO)
+
+    # --- Bed index -----------------------------------------------------
+
+    def _classificar(self, numero: str, leito: Optional[Dict[str, Any]]) -> Optional[Tuple[str, bool, Optional[date]]]:
+        if leito is None or numero in self._retidos:
+            return None
+        if _prontuario_reservado(leito):
+            return None
+        tipo = leito.get("tipo") or TIPO_GENERICO
+        if leito.get("status") == "disponivel":
+            return (tipo, True, None)
+        previsao = leito.get("previsao_liberacao")
+        if leito.get("status") in STATUS_OCUPADOS and isinstance(previsao, date):
+            return (tipo, False, previsao)
+        return None
+
+    def _indexar(self, numero: str, leito: Optional[Dict[str, Any]]) -> None:
+        antes = self._indexados.get(numero)
+        depois = self._classificar(numero, leito)
+        if antes == depois:
+            return
+        self.versao += 1
+        if antes is not None:
+            del self._indexados[numero]
+            tipo, livre, previsao = antes
+            if livre:
+                self._retirar_leito_livre(numero, tipo)
+            else:
+                previsoes = self._previsoes[tipo]
+                del previsoes[bisect.bisect_left(previsoes, (previsao, numero))]
+        if depois is not None:
+            self._indexados[numero] = depois
+            tipo, livre, previsao = depois
+            if livre:
+                self._oferecer_leito(numero, tipo)
+            else:
+                bisect.insort(self._previsoes.setdefault(tipo, []), (previsao, numero))
+
+    def aplicar(self, alteracoes: List[AlteracaoLeito]) -> None:
+        """QuadroLeitos listener: re-indexes the changed beds and updates the suggestions."""
+        for alteracao in alteracoes:
+            # Any change from the source supersedes a local hold
+            self._retidos.discard(alteracao.leito_numero)
+            self._indexar(alteracao.leito_numero, alteracao.atual)
+
+    # --- Matching ------------------------------------------------------
+
+    def _atribuir(self, solicitacao: SolicitacaoLeito, numero: str, tipo_leito: str) -> None:
+        self._atribuicoes[solicitacao.id] = numero
+        self._ocupantes[numero] = solicitacao.id
+        chave = solicitacao.prioridade
+        heapq.heappush(self._atribuidas.setdefault(tipo_leito, []), ((-chave[0], -chave[1]), solicitacao.id))
+        if tipo_leito == TIPO_GENERICO:
+            heapq.heappush(self._em_genericos[solicitacao.tipo], (chave, solicitacao.id))
+
+    def _desatribuir(self, id: int) -> str:
+        numero = self._atribuicoes.pop(id)
+        del self._ocupantes[numero]
+        return numero
+
+    def _tipo_do_leito(self, numero: str) -> str:
+        return self._indexados[numero][0]
+
+    def _pior_atribuida(self, tipo_leito: str) -> Optional[SolicitacaoLeito]:
+        heap = self._atribuidas.get(tipo_leito)
+        while heap:
+            id = heap[0][1]
+            numero = self._atribuicoes.get(id)
+            if numero is not None and self._tipo_do_leito(numero) == tipo_leito:
+                return self._pendentes[id]
+            heapq.heappop(heap)
+        return None
+
+    def _melhor_em_generico(self, tipo: str) -> Optional[SolicitacaoLeito]:
+        heap = self._em_genericos[tipo]
+        while heap:
+            id = heap[0][1]
+            numero = self._atribuicoes.get(id)
+            if numero is not None and self._tipo_do_leito(numero) == TIPO_GENERICO:
+                return self._pendentes[id]
+            heapq.heappop(heap)
+        return None
+
+    def _guardar_livre(self, numero: str, tipo_leito: str) -> None:
+        self._livres.setdefault(tipo_leito, set()).add(numero)
+        heapq.heappush(self._fila_livres.setdefault(tipo_leito, []), numero)
+
+    def _tomar_livre(self, tipo_leito: str) -> Optional[str]:
+        """Takes the lowest-numbered free bed of a type, if any."""
+        livres = self._livres.get(tipo_leito)
+        while livres:
+            numero = heapq.heappop(self._fila_livres[tipo_leito])
+            if numero in livres:
+                livres.discard(numero)
+                return numero
+        return None
+
+    def _melhor_na_fila(self, tipo: str) -> Optional[SolicitacaoLeito]:
+        fila = self._filas[tipo]
+        while fila:
+            id = fila[0][1]
+            if id in self._pendentes and id not in self._atribuicoes:
+                return self._pendentes[id]
+            heapq.heappop(fila)
+        return None
+
+    def _posicionar(self, solicitacao: SolicitacaoLeito) -> None:
+        """Finds a bed for an unassigned request, displacing lower-ranked ones as needed."""
+        while solicitacao is not None:
+            proxima = None
+            for tipo_leito in self._compativeis(solicitacao.tipo):
+                numero = self._tomar_livre(tipo_leito)
+                if numero is not None:
+                    self._atribuir(solicitacao, numero, tipo_leito)
+                    return
+            candidatas = [s for s in map(self._pior_atribuida, self._compativeis(solicitacao.tipo)) if s is not None]
+            pior = max(candidatas, key=lambda s: s.prioridade, default=None)
+            if pior is not None and pior.prioridade > solicitacao.prioridade:
+                numero = self._desatribuir(pior.id)
+                self._atribuir(solicitacao, numero, self._tipo_do_leito(numero))
+                proxima = pior
+            else:
+                heapq.heappush(self._filas[solicitacao.tipo], (solicitacao.prioridade, solicitacao.id))
+            solicitacao = proxima
+
+    def _oferecer_leito(self, numero: str, tipo_leito: str) -> None:
+        """Gives a bed that just became free to the best waiting compatible request."""
+        if tipo_leito == TIPO_GENERICO:
+            candidatas = [s for s in map(self._melhor_na_fila, TIPOS_LEITO) if s is not None]
+            melhor = min(candidatas, key=lambda s: s.prioridade, default=None)
+        else:
+            melhor = self._melhor_na_fila(tipo_leito) if tipo_leito in self._filas else None
+            movida = self._melhor_em_generico(tipo_leito) if melhor is None and tipo_leito in self._filas else None
+            if movida is not None:
+                # Move a request of this type off a generic bed and offer that one instead
+                generico = self._desatribuir(movida.id)
+                self._atribuir(movida, numero, tipo_leito)
+                self._oferecer_leito(generico, TIPO_GENERICO)
+                return
+        if melhor is None:
+            self._guardar_livre(numero, tipo_leito)
+        else:
+            self._atribuir(melhor, numero, tipo_leito)
+
+    def _retirar_leito_livre(self, numero: str, tipo_leito: str) -> None:
+        id = self._ocupantes.get(numero)
+        if id is None:
+            livres = self._livres[tipo_leito]
+            livres.discard(numero)
+            fila = self._fila_livres[tipo_leito]
+            if len(fila) > 2 * len(livres) + 64:
+                # Drop the stale entries once they outnumber the live ones
+                fila[:] = livres
+                heapq.heapify(fila)
+            return
+        self._desatribuir(id)
+        self._posicionar(self._pendentes[id])
+
+    # --- Requests ------------------------------------------------------
+
+    def adicionar(self, solicitacao: SolicitacaoLeito) -> SolicitacaoLeito:
+        if solicitacao.tipo not in TIPOS_LEITO:
+            raise ValueError(f"Unknown bed type '{solicitacao.tipo}'")
+        chave = self.prioridade(solicitacao.criada_em, solicitacao.urgencia, solicitacao.especialidade, solicitacao.id)
+        solicitacao = replace(solicitacao, prioridade=chave)
+        self.remover(solicitacao.id)
+        self._pendentes[solicitacao.id] = solicitacao
+        bisect.insort(self._ordem, solicitacao, key=_prioridade)
+        self.versao += 1
+        self._posicionar(solicitacao)
+        return solicitacao
+
+    def remover(self, id: int) -> Optional[SolicitacaoLeito]:
+        """Drops a pending request (fulfilled or cancelled); its bed goes to the next in line."""
+        solicitacao = self._pendentes.get(id)
+        if solicitacao is None:
+            return None
+        self.versao += 1
+        del self._ordem[bisect.bisect_left(self._ordem, solicitacao.prioridade, key=_prioridade)]
+        if id in self._atribuicoes:
+            numero = self._desatribuir(id)
+            del self._pendentes[id]
+            self._oferecer_leito(numero, self._tipo_do_leito(numero))
+        else:
+            del self._pendentes[id]
+        return solicitacao
+
+    def atender(self, id: int, numero: str) -> Optional[SolicitacaoLeito]:
+        """
+        Removes a request that was given bed `numero`. The bed is held out of
+        the suggestions until its next change arrives from the source.
+        """
+        solicitacao = self.remover(id)
+        if solicitacao is not None:
+            self._retidos.add(numero)
+            self._indexar(numero, self.quadro.obter(numero))
+        return solicitacao
+
+    def liberar(self, numero: str) -> None:
+        """Releases a bed held by `atender` whose reservation did not go through."""
+        if numero in self._retidos:
+            self._retidos.discard(numero)
+            self._indexar(numero, self.quadro.obter(numero))
+
+    def pendente(self, id: int) -> Optional[SolicitacaoLeito]:
+        return self._pendentes.get(id)
+
+    def leito_sugerido(self, id: int) -> Optional[str]:
+        return self._atribuicoes.get(id)
+
+    def leito_livre(self, numero: str, tipo: str) -> bool:
+        """Whether bed `numero` is free and can serve a request of `tipo`."""
+        indexado = self._indexados.get(numero)
+        return indexado is not None and indexado[1] and indexado[0] in self._compativeis(tipo)
+
+    # --- Reading -------------------------------------------------------
+
+    def listar(self) -> List[Dict[str, Any]]:
+        """
+        Pending requests in rank order with their suggestion: the free bed
+        assigned to them or, if none, the bed expected to free up first among
+        those not promised to a better-ranked request.
+        """
+        if self._versao_listagem == self.versao:
+            return self._listagem
+        usados: Dict[str, int] = {}
+        listagem = []
+        for posicao, solicitacao in enumerate(self._ordem, 1):
+            numero = self._atribuicoes.get(solicitacao.id)
+            previsao = None
+            if numero is None:
+                proximo = None
+                for tipo_leito in self._compativeis(solicitacao.tipo):
+                    previsoes = self._previsoes.get(tipo_leito, ())
+                    if usados.get(tipo_leito, 0) < len(previsoes):
+                        candidato = previsoes[usados.get(tipo_leito, 0)]
+                        if proximo is None or candidato < proximo[0]:
+                            proximo = (candidato, tipo_leito)
+                if proximo is not None:
+                    (previsao, numero), tipo_leito = proximo
+                    usados[tipo_leito] = usados.get(tipo_leito, 0) + 1
+            listagem.append({
+                "solicitacao": solicitacao,
+                "posicao": posicao,
+                "leito_numero": numero,
+                "leito_disponivel": previsao is None and numero is not None,
+                "previsao_liberacao": previsao,
+            })
+        self._listagem, self._versao_listagem = listagem, self.versao
+        return listagem
+
+    def leitos_livres(self) -> List[str]:
+        """Free beds no pending request can use."""
+        return [numero for tipo in sorted(self._livres) for numero in sorted(self._livres[tipo])]
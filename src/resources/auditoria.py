@@ -0,0 +1,127 @@
+# src/resources/auditoria.py
+
+import asyncio
+import logging
+import os
+import unicodedata
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.historico import RegistroHistorico
+from .write_queue import WriteQueue
+
+logger = logging.getLogger(__name__)
+
+def normalizar_busca(texto: str) -> str:
+    """Lowercase, accent-free text, as stored in `historico.busca` and searched."""
+    if not texto.isascii():
+        texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return " ".join(texto.lower().split())
+
+class Auditoria:
+    """
+    Append-only audit log (`historico` table): entries are buffered in memory
+    and written in batches by a background task, off the request path.
+    """
+    def __init__(self, lote: int = 500, intervalo: float = 1.0, max_pendentes: int = 50_000):
+        self.lote = lote
+        self.intervalo = intervalo
+        self.max_pendentes = max_pendentes
+        self._pendentes: Deque[Dict[str, Any]] = deque()
+        self._cheio: Optional[asyncio.Event] = None
+        self.registrados = 0
+        self.gravados = 0
+        self.descartados = 0
+        self.falhas = 0
+
+    def registrar(
+        self,
+        usuario: str,
+        tipo: str,
+        acao: str,
+        entidade: str,
+        detalhes: Optional[str] = None,
+    ) -> None:
+        """Buffers one entry, timestamped now. Never blocks or touches the database."""
+        if len(self._pendentes) >= self.max_pendentes:
+            self._pendentes.popleft()
+            self.descartados += 1
+        self._pendentes.append({
+            # Stored as naive UTC, like the other DateTime columns
+            "criado_em": datetime.now(timezone.utc).replace(tzinfo=None),
+            "usuario": usuario,
+            "tipo": tipo,
+            "acao": acao,
+            "entidade": entidade,
+            "detalhes": detalhes,
+            "busca": normalizar_busca(f"{usuario} {acao} {entidade} {detalhes or ''}"),
+        })
+        self.registrados += 1
+        if len(self._pendentes) >= self.lote and self._cheio is not None:
+            self._cheio.set()
+
+    async def descarregar(self, writer: WriteQueue) -> int:
+        """Writes every buffered entry, `lote` rows per INSERT. Returns the rows written."""
+        gravados = 0
+        while self._pendentes:
+            linhas: List[Dict[str, Any]] = [
+                self._pendentes.popleft() for _ in range(min(self.lote, len(self._pendentes)))
+            ]
+
+            async def gravar(session: AsyncSession) -> None:
+                await session.execute(insert(RegistroHistorico), linhas)
+
+            try:
+                # Shielded: if the flush is cancelled mid-write the batch still
+                # commits, so it must not go back to the buffer
+                await asyncio.shield(writer.run(gravar))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Back to the front of the buffer, in order, for the next flush
+                self.falhas += 1
+                excesso = len(self._pendentes) + len(linhas) - self.max_pendentes
+                if excesso > 0:
+                    self.descartados += excesso
+                    linhas = linhas[excesso:]
+                self._pendentes.extendleft(reversed(linhas))
+                raise
+            gravados += len(linhas)
+        self.gravados += gravados
+        return gravados
+
+    async def gravar_periodicamente(self, writer: WriteQueue) -> None:
+        """Background loop: flushes every `intervalo` seconds, or early when a full batch is pending."""
+        self._cheio = asyncio.Event()
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._cheio.wait(), timeout=self.intervalo)
+                except asyncio.TimeoutError:
+                    pass
+                self._cheio.clear()
+                await self.descarregar(writer)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Failed to write audit log entries")
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pendentes),
+            "logged": self.registrados,
+            "written": self.gravados,
+            "dropped": self.descartados,
+            "failed_flushes": self.falhas,
+        }
+
+# Instância única usada por toda a aplicação
+auditoria = Auditoria(
+    lote=int(os.getenv("AUDITORIA_LOTE", 500)),
+    intervalo=float(os.getenv("AUDITORIA_INTERVALO_MS", 1000)) / 1000,
+    max_pendentes=int(os.getenv("AUDITORIA_MAX_PENDENTES", 50_000)),
+)
@@ -0,0 +1,75 @@
+# src/resources/broadcaster.py
+
+import asyncio
+import itertools
+import json
+import os
+from typing import Any, Optional, Set
+
+class Assinatura:
+    """
+    A single connected client: a bounded queue of already-serialized frames.
+    When the queue overflows the subscription is dropped instead of letting
+    a slow consumer hold events (and memory) for everybody else.
+    """
+    def __init__(self, tamanho_fila: int):
+        self.fila: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=tamanho_fila)
+        self.descartada = False
+
+    def entregar(self, frame: str) -> bool:
+        try:
+            self.fila.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def descartar(self) -> None:
+        # Throws away pending frames and leaves a sentinel that ends the stream
+        self.descartada = True
+        while not self.fila.empty():
+            self.fila.get_nowait()
+        self.fila.put_nowait(None)
+
+class Broadcaster:
+    """
+    In-process fan-out of change events to Server-Sent Events clients.
+
+    Each event is serialized once into an SSE frame and the same string is
+    pushed to every subscriber queue, so the cost of an upstream change does
+    not depend on how many screens are connected.
+    """
+    def __init__(self, tamanho_fila: int = 100):
+        self.tamanho_fila = tamanho_fila
+        self._assinaturas: Set[Assinatura] = set()
+        self._ids = itertools.count(1)
+        self.publicados = 0
+        self.descartados = 0
+
+    @property
+    def conectados(self) -> int:
+        return len(self._assinaturas)
+
+    def assinar(self) -> Assinatura:
+        assinatura = Assinatura(self.tamanho_fila)
+        self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura) -> None:
+        self._assinaturas.discard(assinatura)
+
+    def publicar(self, evento: str, dados: Any) -> None:
+        """
+        Sends an event to every subscriber. Must be called from the event loop thread.
+        """
+        if not self._assinaturas:
+            return
+        frame = f"id: {next(self._ids)}\nevent: {evento}\ndata: {json.dumps(dados, default=str)}\n\n"
+        self.publicados += 1
+        for assinatura in list(self._assinaturas):
+            if not assinatura.entregar(frame):
+                self.descartados += 1
+                self.cancelar(assinatura)
+                assinatura.descartar()
+
+# Instância única usada por toda a aplicação
+broadcaster = Broadcaster(tamanho_fila=int(os.getenv("EVENTOS_FILA_MAX", 100)))
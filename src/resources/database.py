@@ -1,23 +1,243 @@
 # src/resources/database.py
 
-from typing import AsyncGenerator
+import os
+import time
+from typing import Any, AsyncGenerator, Dict, Optional
 from fastapi import Request
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncEngine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from .write_queue import WriteQueue
 
 # Base para os modelos do banco de dados da aplicação (SQLite)
 Base = declarative_base()
 
+class _TimedQueue(AsyncAdaptedQueue):
+    """
+    Pool queue that records how long blocking gets wait for a connection to
+    be returned (the pool only blocks once it is at size + max_overflow).
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        if not block:
+            return super().get(block, timeout)
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        finally:
+            waited = time.perf_counter() - started
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long callers wait to check out a connection.
+
+    Time spent waiting in the queue for a busy pool and time spent opening
+    new connections are measured separately, and only pool exhaustion
+    (sqlalchemy.exc.TimeoutError) counts as a checkout timeout; connection
+    errors (refused, authentication) propagate without being counted.
+    """
+    _queue_class = _TimedQueue
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.total_connect = 0.0
+        self.max_connect = 0.0
+
+    @property
+    def total_wait(self) -> float:
+        return self._pool.total_wait
+
+    @property
+    def max_wait(self) -> float:
+        return self._pool.max_wait
+
+    def connect(self):
+        self.checkouts += 1
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        try:
+            return super()._create_connection()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.connects += 1
+            self.total_connect += elapsed
+            self.max_connect = max(self.max_connect, elapsed)
+
+    def recreate(self):
+        # Keeps the counters when the engine recreates the pool (e.g. on dispose)
+        pool = super().recreate()
+        pool.checkouts, pool.checkout_timeouts = self.checkouts, self.checkout_timeouts
+        pool.connects, pool.total_connect, pool.max_connect = self.connects, self.total_connect, self.max_connect
+        pool._pool.total_wait, pool._pool.max_wait = self.total_wait, self.max_wait
+        return pool
+
+def _env(prefix: str, name: str, cast=str, default=None):
+    value = os.getenv(f"{prefix}_{name}")
+    if value is None or value == "":
+        return default
+    if cast is bool:
+        return value.lower() in ("1", "true", "yes")
+    return cast(value)
+
+def pool_options(dsn: str, env_prefix: str) -> Dict[str, Any]:
+    """
+    Builds create_async_engine keyword arguments from <PREFIX>_* environment
+    variables. Unset variables keep SQLAlchemy's defaults.
+
+    - <PREFIX>_POOL_SIZE, <PREFIX>_MAX_OVERFLOW, <PREFIX>_POOL_TIMEOUT (s)
+    - <PREFIX>_POOL_RECYCLE (s), <PREFIX>_POOL_PRE_PING (true/false)
+    - <PREFIX>_STATEMENT_TIMEOUT_MS and <PREFIX>_STATEMENT_CACHE_SIZE (asyncpg only)
+    """
+    url = make_url(dsn)
+    options: Dict[str, Any] = {}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single static connection; there is no pool to size
+        return options
+
+    options["poolclass"] = InstrumentedQueuePool
+    for option, name, cast in (
+        ("pool_size", "POOL_SIZE", int),
+        ("max_overflow", "MAX_OVERFLOW", int),
+        ("pool_timeout", "POOL_TIMEOUT", float),
+        ("pool_recycle", "POOL_RECYCLE", int),
+        ("pool_pre_ping", "POOL_PRE_PING", bool),
+    ):
+        value = _env(env_prefix, name, cast)
+        if value is not None:
+            options[option] = value
+
+    if url.get_driver_name() == "asyncpg":
+        connect_args: Dict[str, Any] = {}
+        statement_timeout = _env(env_prefix, "STATEMENT_TIMEOUT_MS", int)
+        if statement_timeout is not None:
+            connect_args["server_settings"] = {"statement_timeout": str(statement_timeout)}
+        statement_cache_size = _env(env_prefix, "STATEMENT_CACHE_SIZE", int)
+        if statement_cache_size is not None:
+            connect_args["prepared_statement_cache_size"] = statement_cache_size
+        if connect_args:
+            options["connect_args"] = connect_args
+    return options
+
+def sqlite_pragmas(env_prefix: str) -> Dict[str, Any]:
+    """
+    PRAGMAs applied to every new SQLite connection, overridable through
+    <PREFIX>_JOURNAL_MODE, _SYNCHRONOUS, _BUSY_TIMEOUT_MS, _MMAP_SIZE and
+    _CACHE_SIZE. WAL lets readers proceed while a write is in progress, and
+    synchronous=NORMAL only fsyncs at checkpoints (still safe in WAL mode).
+    """
+    return {
+        "journal_mode": _env(env_prefix, "JOURNAL_MODE", str, "WAL"),
+        "synchronous": _env(env_prefix, "SYNCHRONOUS", str, "NORMAL"),
+        "busy_timeout": _env(env_prefix, "BUSY_TIMEOUT_MS", int, 5000),
+        "mmap_size": _env(env_prefix, "MMAP_SIZE", int, 256 * 1024 * 1024),
+        # Negative values are KiB: -65536 = 64 MiB of page cache per connection
+        "cache_size": _env(env_prefix, "CACHE_SIZE", int, -65536),
+        "foreign_keys": "ON",
+    }
+
+def configure_sqlite(engine: AsyncEngine, pragmas: Dict[str, Any]) -> None:
+    """
+    Applies `pragmas` on connect and lets SQLAlchemy, not the sqlite3 module,
+    emit BEGIN, so SAVEPOINTs work (required by WriteQueue). Connections with
+    the `sqlite_immediate` execution option start with BEGIN IMMEDIATE, taking
+    the write lock up front instead of failing with "database is locked" when
+    a read transaction later tries to write.
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if conn.get_execution_options().get("sqlite_immediate") else "BEGIN")
+
 class DatabaseManager:
     """
     Manages asynchronous database connections and sessions for a specific DSN.
+
+    Pool settings are read from environment variables named after `env_prefix`
+    (see pool_options), e.g. POSTGRES_POOL_SIZE for the AGHU database.
+
+    For file-based SQLite the connection profile from sqlite_pragmas is applied
+    (disable with <PREFIX>_TUNING=false). `writer` funnels writes through a
+    single in-process queue that batches commits.
     """
-    def __init__(self, dsn: str):
-        self.engine: AsyncEngine = create_async_engine(dsn, echo=False) # Set echo=False to reduce log verbosity
+    def __init__(self, dsn: str, env_prefix: str = "DB"):
+        self.env_prefix = env_prefix
+        self.engine: AsyncEngine = create_async_engine(
+            dsn,
+            echo=False, # Set echo=False to reduce log verbosity
+            **pool_options(dsn, env_prefix),
+        )
         self.async_session_maker = sessionmaker(
             self.engine, class_=AsyncSession, expire_on_commit=False
         )
+        url = make_url(dsn)
+        writer_bind = self.engine
+        if (
+            url.get_backend_name() == "sqlite"
+            and url.database not in (None, "", ":memory:")
+            and _env(env_prefix, "TUNING", bool, True)
+        ):
+            configure_sqlite(self.engine, sqlite_pragmas(env_prefix))
+            writer_bind = self.engine.execution_options(sqlite_immediate=True)
+        self.writer = WriteQueue(
+            sessionmaker(writer_bind, class_=AsyncSession, expire_on_commit=False),
+            max_batch=_env(env_prefix, "WRITE_BATCH", int, 64),
+            max_delay=_env(env_prefix, "WRITE_DELAY_MS", float, 2) / 1000,
+        )
+
+    def pool_status(self) -> Dict[str, Any]:
+        """
+        Returns the current occupancy of the connection pool and, when the
+        pool is instrumented, checkout wait and connect time statistics.
+        """
+        pool = self.engine.pool
+        status: Dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            status.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+            })
+        if isinstance(pool, InstrumentedQueuePool):
+            status.update({
+                "checkouts": pool.checkouts,
+                "checkout_timeouts": pool.checkout_timeouts,
+                "avg_wait_ms": round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+                "max_wait_ms": round(pool.max_wait * 1000, 3),
+                "connects": pool.connects,
+                "avg_connect_ms": round(pool.total_connect / pool.connects * 1000, 3) if pool.connects else 0.0,
+                "max_connect_ms": round(pool.max_connect * 1000, 3),
+            })
+        status["writer"] = self.writer.stats()
+        return status
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         """
@@ -33,6 +253,7 @@ class DatabaseManager:
         """
         Closes all connections in the engine's connection pool.
         """
+        await self.writer.close()
         await self.engine.dispose()
 
 async def get_aghu_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
@@ -50,3 +271,10 @@ async def get_app_db_session(request: Request) -> AsyncGenerator[AsyncSession, N
     app_db_manager: DatabaseManager = request.app.state.app_db
     async for session in app_db_manager.get_session():
         yield session
+
+async def get_app_db_writer(request: Request) -> WriteQueue:
+    """
+    Dependency for FastAPI to get the application database's write queue.
+    """
+    app_db_manager: DatabaseManager = request.app.state.app_db
+    return app_db_manager.writer
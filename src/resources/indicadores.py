@@ -0,0 +1,144 @@
+# src/resources/indicadores.py
+
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .quadro_leitos import AlteracaoLeito, QuadroLeitos
+
+# Statuses in which the bed holds a patient ("alta" = discharged, not yet vacated)
+STATUS_OCUPADOS = ("ocupado", "alta")
+# Statuses that take the bed out of the occupancy denominator
+STATUS_FORA_DE_OPERACAO = ("desativado",)
+
+def _decrementar(contador: Counter, chave: Any) -> None:
+    contador[chave] -= 1
+    if contador[chave] <= 0:
+        del contador[chave]
+
+class IndicadoresOcupacao:
+    """
+    Occupancy indicators kept up to date from the bed board's change feed.
+
+    Instead of grouping every bed on each request, counters (by status, by
+    tipo and status, by specialty of the current patient, pending
+    reservations, transfer flags) are adjusted by the difference between the
+    previous and current state of each changed bed. Reading the indicators
+    costs O(number of distinct statuses/tipos/specialties), not O(beds).
+
+    The wait for a bed is measured from the moment a `proximo_prontuario`
+    appears on a bed until it is cleared. The average wait of those still
+    waiting is derived from the sum of their start times, so it also needs
+    no scan. Beds already waiting when the engine starts count from then.
+    """
+    def __init__(self, quadro: QuadroLeitos, relogio=time.time):
+        self.relogio = relogio
+        self.versao = 0
+        self.total = 0
+        self.por_status: Counter = Counter()
+        self.por_tipo_status: Dict[Any, Counter] = {}
+        self.por_especialidade: Counter = Counter()
+        self.reservas_pendentes = 0
+        self.sinalizacoes_transferencia = 0
+        # leito_numero -> (prontuario waiting, start time)
+        self._esperas: Dict[str, tuple] = {}
+        self._soma_inicios = 0.0
+        self.esperas_concluidas = 0
+        self._soma_esperas_concluidas = 0.0
+
+        agora = self.relogio()
+        for leito in quadro.listar():
+            self._somar(leito, 1)
+            self._iniciar_espera(leito, agora)
+        self.versao = quadro.versao
+        quadro.assinar(self.aplicar)
+
+    def _somar(self, leito: Dict[str, Any], sinal: int) -> None:
+        status, tipo = leito.get("status"), leito.get("tipo")
+        self.total += sinal
+        por_status = self.por_tipo_status.setdefault(tipo, Counter())
+        if sinal > 0:
+            self.por_status[status] += 1
+            por_status[status] += 1
+        else:
+            _decrementar(self.por_status, status)
+            _decrementar(por_status, status)
+            if not por_status:
+                del self.por_tipo_status[tipo]
+        if status in STATUS_OCUPADOS and leito.get("paciente_especialidade"):
+            if sinal > 0:
+                self.por_especialidade[leito["paciente_especialidade"]] += 1
+            else:
+                _decrementar(self.por_especialidade, leito["paciente_especialidade"])
+        if leito.get("proximo_prontuario") is not None:
+            self.reservas_pendentes += sinal
+        if leito.get("sinalizacao_transferencia"):
+            self.sinalizacoes_transferencia += sinal
+
+    def _iniciar_espera(self, leito: Dict[str, Any], agora: float) -> None:
+        prontuario = leito.get("proximo_prontuario")
+        if prontuario is not None:
+            self._esperas[leito["leito_numero"]] = (prontuario, agora)
+            self._soma_inicios += agora
+
+    def _atualizar_espera(self, alteracao: AlteracaoLeito, agora: float) -> None:
+        prontuario = (alteracao.atual or {}).get("proximo_prontuario")
+        espera = self._esperas.get(alteracao.leito_numero)
+        if espera is not None and espera[0] == prontuario:
+            return
+        if espera is not None:
+            # The waiting patient got the bed or the reservation was dropped
+            del self._esperas[alteracao.leito_numero]
+            self._soma_inicios -= espera[1]
+            self.esperas_concluidas += 1
+            self._soma_esperas_concluidas += agora - espera[1]
+        if alteracao.atual is not None:
+            self._iniciar_espera(alteracao.atual, agora)
+
+    def aplicar(self, alteracoes: List[AlteracaoLeito]) -> None:
+        """QuadroLeitos listener: applies a batch of bed changes to the counters."""
+        agora = self.relogio()
+        for alteracao in alteracoes:
+            if alteracao.anterior is not None:
+                self._somar(alteracao.anterior, -1)
+            if alteracao.atual is not None:
+                self._somar(alteracao.atual, 1)
+            self._atualizar_espera(alteracao, agora)
+        self.versao = alteracoes[-1].versao
+
+    def resumo(self) -> Dict[str, Any]:
+        agora = self.relogio()
+        ocupados = sum(self.por_status[status] for status in STATUS_OCUPADOS)
+        operacionais = self.total - sum(self.por_status[status] for status in STATUS_FORA_DE_OPERACAO)
+        aguardando = len(self._esperas)
+        espera_media: Optional[float] = None
+        if aguardando:
+            espera_media = (agora * aguardando - self._soma_inicios) / aguardando / 60
+        espera_concluida_media: Optional[float] = None
+        if self.esperas_concluidas:
+            espera_concluida_media = self._soma_esperas_concluidas / self.esperas_concluidas / 60
+        return {
+            "versao": self.versao,
+            "leitos": {
+                "total": self.total,
+                "por_status": dict(self.por_status),
+                "por_tipo": {
+                    tipo: {"total": sum(contagem.values()), "por_status": dict(contagem)}
+                    for tipo, contagem in self.por_tipo_status.items()
+                },
+            },
+            "ocupacao": {
+                "ocupados": ocupados,
+                "operacionais": operacionais,
+                "taxa": round(ocupados / operacionais, 4) if operacionais else None,
+            },
+            "por_especialidade": dict(self.por_especialidade),
+            "reservas_pendentes": self.reservas_pendentes,
+            "sinalizacoes_transferencia": self.sinalizacoes_transferencia,
+            "espera": {
+                "aguardando": aguardando,
+                "tempo_medio_minutos": round(espera_media, 1) if espera_media is not None else None,
+                "concluidas": self.esperas_concluidas,
+                "tempo_medio_concluidas_minutos": round(espera_concluida_media, 1) if espera_concluida_media is not None else None,
+            },
+        }
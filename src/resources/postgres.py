@@ -12,7 +12,7 @@ POSTGRES_DSN = os.getenv("POSTGRES_DSN")
 if not POSTGRES_DSN:
     raise ValueError("POSTGRES_DSN environment variable not set.")
 
-postgres_db_manager = DatabaseManager(POSTGRES_DSN)
+postgres_db_manager = DatabaseManager(POSTGRES_DSN, env_prefix="POSTGRES")
 
 async def get_postgres_session():
     """
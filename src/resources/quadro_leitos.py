@@ -0,0 +1,168 @@
+# src/resources/quadro_leitos.py
+
+import random
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+# Versions issued by a board that it still recognizes as `since` (one per
+# sync with changes); older ones get the full board back
+VERSOES_RECONHECIDAS = 10_000
+
+@dataclass(frozen=True)
+class AlteracaoLeito:
+    """
+    A change to a single bed. `anterior` is None for a new bed and `atual`
+    is None for a bed that disappeared from the source.
+    """
+    leito_numero: str
+    anterior: Optional[Dict[str, Any]]
+    atual: Optional[Dict[str, Any]]
+    versao: int
+
+class QuadroLeitos:
+    """
+    In-memory bed board shared by the process.
+
+    Keeps the current state of every bed indexed by leito_numero, status and
+    tipo, plus the version in which each bed last changed. Versions are
+    millisecond timestamps (strictly increasing within the process), so a
+    client can ask for "everything that changed after version X" and get only
+    the affected beds.
+
+    Each worker process keeps its own board, synced on its own schedule, so
+    a version is only meaningful to the board that issued it: another
+    worker may be past that timestamp without having applied the same
+    changes. Versions therefore carry a random per-board tag in their last
+    three digits, and a delta is only computed from a version this board
+    issued itself; any other version gets the full board (`completo=True`).
+    Deltas stay incremental when polls reach the same worker (one worker,
+    or sticky sessions) and are never silently incomplete otherwise.
+    """
+    def __init__(self):
+        self.versao = 0
+        self._marca = random.randrange(1000)
+        self._emitidas: Set[int] = set()
+        self._ordem_emitidas: Deque[int] = deque()
+        self._leitos: Dict[str, Dict[str, Any]] = {}
+        self._por_status: Dict[str, Set[str]] = {}
+        self._por_tipo: Dict[str, Set[str]] = {}
+        # leito_numero -> version of its last change, kept in version order
+        self._alteracoes: "OrderedDict[str, int]" = OrderedDict()
+        self._ouvintes: List[Callable[[List[AlteracaoLeito]], None]] = []
+
+    def assinar(self, ouvinte: Callable[[List[AlteracaoLeito]], None]) -> None:
+        """
+        Registers a callback that receives each non-empty batch of changes
+        right after it is applied. Callbacks run synchronously and must be cheap.
+        """
+        self._ouvintes.append(ouvinte)
+
+    def _proxima_versao(self) -> int:
+        candidata = int(time.time() * 1000) * 1000 + self._marca
+        if candidata <= self.versao:
+            candidata = self.versao + 1000
+        return candidata
+
+    def _emitir(self, versao: int) -> None:
+        self.versao = versao
+        self._emitidas.add(versao)
+        self._ordem_emitidas.append(versao)
+        if len(self._ordem_emitidas) > VERSOES_RECONHECIDAS:
+            self._emitidas.discard(self._ordem_emitidas.popleft())
+
+    def _indexar(self, leito: Dict[str, Any]) -> None:
+        numero = leito["leito_numero"]
+        self._por_status.setdefault(leito.get("status"), set()).add(numero)
+        self._por_tipo.setdefault(leito.get("tipo"), set()).add(numero)
+
+    def _desindexar(self, leito: Dict[str, Any]) -> None:
+        numero = leito["leito_numero"]
+        self._por_status.get(leito.get("status"), set()).discard(numero)
+        self._por_tipo.get(leito.get("tipo"), set()).discard(numero)
+
+    def _registrar(self, numero: str, atual: Optional[Dict[str, Any]], versao: int) -> AlteracaoLeito:
+        anterior = self._leitos.get(numero)
+        if anterior is not None:
+            self._desindexar(anterior)
+        if atual is None:
+            self._leitos.pop(numero, None)
+        else:
+            self._leitos[numero] = atual
+            self._indexar(atual)
+        self._alteracoes[numero] = versao
+        self._alteracoes.move_to_end(numero)
+        return AlteracaoLeito(numero, anterior, atual, versao)
+
+    def aplicar(self, leitos: Iterable[Dict[str, Any]]) -> List[AlteracaoLeito]:
+        """
+        Replaces the board with a full snapshot from the source, touching only
+        the beds whose data actually changed. Returns the changes applied.
+        """
+        novos = {leito["leito_numero"]: leito for leito in leitos}
+        versao = self._proxima_versao()
+        alteracoes = [
+            self._registrar(numero, leito, versao)
+            for numero, leito in novos.items()
+            if self._leitos.get(numero) != leito
+        ]
+        alteracoes.extend(
+            self._registrar(numero, None, versao)
+            for numero in list(self._leitos)
+            if numero not in novos
+        )
+        if alteracoes or self.versao == 0:
+            self._emitir(versao)
+        if alteracoes:
+            self._notificar(alteracoes)
+        return alteracoes
+
+    def _notificar(self, alteracoes: List[AlteracaoLeito]) -> None:
+        for ouvinte in self._ouvintes:
+            try:
+                ouvinte(alteracoes)
+            except Exception as e:
+                # A listener failure must not break the board update
+                print(f"ERROR: bed board listener {ouvinte!r} failed: {e}")
+
+    def obter(self, leito_numero: str) -> Optional[Dict[str, Any]]:
+        return self._leitos.get(leito_numero)
+
+    def listar(self, status: Optional[str] = None, tipo: Optional[str] = None) -> List[Dict[str, Any]]:
+        numeros: Optional[Set[str]] = None
+        if status is not None:
+            numeros = self._por_status.get(status, set())
+        if tipo is not None:
+            por_tipo = self._por_tipo.get(tipo, set())
+            numeros = por_tipo if numeros is None else numeros & por_tipo
+        if numeros is None:
+            numeros = self._leitos.keys()
+        return [self._leitos[numero] for numero in sorted(numeros)]
+
+    def contagem_por_status(self) -> Dict[str, int]:
+        return {status: len(numeros) for status, numeros in self._por_status.items() if numeros}
+
+    def alteracoes_desde(self, versao: int) -> Dict[str, Any]:
+        """
+        Beds changed after `versao`. When the version was not issued by this
+        board (e.g. the client's first call, a server restart or a poll routed
+        to another worker) the whole board is sent with `completo=True` and
+        the client must replace its copy.
+        """
+        if versao not in self._emitidas:
+            return {"versao": self.versao, "completo": True, "leitos": self.listar(), "removidos": []}
+
+        alterados: List[str] = []
+        # Walk from the most recent change backwards until reaching `versao`
+        for numero in reversed(self._alteracoes):
+            if self._alteracoes[numero] <= versao:
+                break
+            alterados.append(numero)
+        alterados.reverse()
+        return {
+            "versao": self.versao,
+            "completo": False,
+            "leitos": [self._leitos[numero] for numero in alterados if numero in self._leitos],
+            "removidos": [numero for numero in alterados if numero not in self._leitos],
+        }
@@ -0,0 +1,183 @@
+# src/resources/serie_ocupacao.py
+
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.ocupacao import OcupacaoAgregado, OcupacaoAmostra
+from .indicadores import IndicadoresOcupacao
+from .write_queue import WriteQueue
+
+MINUTO, HORA, DIA = 60, 3600, 86400
+PASSOS = {"minute": MINUTO, "hour": HORA, "day": DIA}
+# Largest number of buckets a single range query may return
+MAX_PONTOS = 2000
+
+class SerieOcupacao:
+    """
+    Occupancy time series: samples plus minute/hour/day rollups kept up to
+    date on every write, so range queries read only pre-aggregated buckets.
+    """
+    def __init__(
+        self,
+        intervalo: int = 60,
+        fuso_horas: float = -3,
+        retencao_amostras: float = 7 * DIA,
+        retencao_minutos: float = 90 * DIA,
+    ):
+        self.intervalo = intervalo
+        self.fuso = timezone(timedelta(hours=fuso_horas))
+        self.deslocamento = int(fuso_horas * 3600)
+        self.retencao_amostras = retencao_amostras
+        self.retencao_minutos = retencao_minutos
+
+    def inicio_do_balde(self, ts: int, passo: int) -> int:
+        return (ts + self.deslocamento) // passo * passo - self.deslocamento
+
+    async def _consolidar(self, session: AsyncSession, passo: int, inicio: int) -> None:
+        """Recomputes one bucket from the level below it."""
+        if passo == MINUTO:
+            origem = select(
+                func.count(),
+                func.sum(OcupacaoAmostra.ocupados),
+                func.sum(OcupacaoAmostra.operacionais),
+                func.min(OcupacaoAmostra.ocupados),
+                func.max(OcupacaoAmostra.ocupados),
+            ).where(OcupacaoAmostra.ts >= inicio, OcupacaoAmostra.ts < inicio + passo)
+        else:
+            origem = select(
+                func.sum(OcupacaoAgregado.amostras),
+                func.sum(OcupacaoAgregado.soma_ocupados),
+                func.sum(OcupacaoAgregado.soma_operacionais),
+                func.min(OcupacaoAgregado.min_ocupados),
+                func.max(OcupacaoAgregado.max_ocupados),
+            ).where(
+                OcupacaoAgregado.passo == (MINUTO if passo == HORA else HORA),
+                OcupacaoAgregado.inicio >= inicio,
+                OcupacaoAgregado.inicio < inicio + passo,
+            )
+        amostras, soma_ocupados, soma_operacionais, minimo, maximo = (await session.execute(origem)).one()
+        if not amostras:
+            return
+        valores = {
+            "amostras": amostras,
+            "soma_ocupados": soma_ocupados,
+            "soma_operacionais": soma_operacionais,
+            "min_ocupados": minimo,
+            "max_ocupados": maximo,
+        }
+        await session.execute(
+            insert(OcupacaoAgregado)
+            .values(passo=passo, inicio=inicio, **valores)
+            .on_conflict_do_update(index_elements=["passo", "inicio"], set_=valores)
+        )
+
+    async def registrar(self, writer: WriteQueue, ts: int, ocupados: int, operacionais: int, total: int) -> None:
+        """Appends a sample and refreshes the buckets that contain it, in one transaction."""
+        ts = ts // self.intervalo * self.intervalo
+
+        async def gravar(session: AsyncSession) -> None:
+            await session.execute(
+                insert(OcupacaoAmostra)
+                .values(ts=ts, ocupados=ocupados, operacionais=operacionais, total=total)
+                .on_conflict_do_nothing(index_elements=["ts"])
+            )
+            for passo in (MINUTO, HORA, DIA):
+                await self._consolidar(session, passo, self.inicio_do_balde(ts, passo))
+
+        await writer.run(gravar)
+
+    async def expurgar(self, writer: WriteQueue, agora: Optional[float] = None) -> None:
+        agora = agora if agora is not None else time.time()
+
+        async def apagar(session: AsyncSession) -> None:
+            await session.execute(delete(OcupacaoAmostra).where(OcupacaoAmostra.ts < agora - self.retencao_amostras))
+            await session.execute(delete(OcupacaoAgregado).where(
+                OcupacaoAgregado.passo == MINUTO,
+                OcupacaoAgregado.inicio < agora - self.retencao_minutos,
+            ))
+
+        await writer.run(apagar)
+
+    def escolher_passo(self, inicio: int, fim: int, passo: Optional[str]) -> int:
+        """Requested step, or the finest one that fits in MAX_PONTOS buckets."""
+        if passo is not None:
+            return PASSOS[passo]
+        for segundos in (MINUTO, HORA, DIA):
+            if (fim - inicio) // segundos <= MAX_PONTOS:
+                return segundos
+        return DIA
+
+    def ponto(self, inicio: int, amostras: int, soma_ocupados: int, soma_operacionais: int,
+              minimo: int, maximo: int) -> Dict[str, Any]:
+        """One bucket as returned by the API."""
+        return {
+            "inicio": datetime.fromtimestamp(inicio, tz=self.fuso),
+            "taxa": round(soma_ocupados / soma_operacionais, 4) if soma_operacionais else None,
+            "ocupados_medio": round(soma_ocupados / amostras, 2),
+            "ocupados_min": minimo,
+            "ocupados_max": maximo,
+            "operacionais_medio": round(soma_operacionais / amostras, 2),
+            "amostras": amostras,
+        }
+
+    async def consultar(self, db: AsyncSession, inicio: int, fim: int, passo: int) -> List[Dict[str, Any]]:
+        """Buckets of `passo` seconds whose start falls in [inicio, fim]."""
+        # Plain columns instead of ORM entities: no identity map for a read-only chart
+        resultado = await db.execute(
+            select(
+                OcupacaoAgregado.inicio,
+                OcupacaoAgregado.amostras,
+                OcupacaoAgregado.soma_ocupados,
+                OcupacaoAgregado.soma_operacionais,
+                OcupacaoAgregado.min_ocupados,
+                OcupacaoAgregado.max_ocupados,
+            )
+            .where(
+                OcupacaoAgregado.passo == passo,
+                OcupacaoAgregado.inicio >= self.inicio_do_balde(inicio, passo),
+                OcupacaoAgregado.inicio <= fim,
+            )
+            .order_by(OcupacaoAgregado.inicio)
+        )
+        return [self.ponto(*linha) for linha in resultado]
+
+    async def amostrar(self, writer: WriteQueue, motor: IndicadoresOcupacao, expurgo: float = HORA) -> None:
+        """
+        Background loop: records the engine's current occupancy every
+        `intervalo` seconds and purges expired rows every `expurgo` seconds.
+        Nothing is recorded while the bed board is still empty.
+        """
+        ultimo_expurgo = 0.0
+        while True:
+            try:
+                agora = time.time()
+                ocupacao = motor.resumo()
+                if motor.total:
+                    await self.registrar(
+                        writer, int(agora), ocupacao["ocupacao"]["ocupados"],
+                        ocupacao["ocupacao"]["operacionais"], motor.total,
+                    )
+                if agora - ultimo_expurgo >= expurgo:
+                    await self.expurgar(writer, agora)
+                    ultimo_expurgo = agora
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"ERROR: Failed to record occupancy sample: {e}")
+            # Sleep until the next aligned instant, so workers sample the same timestamps
+            await asyncio.sleep(self.intervalo - time.time() % self.intervalo)
+
+# Instância única usada por toda a aplicação
+serie_ocupacao = SerieOcupacao(
+    intervalo=int(os.getenv("OCUPACAO_AMOSTRA_SECONDS", 60)),
+    fuso_horas=float(os.getenv("OCUPACAO_FUSO_HORAS", -3)),
+    retencao_amostras=float(os.getenv("OCUPACAO_RETENCAO_AMOSTRAS_DIAS", 7)) * DIA,
+    retencao_minutos=float(os.getenv("OCUPACAO_RETENCAO_MINUTOS_DIAS", 90)) * DIA,
+)
@@ -0,0 +1,117 @@
+# src/resources/write_queue.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+Operation = Callable[[AsyncSession], Awaitable[Any]]
+
+class WriteQueue:
+    """
+    In-process single writer for a database that only tolerates one writer at
+    a time (SQLite).
+
+    Operations are queued and executed by one background task that owns the
+    write transaction. Everything queued while a batch is running (up to
+    `max_batch` operations, waiting at most `max_delay` seconds for more) is
+    committed together, so N concurrent writes cost one fsync instead of N.
+    Each operation runs inside its own SAVEPOINT: if it raises, only its
+    changes are rolled back and the exception goes to its caller alone.
+    """
+    def __init__(self, session_maker: Callable[[], AsyncSession], max_batch: int = 64, max_delay: float = 0.002):
+        self.session_maker = session_maker
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "Optional[asyncio.Queue[Tuple[Operation, asyncio.Future]]]" = None
+        self._task: Optional[asyncio.Task] = None
+        self.operations = 0
+        self.batches = 0
+        self.failed_commits = 0
+
+    async def run(self, operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """
+        Queues `operation(session)` and waits until its batch is committed.
+        Returns the operation's result. The session must not be committed or
+        closed by the operation.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            # (Re)start the worker on the existing queue, so operations
+            # queued before a worker died still run
+            self._task = asyncio.create_task(self._worker())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def _next_batch(self) -> List[Tuple[Operation, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        waited = False
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                if waited or not self.max_delay:
+                    break
+                # Give concurrent requests a moment to join this commit
+                await asyncio.sleep(self.max_delay)
+                waited = True
+        return batch
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            results: List[Tuple[asyncio.Future, Any, Optional[BaseException]]] = []
+            try:
+                async with self.session_maker() as session:
+                    for operation, future in batch:
+                        if future.cancelled():
+                            continue
+                        try:
+                            async with session.begin_nested():
+                                results.append((future, await operation(session), None))
+                        except Exception as exc:
+                            results.append((future, None, exc))
+                    await session.commit()
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    if not future.done():
+                        future.cancel()
+                raise
+            except Exception as exc:
+                # The commit itself failed: nothing in the batch was written
+                self.failed_commits += 1
+                results = [(future, None, exc) for _, future in batch]
+            self.batches += 1
+            self.operations += len(batch)
+            for future, result, exc in results:
+                if future.done():
+                    continue
+                if exc is not None:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+        self._queue = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "operations": self.operations,
+            "batches": self.batches,
+            "avg_batch": round(self.operations / self.batches, 2) if self.batches else 0.0,
+            "failed_commits": self.failed_commits,
+        }
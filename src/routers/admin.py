@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from typing import List
 
 from ..auth.auth import auth_handler
+from ..dependencies import get_paciente_cache
 
 router = APIRouter(prefix="/api", tags=["Admin"])
 
@@ -25,3 +26,46 @@ async def get_admin_data(current_user: dict = Depends(verify_admin_group)):
         message="This is highly confidential admin data!",
         user_groups=current_user.get("groups", [])
     )
+
+@router.get("/admin/cache")
+async def get_cache_stats(current_user: dict = Depends(verify_admin_group)):
+    """
+    Returns hit/miss counters and memory usage of the shared caches.
+    """
+    return {
+        "pacientes": get_paciente_cache().stats(),
+        "perfis": auth_handler.profile_cache.stats(),
+        "tokens": auth_handler.token_cache.stats(),
+    }
+
+@router.delete("/admin/cache/perfis/{username}")
+async def invalidate_user_profile(username: str, current_user: dict = Depends(verify_admin_group)):
+    """
+    Drops a user's cached AD profile, so the next token refresh reads the
+    directory again (e.g. after changing the user's groups or disabling the account).
+    """
+    return {"username": username, "invalidated": auth_handler.invalidate_user_profile(username)}
+
+@router.delete("/admin/cache/perfis")
+async def clear_user_profiles(current_user: dict = Depends(verify_admin_group)):
+    """
+    Drops every cached AD profile.
+    """
+    auth_handler.profile_cache.clear()
+    return {"cleared": True}
+
+@router.get("/admin/pools")
+async def get_pool_stats(request: Request, current_user: dict = Depends(verify_admin_group)):
+    """
+    Returns occupancy (checked out, idle, overflow) and checkout wait times
+    of each database connection pool, plus the AD service connection pool.
+    """
+    pools = {}
+    for nome, atributo in (("aghu", "aghu_db"), ("app", "app_db")):
+        manager = getattr(request.app.state, atributo, None)
+        if manager is not None:
+            pools[nome] = manager.pool_status()
+    ldap = auth_handler.provider.pool_status()
+    if ldap is not None:
+        pools["ldap"] = ldap
+    return pools
@@ -0,0 +1,68 @@
+import os
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..controllers import alerta_controller
+from ..dependencies import obter_motor_alertas
+from ..resources.database import get_app_db_session, get_app_db_writer
+from ..resources.write_queue import WriteQueue
+
+from ..auth.auth import auth_handler
+# As regras são avaliadas sobre o mesmo quadro de leitos do roteador de
+# leitos, mantido em dia pelo vigia de leitos iniciado em main.py
+from .leito import STRATEGY
+
+# Marcações de leitura de alertas encerrados são apagadas após este prazo
+RETENCAO_LIDOS_DIAS = float(os.getenv("ALERTAS_LIDOS_RETENCAO_DIAS", 30))
+
+router = APIRouter(
+    prefix="/api/alertas",
+    tags=["Alertas"],
+    dependencies=[Depends(auth_handler.decode_token)]
+)
+
+@router.get("", response_model=dict)
+async def listar_alertas(
+    current_user: dict = Depends(auth_handler.decode_token),
+    db: AsyncSession = Depends(get_app_db_session),
+    tipo: Optional[Literal["critico", "aviso", "info"]] = None,
+    nao_lidos: bool = False,
+):
+    """
+    Alertas abertos sobre os leitos (sinalizações de transferência,
+    previsões de liberação vencidas, reservas etc.), dos mais graves para os
+    menos graves, com o estado de leitura do usuário. As regras são
+    reavaliadas só para os leitos e campos que mudaram, então a consulta não
+    percorre regras nem leitos.
+    """
+    return await alerta_controller.listar_alertas(
+        obter_motor_alertas(STRATEGY), db, current_user["username"], tipo, nao_lidos
+    )
+
+async def _marcar(alerta_id: str, lido: bool, current_user: dict, writer: WriteQueue) -> dict:
+    marcado = await alerta_controller.marcar_lido(
+        obter_motor_alertas(STRATEGY), writer, current_user["username"], alerta_id, lido, RETENCAO_LIDOS_DIAS
+    )
+    if not marcado:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Alert not found or no longer open")
+    return {"id": alerta_id, "lido": lido}
+
+@router.put("/{alerta_id}/lido", response_model=dict)
+async def marcar_alerta_lido(
+    alerta_id: str,
+    current_user: dict = Depends(auth_handler.decode_token),
+    writer: WriteQueue = Depends(get_app_db_writer),
+):
+    """Marca um alerta aberto como lido pelo usuário."""
+    return await _marcar(alerta_id, True, current_user, writer)
+
+@router.delete("/{alerta_id}/lido", response_model=dict)
+async def marcar_alerta_nao_lido(
+    alerta_id: str,
+    current_user: dict = Depends(auth_handler.decode_token),
+    writer: WriteQueue = Depends(get_app_db_writer),
+):
+    """Volta um alerta aberto para não lido."""
+    return await _marcar(alerta_id, False, current_user, writer)
@@ -6,13 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException, Response, Request, status
 
 from fastapi.security import OAuth2PasswordRequestForm
 
-from starlette.concurrency import run_in_threadpool
-
 
 
 from ..auth.auth import auth_handler, JWT_EXP_HOURS, REFRESH_TOKEN_EXP_DAYS
 
-from ..resources.database import get_app_db_session
+from ..resources.database import get_app_db_session, get_app_db_writer
+
+from ..resources.write_queue import WriteQueue
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,7 +32,7 @@ async def login(
 
     remember_me: bool = Form(False),
 
-    db: AsyncSession = Depends(get_app_db_session)
+    writer: WriteQueue = Depends(get_app_db_writer)
 
 ):
 
@@ -44,7 +44,7 @@ async def login(
 
     try:
 
-        user = await run_in_threadpool(auth_handler.authenticate_user, form_data.username, form_data.password)
+        user = await auth_handler.authenticate_user_async(form_data.username, form_data.password)
 
     except HTTPException as e:
 
@@ -66,7 +66,7 @@ async def login(
 
     if remember_me:
 
-        refresh_token = await auth_handler.create_refresh_token(user_id=user["username"], groups=user["groups"], db=db)
+        refresh_token = await auth_handler.create_refresh_token(user_id=user["username"], groups=user["groups"], writer=writer)
 
         response.set_cookie(
 
@@ -92,7 +92,12 @@ async def login(
 
 @router.post("/token/refresh")
 
-async def refresh_token(request: Request, response: Response, db: AsyncSession = Depends(get_app_db_session)):
+async def refresh_token(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_app_db_session),
+    writer: WriteQueue = Depends(get_app_db_writer),
+):
 
     """
 
@@ -110,16 +115,13 @@ async def refresh_token(request: Request, response: Response, db: AsyncSession =
 
     token_obj = await auth_handler.verify_refresh_token(refresh_token, db)
 
-    # Re-fetch full user data to ensure the new token has all AD attributes
+    # Re-fetch the user's AD profile (served from the profile cache when fresh)
     try:
-        user_full_info = await run_in_threadpool(auth_handler.authenticate_user, token_obj.user_id, None) # Pass None for password as we are re-authenticating
+        user_full_info = await auth_handler.get_user_profile(token_obj.user_id)
     except HTTPException as e:
         # Handle cases where the user might not exist in AD anymore
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Failed to re-authenticate user: {e.detail}")
 
-    # Invalidate the old refresh token (optional: implement rotation for better security)
-    await auth_handler.invalidate_refresh_token(refresh_token, db)
-
     # Create a new access token (short-lived)
     new_access_token = auth_handler.create_access_token(
         data=user_full_info,
@@ -128,12 +130,13 @@ async def refresh_token(request: Request, response: Response, db: AsyncSession =
 
 
 
-    # Create a new refresh token and set it as a new HttpOnly cookie
+    # Rotate the refresh token (old one deleted, new one stored, in a single transaction) and set it as a new HttpOnly cookie
 
-    new_refresh_token = await auth_handler.create_refresh_token(
+    new_refresh_token = await auth_handler.rotate_refresh_token(
+        refresh_token,
         user_id=user_full_info["username"], 
         groups=user_full_info.get("groups", []), 
-        db=db
+        writer=writer
     )
 
     response.set_cookie(
@@ -160,7 +163,7 @@ async def refresh_token(request: Request, response: Response, db: AsyncSession =
 
 @router.post("/logout")
 
-async def logout(response: Response, request: Request, db: AsyncSession = Depends(get_app_db_session)):
+async def logout(response: Response, request: Request, writer: WriteQueue = Depends(get_app_db_writer)):
 
     """
 
@@ -172,7 +175,7 @@ async def logout(response: Response, request: Request, db: AsyncSession = Depend
 
     if refresh_token:
 
-        await auth_handler.invalidate_refresh_token(refresh_token, db)
+        await auth_handler.invalidate_refresh_token(refresh_token, writer)
 
     
 
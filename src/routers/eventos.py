@@ -0,0 +1,38 @@
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from ..controllers import evento_controller
+from ..resources.broadcaster import broadcaster
+from ..auth.auth import auth_handler
+
+router = APIRouter(prefix="/api", tags=["Eventos"])
+
+HEARTBEAT_SECONDS = float(os.getenv("EVENTOS_HEARTBEAT_SECONDS", 15))
+
+async def usuario_do_stream(request: Request, token: Optional[str] = Query(None)) -> dict:
+    """
+    O EventSource do navegador não envia cabeçalhos customizados, então o
+    JWT pode vir no parâmetro `token` além do cabeçalho Authorization.
+    """
+    if token is None:
+        esquema, _, credencial = request.headers.get("Authorization", "").partition(" ")
+        if esquema.lower() == "bearer" and credencial:
+            token = credencial
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+    return auth_handler.decode_token(token)
+
+@router.get("/eventos")
+async def stream_eventos(current_user: dict = Depends(usuario_do_stream)):
+    """
+    Canal Server-Sent Events com as alterações de leitos ("leitos") e de
+    ocupação de pacientes ("pacientes").
+    """
+    return StreamingResponse(
+        evento_controller.transmitir_eventos(broadcaster, HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..controllers import historico_controller
+from ..resources.database import get_app_db_session
+
+from ..auth.auth import auth_handler
+
+router = APIRouter(
+    prefix="/api/historico",
+    tags=["Histórico"],
+    dependencies=[Depends(auth_handler.decode_token)]
+)
+
+@router.get("", response_model=dict)
+async def listar_historico(
+    db: AsyncSession = Depends(get_app_db_session),
+    usuario: Optional[str] = None,
+    entidade: Optional[str] = Query(None, description='Ex.: "leito:UTI-04", "solicitacao:12"'),
+    tipo: Optional[str] = Query(None, description="solicitacao, reserva, cancelamento..."),
+    q: Optional[str] = Query(None, max_length=200, description="Trecho de usuário, ação ou detalhes, sem distinguir acentos"),
+    cursor: Optional[str] = Query(None, description='Valor de "proximo" da página anterior'),
+    limit: int = Query(50, ge=1, le=200),
+):
+    """
+    Histórico de ações dos usuários (reservas, solicitações, cancelamentos),
+    do mais recente para o mais antigo. Para a próxima página, repita a
+    chamada com `cursor` igual ao `proximo` recebido; `proximo` nulo indica
+    a última página.
+    """
+    apos = None
+    if cursor is not None:
+        try:
+            apos = historico_controller.decodificar_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return await historico_controller.listar_historico(db, usuario, entidade, tipo, q, apos, limit)
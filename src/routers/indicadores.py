@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..controllers import indicador_controller
+from ..dependencies import obter_indicadores
+from ..resources.database import get_app_db_session
+from ..resources.serie_ocupacao import MAX_PONTOS, serie_ocupacao
+
+from ..auth.auth import auth_handler
+# Os indicadores são calculados sobre o mesmo quadro de leitos do roteador de
+# leitos, mantido em dia pelo vigia de leitos iniciado em main.py
+from .leito import STRATEGY
+
+router = APIRouter(
+    prefix="/api/indicadores",
+    tags=["Indicadores"],
+    dependencies=[Depends(auth_handler.decode_token)]
+)
+
+@router.get("", response_model=dict)
+async def obter_indicadores_operacionais():
+    """
+    Indicadores operacionais dos leitos: contagens por status e por tipo,
+    taxa de ocupação, distribuição dos pacientes internados por especialidade,
+    reservas pendentes, sinalizações de transferência e tempo de espera por
+    leito. Os contadores são mantidos incrementalmente a cada alteração do
+    quadro, então a consulta não percorre os leitos.
+    """
+    return await indicador_controller.obter_indicadores(obter_indicadores(STRATEGY))
+
+@router.get("/ocupacao")
+async def consultar_serie_ocupacao(
+    db: AsyncSession = Depends(get_app_db_session),
+    inicio: Optional[datetime] = Query(None, alias="from", description="Início do período (padrão: 24 h antes de `to`)"),
+    fim: Optional[datetime] = Query(None, alias="to", description="Fim do período (padrão: agora)"),
+    passo: Optional[Literal["minute", "hour", "day"]] = Query(
+        None, alias="step", description="Resolução; sem valor, a mais fina que caiba no limite de pontos"
+    ),
+):
+    """
+    Série histórica da ocupação das UTIs, em baldes de um minuto, uma hora ou
+    um dia. Cada ponto traz a taxa de ocupação e o mínimo, a média e o máximo
+    de leitos ocupados no balde. Datas sem fuso são interpretadas no fuso
+    configurado em OCUPACAO_FUSO_HORAS. Os baldes são consolidados à medida
+    que as amostras chegam, então a consulta só lê os pontos pedidos.
+    """
+    fim = fim or datetime.now(serie_ocupacao.fuso)
+    inicio = inicio or fim - timedelta(days=1)
+    inicio_ts = int((inicio if inicio.tzinfo else inicio.replace(tzinfo=serie_ocupacao.fuso)).timestamp())
+    fim_ts = int((fim if fim.tzinfo else fim.replace(tzinfo=serie_ocupacao.fuso)).timestamp())
+    if inicio_ts > fim_ts:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="`from` must not be after `to`")
+    segundos = serie_ocupacao.escolher_passo(inicio_ts, fim_ts, passo)
+    if (fim_ts - inicio_ts) // segundos > MAX_PONTOS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range too large: more than {MAX_PONTOS} points; use a coarser step or a shorter range",
+        )
+    return {
+        "passo": segundos,
+        "pontos": await indicador_controller.consultar_ocupacao(serie_ocupacao, db, inicio_ts, fim_ts, segundos),
+    }
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Query
+from typing import List, Optional
+
+from ..controllers import leito_controller
+from ..dependencies import get_leito_provider
+from ..providers.interfaces.leito_provider_interface import LeitoProviderInterface
+
+from ..auth.auth import auth_handler
+from ..helpers.json_helper import FastJSONResponse
+
+# --- PONTO ÚNICO DE CONFIGURAÇÃO PARA ESTE ROTEADOR ---
+# Para usar o banco de dados em produção, altere esta linha para "postgres"
+STRATEGY = "csv"
+# ----------------------------------------------------
+
+router = APIRouter(
+    prefix="/api/leitos",
+    tags=["Leitos"],
+    dependencies=[Depends(auth_handler.decode_token)]
+)
+
+@router.get("", response_model=List[dict])
+async def listar_leitos(
+    status: Optional[str] = None,
+    tipo: Optional[str] = None,
+    provider: LeitoProviderInterface = Depends(get_leito_provider(STRATEGY))
+):
+    """Lista os leitos, opcionalmente filtrados por status e/ou tipo."""
+    return FastJSONResponse(await leito_controller.listar_leitos(provider, status=status, tipo=tipo))
+
+@router.get("/changes", response_model=dict)
+async def listar_alteracoes(
+    since: int = Query(0, ge=0, description="Versão recebida na última consulta (0 para o quadro completo)"),
+    provider: LeitoProviderInterface = Depends(get_leito_provider(STRATEGY))
+):
+    """
+    Retorna apenas os leitos alterados após a versão `since`. Clientes que
+    consultam o quadro periodicamente devem guardar a `versao` da resposta e
+    enviá-la na próxima chamada; quando `completo` vier verdadeiro, a lista
+    `leitos` substitui o quadro inteiro.
+    """
+    return FastJSONResponse(await leito_controller.listar_alteracoes(since, provider))
+
+@router.get("/{leito_numero}", response_model=dict)
+async def obter_leito(
+    leito_numero: str,
+    provider: LeitoProviderInterface = Depends(get_leito_provider(STRATEGY))
+):
+    """Obtém um leito pelo número."""
+    return await leito_controller.obter_leito(leito_numero, provider)
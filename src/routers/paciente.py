@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from datetime import date
+from typing import List, Literal, Optional
 
 from ..controllers import paciente_controller
 # Alteração: Importamos apenas a FÁBRICA
 from ..dependencies import get_paciente_provider
-from ..providers.interfaces.paciente_provider_interface import PacienteProviderInterface
+from ..providers.interfaces.paciente_provider_interface import FiltroPacientes, PacienteProviderInterface
 
 from ..auth.auth import auth_handler
+from ..helpers.json_helper import FastJSONResponse
 
 # --- PONTO ÚNICO DE CONFIGURAÇÃO PARA ESTE ROTEADOR ---
 # Para usar o banco de dados em produção, altere esta linha para "postgres"
+# (ou "postgres+cache" para poupar o AGHU de consultas repetidas)
 STRATEGY = "csv"
 # ----------------------------------------------------
 
+class LotePacientes(BaseModel):
+    codigos: List[int] = Field(..., max_length=1000, description="Códigos dos pacientes (até 1000)")
+
 router = APIRouter(
     prefix="/api/pacientes",
     tags=["Pacientes"],
@@ -24,10 +32,83 @@ async def listar_pacientes(
     # A mágica acontece aqui:
     # 1. get_paciente_provider(STRATEGY) retorna a função _get_paciente_csv_provider
     # 2. FastAPI efetivamente executa Depends(_get_paciente_csv_provider)
+    provider: PacienteProviderInterface = Depends(get_paciente_provider(STRATEGY)),
+    after_codigo: Optional[int] = Query(None, description="Código do último paciente da página anterior"),
+    limit: int = Query(100, ge=1, le=1000),
+    campos: Optional[List[str]] = Query(None, description="Colunas a retornar (codigo é sempre incluído)"),
+    especialidade_atual: Optional[str] = None,
+    sexo: Optional[str] = None,
+    data_admissao_inicio: Optional[date] = None,
+    data_admissao_fim: Optional[date] = None,
+):
+    """
+    Lista pacientes da fonte de dados configurada no roteador, em páginas
+    ordenadas por código. Para a próxima página, repita a chamada com
+    `after_codigo` igual ao código do último paciente recebido.
+    """
+    # As linhas já vêm prontas do provedor: a resposta é serializada direto,
+    # sem a validação do response_model linha a linha
+    filtro = FiltroPacientes(
+        especialidade_atual=especialidade_atual,
+        sexo=sexo,
+        data_admissao_inicio=data_admissao_inicio,
+        data_admissao_fim=data_admissao_fim,
+    )
+    return FastJSONResponse(await paciente_controller.listar_pacientes(provider, filtro, after_codigo, limit, campos))
+
+@router.get("/export")
+async def exportar_pacientes(
+    provider: PacienteProviderInterface = Depends(get_paciente_provider(STRATEGY)),
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    campos: Optional[List[str]] = Query(None, description="Colunas a exportar (codigo é sempre incluído)"),
+    especialidade_atual: Optional[str] = None,
+    sexo: Optional[str] = None,
+    data_admissao_inicio: Optional[date] = None,
+    data_admissao_fim: Optional[date] = None,
+):
+    """
+    Exporta todos os pacientes que atendem aos filtros como NDJSON ou CSV.
+    As linhas são transmitidas à medida que são lidas da fonte, então o uso
+    de memória não cresce com o tamanho da exportação.
+    """
+    filtro = FiltroPacientes(
+        especialidade_atual=especialidade_atual,
+        sexo=sexo,
+        data_admissao_inicio=data_admissao_inicio,
+        data_admissao_fim=data_admissao_fim,
+    )
+    media_type = "text/csv" if formato == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        paciente_controller.exportar_pacientes(provider, formato, filtro, campos),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="pacientes.{formato}"'},
+    )
+
+@router.get("/search", response_model=List[dict])
+async def buscar_pacientes(
+    provider: PacienteProviderInterface = Depends(get_paciente_provider(STRATEGY)),
+    q: str = Query(..., min_length=2, max_length=100, description="Nome ou início de palavras do nome"),
+    limit: int = Query(20, ge=1, le=50),
+):
+    """
+    Busca pacientes pelo nome para typeahead. Cada palavra digitada casa com
+    o início de uma palavra do nome, sem diferenciar acentos ou maiúsculas
+    ("jo sil" encontra "José da Silva"); nomes que começam pela primeira
+    palavra vêm primeiro.
+    """
+    return FastJSONResponse(await paciente_controller.buscar_pacientes(q, limit, provider))
+
+@router.post("/batch", response_model=dict)
+async def obter_pacientes_em_lote(
+    lote: LotePacientes,
     provider: PacienteProviderInterface = Depends(get_paciente_provider(STRATEGY))
 ):
-    """Lista todos os pacientes da fonte de dados configurada no roteador."""
-    return await paciente_controller.listar_pacientes(provider)
+    """
+    Obtém vários pacientes numa única chamada (ex.: todos os leitos ocupados
+    da tela). Retorna `pacientes` indexado por código e, em `nao_encontrados`,
+    os códigos inexistentes, sem responder 404.
+    """
+    return FastJSONResponse(await paciente_controller.obter_pacientes_por_codigos(lote.codigos, provider))
 
 @router.get("/{codigo}", response_model=dict)
 async def obter_paciente(
@@ -0,0 +1,97 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, Field
+
+from ..controllers import solicitacao_controller
+from ..dependencies import obter_alocador
+from ..resources.database import get_app_db_writer
+from ..resources.write_queue import WriteQueue
+
+from ..auth.auth import auth_handler
+# As sugestões usam o mesmo quadro de leitos do roteador de leitos, mantido
+# em dia pelo vigia de leitos iniciado em main.py
+from .leito import STRATEGY
+
+class NovaSolicitacao(BaseModel):
+    prontuario: int
+    idade: Optional[int] = Field(None, ge=0, le=130)
+    especialidade: str = Field(..., min_length=1, max_length=100)
+    tipo: Literal["cirurgico", "hem", "obstetrico", "outro"] = Field(..., description="Tipo de leito solicitado")
+    urgencia: Literal["emergencia", "urgencia", "eletiva"] = "eletiva"
+
+class Atendimento(BaseModel):
+    leito_numero: Optional[str] = Field(None, description="Leito reservado (padrão: o leito sugerido)")
+
+router = APIRouter(
+    prefix="/api/solicitacoes",
+    tags=["Solicitações"],
+    dependencies=[Depends(auth_handler.decode_token)]
+)
+
+@router.get("", response_model=dict)
+async def listar_solicitacoes():
+    """
+    Solicitações de leito pendentes em ordem de prioridade (urgência, tempo
+    de espera e especialidade), cada uma com o leito sugerido: um leito livre
+    compatível ou, se não houver, o próximo com previsão de liberação. As
+    sugestões são recalculadas só quando um leito ou uma solicitação muda.
+    """
+    return await solicitacao_controller.listar_solicitacoes(obter_alocador(STRATEGY))
+
+@router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def criar_solicitacao(
+    solicitacao: NovaSolicitacao,
+    current_user: dict = Depends(auth_handler.decode_token),
+    writer: WriteQueue = Depends(get_app_db_writer),
+):
+    """Registra uma solicitação de leito e devolve o leito sugerido para ela, se houver."""
+    return await solicitacao_controller.criar_solicitacao(
+        obter_alocador(STRATEGY), writer, solicitacao.model_dump(), current_user["username"]
+    )
+
+@router.post("/{id}/atender", response_model=dict)
+async def atender_solicitacao(
+    id: int,
+    atendimento: Atendimento,
+    current_user: dict = Depends(auth_handler.decode_token),
+    writer: WriteQueue = Depends(get_app_db_writer),
+):
+    """
+    Encerra a solicitação no leito informado (ou no sugerido). O leito sai
+    das sugestões até o quadro de leitos refletir a reserva.
+    """
+    alocador = obter_alocador(STRATEGY)
+    pendente = alocador.pendente(id)
+    if pendente is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pending request not found")
+    leito_numero = atendimento.leito_numero or alocador.leito_sugerido(id)
+    if leito_numero is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="No free bed suggested for this request")
+    if not alocador.leito_livre(leito_numero, pendente.tipo):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Bed {leito_numero} is not free for this request")
+    # O controller retira a solicitação e o leito do alocador antes de gravar;
+    # False = outra requisição encerrou a solicitação primeiro
+    atendida = await solicitacao_controller.encerrar_solicitacao(
+        alocador, writer, id, "atendida", current_user["username"], leito_numero
+    )
+    if not atendida:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request was closed by another operation")
+    return {"id": id, "status": "atendida", "leito_numero": leito_numero}
+
+@router.delete("/{id}", response_model=dict)
+async def cancelar_solicitacao(
+    id: int,
+    current_user: dict = Depends(auth_handler.decode_token),
+    writer: WriteQueue = Depends(get_app_db_writer),
+):
+    """Cancela uma solicitação pendente; o leito sugerido a ela passa ao próximo da fila."""
+    alocador = obter_alocador(STRATEGY)
+    if alocador.pendente(id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pending request not found")
+    cancelada = await solicitacao_controller.encerrar_solicitacao(
+        alocador, writer, id, "cancelada", current_user["username"]
+    )
+    if not cancelada:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Request was closed by another operation")
+    return {"id": id, "status": "cancelada"}
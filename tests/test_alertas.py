@@ -0,0 +1,142 @@
+from datetime import datetime
+
+import pytest
+
+from src.resources.alertas import Condicao, MotorAlertas, RegraAlerta
+from src.resources.quadro_leitos import QuadroLeitos
+
+TRANSFERENCIA = RegraAlerta(
+    codigo="transferencia",
+    tipo="critico",
+    titulo="Transferência",
+    mensagem="Leito {leito_numero}: paciente {paciente_prontuario}.",
+    condicoes=(Condicao("sinalizacao_transferencia", "verdadeiro"),),
+)
+VENCIDA = RegraAlerta(
+    codigo="vencida",
+    tipo="aviso",
+    titulo="Previsão vencida",
+    mensagem="Leito {leito_numero}: previsão {previsao_liberacao}.",
+    condicoes=(Condicao("status", "igual", "ocupado"), Condicao("previsao_liberacao", "vencido", 2)),
+)
+RESERVA = RegraAlerta(
+    codigo="reserva",
+    tipo="info",
+    titulo="Reservado",
+    mensagem="Leito {leito_numero} reservado para {proximo_prontuario}.",
+    condicoes=(Condicao("proximo_prontuario", "preenchido"),),
+    validade_horas=1,
+)
+
+
+class Relogio:
+    def __init__(self, agora: float):
+        self.agora = agora
+
+    def __call__(self) -> float:
+        return self.agora
+
+
+def leito(numero, **campos):
+    return {"leito_numero": numero, "status": "disponivel", "sinalizacao_transferencia": False,
+            "previsao_liberacao": None, "paciente_prontuario": None, "proximo_prontuario": None, **campos}
+
+
+@pytest.fixture
+def relogio():
+    return Relogio(datetime(2026, 3, 10, 12).timestamp())
+
+
+def criar(relogio, leitos, regras=(TRANSFERENCIA, VENCIDA, RESERVA)):
+    quadro = QuadroLeitos()
+    quadro.aplicar(leitos)
+    return quadro, MotorAlertas(quadro, regras, relogio=relogio)
+
+
+def test_alerts_open_and_close_with_the_bed(relogio):
+    quadro, motor = criar(relogio, [leito("A"), leito("B")])
+    assert motor.listar() == []
+
+    quadro.aplicar([leito("A", sinalizacao_transferencia=True, paciente_prontuario=10), leito("B")])
+    [alerta] = motor.listar()
+    assert (alerta.regra, alerta.leito_numero, alerta.mensagem) == ("transferencia", "A", "Leito A: paciente 10.")
+    assert motor.obter(alerta.id) is alerta
+
+    quadro.aplicar([leito("B")])
+    assert motor.listar() == [] and motor.obter(alerta.id) is None
+
+
+def test_only_rules_reading_a_changed_field_are_reevaluated(relogio):
+    leitos = [leito(f"L{n}") for n in range(50)]
+    quadro, motor = criar(relogio, leitos)
+    antes = motor.avaliacoes
+    leitos[7] = leito("L7", proximo_prontuario=99)
+    quadro.aplicar(leitos)
+    assert motor.avaliacoes - antes == 1
+    assert [alerta.leito_numero for alerta in motor.listar()] == ["L7"]
+
+
+def test_alert_keeps_its_id_until_its_message_changes(relogio):
+    quadro, motor = criar(relogio, [leito("A", sinalizacao_transferencia=True, paciente_prontuario=10)])
+    [primeiro] = motor.listar()
+    relogio.agora += 60
+    quadro.aplicar([leito("A", sinalizacao_transferencia=True, paciente_prontuario=10, status="ocupado")])
+    assert motor.listar() == [primeiro]
+    quadro.aplicar([leito("A", sinalizacao_transferencia=True, paciente_prontuario=11)])
+    [segundo] = motor.listar()
+    assert segundo.id != primeiro.id and segundo.aberto_em == relogio.agora
+
+
+def test_overdue_condition_opens_when_its_time_comes(relogio):
+    # Previsão para o dia 10: vence à meia-noite do dia 11, mais 2 h de tolerância
+    quadro, motor = criar(relogio, [leito("A", status="ocupado", previsao_liberacao="2026-03-10")])
+    assert motor.listar() == []
+    relogio.agora = datetime(2026, 3, 11, 1, 59).timestamp()
+    assert motor.listar() == []
+    relogio.agora = datetime(2026, 3, 11, 2, 0).timestamp()
+    [alerta] = motor.listar()
+    assert alerta.regra == "vencida" and alerta.aberto_em == relogio.agora
+
+
+def test_rescheduled_due_time_replaces_the_old_heap_entry(relogio):
+    quadro, motor = criar(relogio, [leito("A", status="ocupado", previsao_liberacao="2026-03-10")])
+    quadro.aplicar([leito("A", status="ocupado", previsao_liberacao="2026-03-12")])
+    relogio.agora = datetime(2026, 3, 11, 3).timestamp()
+    assert motor.listar() == []
+    relogio.agora = datetime(2026, 3, 13, 2).timestamp()
+    assert [alerta.regra for alerta in motor.listar()] == ["vencida"]
+
+
+def test_alert_with_validity_expires_and_does_not_reopen(relogio):
+    quadro, motor = criar(relogio, [leito("A", proximo_prontuario=5)])
+    assert len(motor.listar()) == 1
+    relogio.agora += 3600
+    assert motor.listar() == []
+    # A condição continua valendo com a mesma mensagem: o alerta não volta
+    quadro.aplicar([leito("A", proximo_prontuario=5, status="reservado")])
+    assert motor.listar() == []
+    # Uma reserva para outro paciente é um alerta novo
+    quadro.aplicar([leito("A", proximo_prontuario=6)])
+    assert [alerta.mensagem for alerta in motor.listar()] == ["Leito A reservado para 6."]
+
+
+def test_listing_orders_by_severity_then_newest(relogio):
+    quadro, motor = criar(relogio, [leito("A", proximo_prontuario=1)])
+    relogio.agora += 10
+    quadro.aplicar([leito("A", proximo_prontuario=1), leito("B", proximo_prontuario=2)])
+    relogio.agora += 10
+    quadro.aplicar([leito("A", proximo_prontuario=1), leito("B", proximo_prontuario=2),
+                    leito("C", sinalizacao_transferencia=True)])
+    assert [(alerta.tipo, alerta.leito_numero) for alerta in motor.listar()] == [
+        ("critico", "C"), ("info", "B"), ("info", "A"),
+    ]
+    assert [alerta.leito_numero for alerta in motor.listar("info")] == ["B", "A"]
+
+
+def test_invalid_rules_are_rejected(relogio):
+    with pytest.raises(ValueError):
+        Condicao("status", "contem", "x")
+    with pytest.raises(ValueError):
+        RegraAlerta("x", "grave", "t", "m", ())
+    with pytest.raises(ValueError, match="Duplicate"):
+        criar(relogio, [], regras=(TRANSFERENCIA, TRANSFERENCIA))
@@ -0,0 +1,153 @@
+from datetime import date
+
+import pytest
+
+from src.resources.alocacao import AlocadorLeitos, SolicitacaoLeito
+from src.resources.quadro_leitos import QuadroLeitos
+
+AGORA = 1_770_000_000.0
+
+
+def leito(numero, tipo="cirurgico", status="disponivel", previsao=None, reservado=None):
+    return {"leito_numero": numero, "tipo": tipo, "status": status,
+            "previsao_liberacao": previsao, "proximo_prontuario": reservado}
+
+
+def solicitacao(id, tipo="cirurgico", urgencia="eletiva", horas_atras=0.0, especialidade="Clínica"):
+    return SolicitacaoLeito(id=id, prontuario=1000 + id, especialidade=especialidade, tipo=tipo,
+                            urgencia=urgencia, criada_em=AGORA - horas_atras * 3600)
+
+
+def criar(*leitos, **opcoes):
+    quadro = QuadroLeitos()
+    quadro.aplicar(list(leitos))
+    return quadro, AlocadorLeitos(quadro, **opcoes)
+
+
+def sugestoes(alocador):
+    return {item["solicitacao"].id: item["leito_numero"] for item in alocador.listar()}
+
+
+def test_request_takes_lowest_numbered_free_bed_of_its_type_before_a_generic_one():
+    _, alocador = criar(leito("C2"), leito("C1"), leito("G1", tipo="nao_definido"), leito("H1", tipo="hem"))
+    alocador.adicionar(solicitacao(1))
+    alocador.adicionar(solicitacao(2))
+    alocador.adicionar(solicitacao(3))
+    assert sugestoes(alocador) == {1: "C1", 2: "C2", 3: "G1"}
+    assert alocador.leitos_livres() == ["H1"]
+
+
+def test_ranking_by_wait_and_urgency():
+    _, alocador = criar(**{"antecedencia_especialidade": {"Trauma": 13}})
+    alocador.adicionar(solicitacao(1, urgencia="eletiva", horas_atras=30))
+    alocador.adicionar(solicitacao(2, urgencia="emergencia", horas_atras=1))
+    alocador.adicionar(solicitacao(3, urgencia="eletiva", horas_atras=0, especialidade="Trauma"))
+    alocador.adicionar(solicitacao(4, urgencia="urgencia", horas_atras=0))
+    # Prioridade: criação menos a antecedência (30 h, 25 h, 13 h e 12 h de vantagem)
+    assert [item["solicitacao"].id for item in alocador.listar()] == [1, 2, 3, 4]
+    assert [item["posicao"] for item in alocador.listar()] == [1, 2, 3, 4]
+
+
+def test_higher_ranked_request_displaces_the_lowest_ranked_holder():
+    _, alocador = criar(leito("C1"), leito("G1", tipo="nao_definido"))
+    alocador.adicionar(solicitacao(1, horas_atras=2))
+    alocador.adicionar(solicitacao(2, horas_atras=1))
+    assert sugestoes(alocador) == {1: "C1", 2: "G1"}
+    alocador.adicionar(solicitacao(3, urgencia="emergencia"))
+    # A emergência toma o leito da pior colocada, que volta para a fila
+    assert sugestoes(alocador) == {3: "G1", 1: "C1", 2: None}
+    assert alocador.leito_sugerido(2) is None
+
+
+def test_lower_ranked_request_waits_and_sees_the_next_release():
+    quadro, alocador = criar(
+        leito("C1"),
+        leito("C2", status="ocupado", previsao=date(2026, 3, 12)),
+        leito("G1", tipo="nao_definido", status="alta", previsao=date(2026, 3, 11)),
+    )
+    alocador.adicionar(solicitacao(1, horas_atras=3))
+    alocador.adicionar(solicitacao(2, horas_atras=2))
+    alocador.adicionar(solicitacao(3, horas_atras=1))
+    listagem = alocador.listar()
+    assert [(item["leito_numero"], item["leito_disponivel"], item["previsao_liberacao"]) for item in listagem] == [
+        ("C1", True, None),
+        ("G1", False, date(2026, 3, 11)),
+        ("C2", False, date(2026, 3, 12)),
+    ]
+
+
+def test_freed_bed_goes_to_the_best_waiting_request():
+    quadro, alocador = criar(leito("C1"), leito("C2", status="ocupado"))
+    alocador.adicionar(solicitacao(1, horas_atras=1))
+    alocador.adicionar(solicitacao(2, horas_atras=3))
+    alocador.adicionar(solicitacao(3, horas_atras=2))
+    assert sugestoes(alocador) == {2: "C1", 3: None, 1: None}
+    quadro.aplicar([leito("C1"), leito("C2")])
+    assert sugestoes(alocador) == {2: "C1", 3: "C2", 1: None}
+    alocador.remover(2)
+    assert sugestoes(alocador) == {3: "C2", 1: "C1"}
+
+
+def test_request_on_a_generic_bed_moves_to_a_freed_bed_of_its_type():
+    quadro, alocador = criar(leito("C1", status="ocupado"), leito("G1", tipo="nao_definido"), leito("H1", tipo="hem", status="ocupado"))
+    alocador.adicionar(solicitacao(1))
+    alocador.adicionar(solicitacao(2, tipo="hem"))
+    assert sugestoes(alocador) == {1: "G1", 2: None}
+    quadro.aplicar([leito("C1"), leito("G1", tipo="nao_definido"), leito("H1", tipo="hem", status="ocupado")])
+    # A cirúrgica sai do genérico, que fica para a de hematologia
+    assert sugestoes(alocador) == {1: "C1", 2: "G1"}
+
+
+def test_bed_leaving_the_free_pool_sends_its_request_back_to_placement():
+    quadro, alocador = criar(leito("C1"), leito("C2"))
+    alocador.adicionar(solicitacao(1, horas_atras=2))
+    alocador.adicionar(solicitacao(2, horas_atras=1))
+    quadro.aplicar([leito("C1", reservado=77), leito("C2")])
+    assert sugestoes(alocador) == {1: "C2", 2: None}
+    quadro.aplicar([leito("C2")])
+    assert sugestoes(alocador) == {1: "C2", 2: None}
+    assert alocador.leitos_livres() == []
+
+
+def test_attended_bed_is_held_until_the_board_changes_or_it_is_released():
+    quadro, alocador = criar(leito("C1"), leito("C2"))
+    alocador.adicionar(solicitacao(1, horas_atras=2))
+    alocador.adicionar(solicitacao(2, horas_atras=1))
+    alocador.adicionar(solicitacao(3))
+    alocador.atender(1, "C1")
+    # C1 fica retido: não volta para a fila enquanto o quadro não mudar
+    assert alocador.pendente(1) is None
+    assert sugestoes(alocador) == {2: "C2", 3: None}
+    assert not alocador.leito_livre("C1", "cirurgico")
+
+    # A reserva não foi gravada: o leito volta a ser oferecido
+    alocador.liberar("C1")
+    assert sugestoes(alocador) == {2: "C2", 3: "C1"}
+
+    alocador.atender(3, "C1")
+    quadro.aplicar([leito("C1", status="ocupado"), leito("C2")])
+    assert "C1" not in alocador._retidos
+    assert sugestoes(alocador) == {2: "C2"}
+
+
+def test_listing_is_cached_until_something_changes():
+    quadro, alocador = criar(leito("C1"))
+    alocador.adicionar(solicitacao(1))
+    primeira = alocador.listar()
+    assert alocador.listar() is primeira
+    quadro.aplicar([leito("C1"), leito("C2")])
+    assert alocador.listar() is not primeira
+
+
+def test_readding_a_pending_request_replaces_it():
+    _, alocador = criar(leito("C1"))
+    alocador.adicionar(solicitacao(1))
+    alocador.adicionar(solicitacao(1, urgencia="emergencia"))
+    assert [item["solicitacao"].urgencia for item in alocador.listar()] == ["emergencia"]
+    assert sugestoes(alocador) == {1: "C1"}
+
+
+def test_unknown_bed_type_is_rejected():
+    _, alocador = criar()
+    with pytest.raises(ValueError):
+        alocador.adicionar(solicitacao(1, tipo="pediatrico"))
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from src.models.historico import RegistroHistorico
+from src.resources.auditoria import Auditoria, normalizar_busca
+from src.resources.database import Base, DatabaseManager
+
+
+def rodar(tmp_path, cenario):
+    """Runs `cenario(db)` against a fresh SQLite file with the historico table."""
+    async def principal():
+        db = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", env_prefix="TEST")
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[RegistroHistorico.__table__])
+        try:
+            return await cenario(db)
+        finally:
+            await db.close_connection()
+    return asyncio.run(principal())
+
+
+async def entidades(db):
+    async with db.async_session_maker() as session:
+        return (await session.execute(text("SELECT entidade FROM historico ORDER BY id"))).scalars().all()
+
+
+class WriterFalho:
+    """Fails every write, after running `durante` (e.g. to log more entries meanwhile)."""
+    def __init__(self, durante=None):
+        self.durante = durante
+
+    async def run(self, operacao):
+        if self.durante is not None:
+            self.durante()
+        raise RuntimeError("banco fora do ar")
+
+
+def registrar(auditoria, quantidade):
+    for n in range(quantidade):
+        auditoria.registrar("ana", "reserva", "Reservou leito", f"leito:{n}")
+
+
+def test_normalizar_busca():
+    assert normalizar_busca("  Transferência   PARA\tHemodinâmica ") == "transferencia para hemodinamica"
+
+
+def test_flush_writes_every_entry_in_batches(tmp_path):
+    auditoria = Auditoria(lote=4)
+    registrar(auditoria, 10)
+
+    async def cenario(db):
+        gravados = await auditoria.descarregar(db.writer)
+        return gravados, await entidades(db), db.writer.stats()["operations"]
+
+    gravados, gravadas, operacoes = rodar(tmp_path, cenario)
+    assert gravados == 10 and operacoes == 3
+    assert gravadas == [f"leito:{n}" for n in range(10)]
+    assert auditoria.stats()["pending"] == 0
+
+
+def test_failed_write_keeps_entries_in_order_for_the_next_flush(tmp_path):
+    auditoria = Auditoria(lote=4)
+    registrar(auditoria, 6)
+    with pytest.raises(RuntimeError):
+        asyncio.run(auditoria.descarregar(WriterFalho()))
+    assert auditoria.stats()["failed_flushes"] == 1
+    assert [linha["entidade"] for linha in auditoria._pendentes] == [f"leito:{n}" for n in range(6)]
+
+    assert rodar(tmp_path, lambda db: auditoria.descarregar(db.writer)) == 6
+
+
+def test_failed_write_respects_the_buffer_limit():
+    auditoria = Auditoria(lote=4, max_pendentes=5)
+    registrar(auditoria, 5)
+    # Três entradas chegam enquanto o lote de 4 está sendo gravado
+    novas = lambda: [auditoria.registrar("bia", "reserva", "Reservou leito", f"novo:{n}") for n in range(3)]
+    with pytest.raises(RuntimeError):
+        asyncio.run(auditoria.descarregar(WriterFalho(durante=novas)))
+    # Só cabem 5: as mais antigas do lote que falhou são descartadas
+    assert auditoria.stats()["pending"] == 5 and auditoria.stats()["dropped"] == 3
+    assert [linha["entidade"] for linha in auditoria._pendentes] == ["leito:3", "leito:4", "novo:0", "novo:1", "novo:2"]
+
+
+def test_flush_cancelled_mid_write_does_not_duplicate_entries(tmp_path):
+    auditoria = Auditoria(lote=10)
+    registrar(auditoria, 25)
+
+    async def cenario(db):
+        descarga = None
+
+        class WriterCancelado:
+            """Cancels the flush while its first batch is being written."""
+            async def run(self, operacao):
+                async def gravar_e_cancelar(session):
+                    await operacao(session)
+                    descarga.cancel()
+                return await db.writer.run(gravar_e_cancelar)
+
+        descarga = asyncio.create_task(auditoria.descarregar(WriterCancelado()))
+        with pytest.raises(asyncio.CancelledError):
+            await descarga
+        await auditoria.descarregar(db.writer)
+        return await entidades(db)
+
+    gravadas = rodar(tmp_path, cenario)
+    assert sorted(gravadas) == sorted(f"leito:{n}" for n in range(25))
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from src.helpers import cache_helper
+from src.helpers.cache_helper import MISSING, TTLCache, estimate_size
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(cache_helper.time, "monotonic", lambda: agora[0])
+    return agora
+
+
+def test_get_returns_value_until_ttl_expires(relogio):
+    cache = TTLCache(max_bytes=10_000)
+    cache.set("a", {"codigo": 1}, ttl=5)
+    assert cache.get("a") == {"codigo": 1}
+    relogio[0] += 5
+    assert cache.get("a") is MISSING
+    assert cache.stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_non_positive_ttl_and_oversized_values_are_not_stored():
+    cache = TTLCache(max_bytes=100)
+    cache.set("a", 1, ttl=0)
+    cache.set("b", "x" * 200, ttl=10)
+    assert cache.get("a") is MISSING and cache.get("b") is MISSING
+
+
+def test_evicts_least_recently_used_within_the_byte_budget():
+    valor = {"nome": "x" * 100}
+    tamanho = estimate_size(valor)
+    cache = TTLCache(max_bytes=tamanho * 3)
+    for chave in "abc":
+        cache.set(chave, dict(valor), ttl=60)
+    cache.get("a")  # "b" passa a ser o menos usado
+    cache.set("d", dict(valor), ttl=60)
+    assert cache.get("b") is MISSING
+    assert all(cache.get(chave) is not MISSING for chave in "acd")
+    assert cache.evictions == 1
+    assert cache.stats()["bytes"] == tamanho * 3
+
+
+def test_max_entries_bounds_the_entry_count():
+    cache = TTLCache(max_bytes=10**6, max_entries=2)
+    for chave in "abc":
+        cache.set(chave, 1, ttl=60)
+    assert cache.get("a") is MISSING
+    assert cache.stats()["entries"] == 2
+
+
+def test_overwriting_a_key_releases_its_old_size():
+    cache = TTLCache(max_bytes=10**6)
+    cache.set("a", "x" * 1000, ttl=60)
+    cache.set("a", "y", ttl=60)
+    assert cache.stats()["bytes"] == estimate_size("y")
+    assert cache.invalidate("a") and not cache.invalidate("a")
+    assert cache.stats()["bytes"] == 0
+
+
+def test_concurrent_misses_run_the_loader_once():
+    cache = TTLCache(max_bytes=10**6)
+    chamadas = 0
+
+    async def carregar():
+        nonlocal chamadas
+        chamadas += 1
+        await asyncio.sleep(0.01)
+        return {"codigo": 7}
+
+    async def principal():
+        return await asyncio.gather(*(cache.get_or_load(7, 60, carregar) for _ in range(10)))
+
+    resultados = asyncio.run(principal())
+    assert chamadas == 1
+    assert all(resultado is resultados[0] for resultado in resultados)
+    assert cache.coalesced == 9
+
+
+def test_loader_errors_reach_every_waiter_and_are_not_cached():
+    cache = TTLCache(max_bytes=10**6)
+    chamadas = 0
+
+    async def falhar():
+        nonlocal chamadas
+        chamadas += 1
+        await asyncio.sleep(0.01)
+        raise LookupError("fora do ar")
+
+    async def principal():
+        return await asyncio.gather(*(cache.get_or_load("k", 60, falhar) for _ in range(3)), return_exceptions=True)
+
+    resultados = asyncio.run(principal())
+    assert chamadas == 1
+    assert all(isinstance(resultado, LookupError) for resultado in resultados)
+    assert cache.get("k") is MISSING
+
+
+def test_waiters_retry_when_the_loading_caller_is_cancelled():
+    cache = TTLCache(max_bytes=10**6)
+
+    async def lento():
+        await asyncio.sleep(10)
+
+    async def rapido():
+        return "ok"
+
+    async def principal():
+        primeiro = asyncio.create_task(cache.get_or_load("k", 60, lento))
+        await asyncio.sleep(0)
+        segundo = asyncio.create_task(cache.get_or_load("k", 60, rapido))
+        await asyncio.sleep(0)
+        primeiro.cancel()
+        return await segundo
+
+    assert asyncio.run(principal()) == "ok"
+    assert cache.get("k") == "ok"
+
+
+def test_ttl_may_depend_on_the_loaded_value(relogio):
+    cache = TTLCache(max_bytes=10**6)
+
+    async def carregar():
+        return None
+
+    assert asyncio.run(cache.get_or_load("k", lambda valor: 1 if valor is None else 60, carregar)) is None
+    relogio[0] += 1
+    assert cache.get("k") is MISSING
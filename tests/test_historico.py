@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from src.controllers import historico_controller
+from src.controllers.historico_controller import codificar_cursor, decodificar_cursor, listar_historico
+from src.models.historico import RegistroHistorico
+from src.resources.auditoria import normalizar_busca
+from src.resources.database import Base, DatabaseManager
+
+INICIO = datetime(2026, 3, 10, 12)
+
+
+def linha(n, usuario="ana", detalhes=None, segundos=None):
+    detalhes = detalhes or f"Leito UTI-{n % 7:02d} - Prontuário {1000 + n}"
+    return {
+        "criado_em": INICIO + timedelta(seconds=n if segundos is None else segundos),
+        "usuario": usuario,
+        "tipo": "reserva",
+        "acao": "Reservou leito",
+        "entidade": f"leito:UTI-{n % 7:02d}",
+        "detalhes": detalhes,
+        "busca": normalizar_busca(f"{usuario} Reservou leito leito:UTI-{n % 7:02d} {detalhes}"),
+    }
+
+
+def rodar(tmp_path, linhas, cenario):
+    """Runs `cenario(session)` against a fresh SQLite file holding `linhas`."""
+    async def principal():
+        db = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", env_prefix="TEST")
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[RegistroHistorico.__table__])
+            await conn.execute(insert(RegistroHistorico), linhas)
+        try:
+            async with db.async_session_maker() as session:
+                return await cenario(session)
+        finally:
+            await db.close_connection()
+    return asyncio.run(principal())
+
+
+async def percorrer(session, limit, **filtros):
+    """Ids of every page, following `proximo` until it is null."""
+    paginas, cursor = [], None
+    while True:
+        pagina = await listar_historico(session, cursor=cursor, limit=limit, **filtros)
+        paginas.append([item["id"] for item in pagina["itens"]])
+        if pagina["proximo"] is None:
+            return paginas
+        cursor = decodificar_cursor(pagina["proximo"])
+
+
+def test_pages_cover_every_row_once_newest_first(tmp_path):
+    paginas = rodar(tmp_path, [linha(n) for n in range(23)], lambda session: percorrer(session, 5))
+    assert [len(pagina) for pagina in paginas] == [5, 5, 5, 5, 3]
+    assert sum(paginas, []) == list(range(23, 0, -1))
+
+
+def test_rows_with_the_same_timestamp_are_split_by_id(tmp_path):
+    linhas = [linha(n, segundos=0) for n in range(10)]
+    paginas = rodar(tmp_path, linhas, lambda session: percorrer(session, 3))
+    assert sum(paginas, []) == list(range(10, 0, -1))
+
+
+def test_last_full_page_has_no_next_cursor(tmp_path):
+    paginas = rodar(tmp_path, [linha(n) for n in range(6)], lambda session: percorrer(session, 3))
+    assert paginas == [[6, 5, 4], [3, 2, 1]]
+
+
+def test_filters_apply_across_pages(tmp_path):
+    linhas = [linha(n, usuario="ana" if n % 3 else "bia") for n in range(30)]
+    paginas = rodar(tmp_path, linhas, lambda session: percorrer(session, 4, usuario="bia"))
+    assert sum(paginas, []) == [n + 1 for n in range(27, -1, -3)]
+
+
+@pytest.mark.parametrize("max_fts", [2000, 0])
+def test_search_is_accent_insensitive_on_both_paths(tmp_path, monkeypatch, max_fts):
+    # max_fts=0 força o caminho do LIKE mesmo para termos seletivos
+    monkeypatch.setattr(historico_controller, "MAX_ENCONTRADOS_FTS", max_fts)
+    linhas = [linha(n) for n in range(20)]
+    linhas[4] = linha(4, detalhes="Transferência para Hemodinâmica")
+    linhas[11] = linha(11, detalhes="Hemodinamica sem acento")
+
+    async def cenario(session):
+        return (
+            await percorrer(session, 1, q="HEMODINÂMICA"),
+            await percorrer(session, 50, q="prontuário 1017"),
+            await percorrer(session, 50, q="5%"),
+        )
+
+    hemodinamica, prontuario, literal = rodar(tmp_path, linhas, cenario)
+    assert hemodinamica == [[12], [5]]
+    assert prontuario == [[18]]
+    assert literal == [[]]
+
+
+def test_cursor_round_trip_and_invalid_cursors():
+    criado_em = datetime(2026, 3, 10, 12, 0, 0, 123456)
+    assert decodificar_cursor(codificar_cursor(criado_em, 42)) == (criado_em, 42)
+    for invalido in ("", "abc", "2026-03-10T12:00:00", "2026-03-10T12:00:00,x", "ontem,3"):
+        with pytest.raises(ValueError):
+            decodificar_cursor(invalido)
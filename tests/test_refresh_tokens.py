@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from src.auth.auth import AuthHandler
+from src.models.refresh_token import RefreshToken
+from src.resources.database import Base, DatabaseManager
+
+
+def rodar(tmp_path, cenario):
+    """Runs `cenario(auth, db)` against a fresh SQLite file with the refresh_tokens table."""
+    async def principal():
+        db = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", env_prefix="TEST")
+        async with db.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[RefreshToken.__table__])
+        try:
+            return await cenario(AuthHandler(), db)
+        finally:
+            await db.close_connection()
+    return asyncio.run(principal())
+
+
+async def verificar(auth, db, token):
+    async with db.async_session_maker() as session:
+        return await auth.verify_refresh_token(token, session)
+
+
+async def gravar(db, *registros):
+    async def adicionar(session):
+        session.add_all(registros)
+    await db.writer.run(adicionar)
+
+
+async def contar(db):
+    async with db.async_session_maker() as session:
+        return (await session.execute(select(func.count()).select_from(RefreshToken))).scalar_one()
+
+
+def test_rotation_replaces_the_old_token(tmp_path):
+    async def cenario(auth, db):
+        antigo = await auth.create_refresh_token("ana", ["UTI"], db.writer)
+        novo = await auth.rotate_refresh_token(antigo, "ana", ["UTI", "Admin"], db.writer)
+        with pytest.raises(HTTPException) as erro:
+            await verificar(auth, db, antigo)
+        assert erro.value.status_code == 401
+        registro = await verificar(auth, db, novo)
+        return novo, antigo, registro, await contar(db)
+
+    novo, antigo, registro, total = rodar(tmp_path, cenario)
+    assert novo != antigo
+    assert (registro.user_id, registro.groups) == ("ana", ["UTI", "Admin"])
+    # Só o hash vai para o banco
+    assert registro.token_hash != novo.encode() and len(registro.token_hash) == 32
+    assert total == 1
+
+
+def test_concurrent_rotations_of_one_token_let_only_one_through(tmp_path):
+    async def cenario(auth, db):
+        antigo = await auth.create_refresh_token("ana", [], db.writer)
+        resultados = await asyncio.gather(
+            *(auth.rotate_refresh_token(antigo, "ana", [], db.writer) for _ in range(5)),
+            return_exceptions=True,
+        )
+        return resultados, await contar(db)
+
+    resultados, total = rodar(tmp_path, cenario)
+    novos = [resultado for resultado in resultados if isinstance(resultado, str)]
+    negados = [resultado for resultado in resultados if isinstance(resultado, HTTPException)]
+    assert len(novos) == 1 and len(negados) == 4
+    assert all(erro.status_code == 401 for erro in negados)
+    assert total == 1
+
+
+def test_expired_or_unknown_tokens_are_not_rotated(tmp_path):
+    async def cenario(auth, db):
+        token, registro = auth._new_refresh_token("ana", [])
+        registro.expires_at = datetime.utcnow() - timedelta(minutes=1)
+        await gravar(db, registro)
+        for candidato in (token, "desconhecido"):
+            with pytest.raises(HTTPException) as erro:
+                await auth.rotate_refresh_token(candidato, "ana", [], db.writer)
+            assert erro.value.status_code == 401
+        return await contar(db)
+
+    assert rodar(tmp_path, cenario) == 1
+
+
+def test_purge_deletes_only_expired_tokens_in_batches(tmp_path):
+    async def cenario(auth, db):
+        vencidos = []
+        for _ in range(7):
+            _, registro = auth._new_refresh_token("ana", [])
+            registro.expires_at = datetime.utcnow() - timedelta(days=1)
+            vencidos.append(registro)
+        await gravar(db, *vencidos)
+        valido = await auth.create_refresh_token("ana", [], db.writer)
+        apagados = await auth.purge_expired_refresh_tokens(db.writer, batch_size=3)
+        await verificar(auth, db, valido)
+        return apagados, await contar(db), db.writer.stats()["operations"]
+
+    apagados, total, operacoes = rodar(tmp_path, cenario)
+    assert (apagados, total) == (7, 1)
+    # 2 inserções + lotes de 3, 3 e 1
+    assert operacoes == 5
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine
+
+from src.helpers.sql_helper import SqlRegistry, compile_query, create_query
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER, y INTEGER, nome TEXT)")
+        conn.exec_driver_sql("INSERT INTO t VALUES (1, 5, 'a'), (2, 5, 'b'), (3, 6, 'c'), (4, 5, 'd')")
+        yield conn
+    engine.dispose()
+
+
+def test_placeholders_become_bind_parameters(conn):
+    query, params = create_query("SELECT nome FROM t WHERE x = #x", {"x": 2})
+    assert query.text == "SELECT nome FROM t WHERE x = :x"
+    assert conn.execute(query, params).scalars().all() == ["b"]
+
+
+def test_values_are_not_interpolated(conn):
+    query, params = create_query("SELECT count(*) FROM t WHERE nome = #nome", {"nome": "a' OR '1'='1"})
+    assert conn.execute(query, params).scalar_one() == 0
+
+
+def test_in_placeholder_expands_a_list(conn):
+    query, params = create_query("SELECT x FROM t WHERE x IN (#ids) AND y = #y ORDER BY x", {"ids": [1, 2, 3], "y": 5})
+    assert conn.execute(query, params).scalars().all() == [1, 2]
+
+
+def test_in_placeholder_accepts_tuples_and_single_items(conn):
+    query, params = create_query("SELECT x FROM t WHERE x in ( #ids ) ORDER BY x", {"ids": (4, 3)})
+    assert conn.execute(query, params).scalars().all() == [3, 4]
+    assert conn.execute(query, {"ids": [4]}).scalars().all() == [4]
+
+
+def test_placeholders_inside_string_literals_are_kept(conn):
+    query, params = create_query("SELECT '#x IN (#ids)' FROM t WHERE x IN (#ids)", {"ids": [1]})
+    assert conn.execute(query, params).scalar_one() == "#x IN (#ids)"
+    assert set(query._bindparams) == {"ids"}
+
+
+def test_compile_query_is_cached():
+    sql = "SELECT x FROM t WHERE x = #x"
+    assert compile_query(sql) is compile_query(sql)
+
+
+def test_registry_checks_parameters(tmp_path):
+    (tmp_path / "t").mkdir()
+    (tmp_path / "t" / "por_ids.sql").write_text("SELECT x FROM t WHERE x IN (#ids) AND y = :y;\n")
+    registry = SqlRegistry(str(tmp_path))
+
+    assert registry.params("t/por_ids") == {"ids", "y"}
+    with pytest.raises(ValueError, match="missing=\\['y'\\]"):
+        registry.prepare("t/por_ids", {"ids": [1]})
+    with pytest.raises(RuntimeError):
+        registry.get("t/inexistente")
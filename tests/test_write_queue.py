@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from src.resources.database import DatabaseManager
+from src.resources.write_queue import WriteQueue
+
+
+def rodar(tmp_path, cenario, **opcoes):
+    """Runs `cenario(writer, db)` against a fresh SQLite file with a table t(x)."""
+    async def principal():
+        db = DatabaseManager(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}", env_prefix="TEST")
+        db.writer = WriteQueue(db.writer.session_maker, **opcoes)
+        async with db.engine.begin() as conn:
+            await conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        try:
+            return await cenario(db.writer, db)
+        finally:
+            await db.close_connection()
+    return asyncio.run(principal())
+
+
+async def valores(db):
+    async with db.async_session_maker() as session:
+        return sorted((await session.execute(text("SELECT x FROM t"))).scalars().all())
+
+
+def inserir(x):
+    async def operacao(session):
+        await session.execute(text("INSERT INTO t VALUES (:x)"), {"x": x})
+        return x
+    return operacao
+
+
+def test_concurrent_operations_share_commits_and_get_their_results(tmp_path):
+    async def cenario(writer, db):
+        resultados = await asyncio.gather(*(writer.run(inserir(x)) for x in range(20)))
+        return resultados, await valores(db), writer.stats()
+
+    resultados, gravados, stats = rodar(tmp_path, cenario)
+    assert resultados == list(range(20))
+    assert gravados == list(range(20))
+    assert stats["operations"] == 20
+    assert stats["batches"] < 20
+
+
+def test_failing_operation_is_rolled_back_alone(tmp_path):
+    async def falhar(session):
+        await session.execute(text("INSERT INTO t VALUES (99)"))
+        raise ValueError("inválido")
+
+    async def cenario(writer, db):
+        resultados = await asyncio.gather(
+            writer.run(inserir(1)), writer.run(falhar), writer.run(inserir(2)), return_exceptions=True,
+        )
+        return resultados, await valores(db)
+
+    resultados, gravados = rodar(tmp_path, cenario)
+    assert resultados[0] == 1 and resultados[2] == 2
+    assert isinstance(resultados[1], ValueError)
+    assert gravados == [1, 2]
+
+
+def test_dead_worker_is_restarted_and_runs_queued_operations(tmp_path):
+    async def cenario(writer, db):
+        liberar = asyncio.Event()
+
+        async def bloquear(session):
+            await liberar.wait()
+
+        primeira = asyncio.create_task(writer.run(bloquear))
+        await asyncio.sleep(0.05)
+        # Enfileirada enquanto o worker está ocupado com a primeira
+        segunda = asyncio.create_task(writer.run(inserir(1)))
+        await asyncio.sleep(0.01)
+        writer._task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await primeira
+        assert writer._task.done() and not segunda.done()
+
+        # A próxima escrita sobe um worker novo na mesma fila
+        assert await writer.run(inserir(2)) == 2
+        assert await segunda == 1
+        return await valores(db)
+
+    assert rodar(tmp_path, cenario, max_batch=1) == [1, 2]
+
+
+def test_close_cancels_queued_operations(tmp_path):
+    async def cenario(writer, db):
+        liberar = asyncio.Event()
+
+        async def bloquear(session):
+            await liberar.wait()
+
+        primeira = asyncio.create_task(writer.run(bloquear))
+        await asyncio.sleep(0.05)
+        segunda = asyncio.create_task(writer.run(inserir(1)))
+        await asyncio.sleep(0.01)
+        await writer.close()
+        resultados = await asyncio.gather(primeira, segunda, return_exceptions=True)
+        return resultados, writer.stats()
+
+    resultados, stats = rodar(tmp_path, cenario, max_batch=1)
+    assert all(isinstance(resultado, asyncio.CancelledError) for resultado in resultados)
+    assert stats["queued"] == 0